@@ -0,0 +1,58 @@
+"""
+    benchmarks.bench_incremental
+    ~~~~~
+
+    Measures the latency of parsing a large synthetic chapter again after one
+    of its paragraphs has been edited, whole and with the incremental parser.
+
+    Usage::
+
+        python benchmarks/bench_incremental.py [--size 1048576] [--parser markdown]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hon.parsing import get_markdown_parser  # noqa: E402
+from hon.parsing.incremental import IncrementalParser  # noqa: E402
+
+
+def make_chapter(size):
+    sections = []
+    length = 0
+    while length < size:
+        index = len(sections)
+        section = ('## Section {0}\n\nSome *text* with a [link](./page-{0}.md) and '
+            '`code`, and more text after it.\n\n- one\n- two\n\n    code {0}\n').format(index)
+        sections.append(section)
+        length += len(section) + 1
+    return '\n'.join(sections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--size', type=int, default=1024 * 1024)
+    parser.add_argument('--parser', default='markdown')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    parser_class = get_markdown_parser(args.parser)
+    text = make_chapter(args.size)
+    edited = text.replace('Section 7\n', 'Section 7, edited\n', 1)
+
+    incremental_parser = IncrementalParser(parser_class)
+    incremental_parser.parse(text)
+
+    whole_seconds = min(timeit.repeat(lambda: parser_class().parse(edited), number=1, repeat=args.repeat))
+    incremental_seconds = min(timeit.repeat(lambda: incremental_parser.parse(edited), number=1, repeat=args.repeat))
+
+    print('{} characters, {} blocks'.format(len(text), incremental_parser.block_count))
+    print('whole:       {:.1f} ms'.format(whole_seconds * 1000))
+    print('incremental: {:.1f} ms'.format(incremental_seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+    benchmarks.bench_parse
+    ~~~~~
+
+    Measures the per-page latency of parsing the Markdown files of the
+    example books, with a new Markdown converter for every page (as the
+    parser used to do), with the parser's pooled converters, and with the
+    Mistune parser.
+
+    Usage::
+
+        python benchmarks/bench_parse.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from hon.parsing import MistuneParser  # noqa: E402
+from hon.parsing.markdown.markdown_python import _Markdown, MarkdownParser  # noqa: E402
+
+
+def read_pages(examples_path):
+    pages = []
+    pattern = os.path.join(examples_path, '**', '*.md')
+    for filepath in sorted(glob.glob(pattern, recursive=True)):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def parse_with_new_converters(pages):
+    for page in pages:
+        _Markdown().convert(page)
+
+
+def parse_with_pooled_converters(pages):
+    for page in pages:
+        MarkdownParser().parse(page)
+
+
+def parse_with_mistune(pages):
+    for page in pages:
+        MistuneParser().parse(page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--examples', default=os.path.join(ROOT, 'examples'))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = read_pages(args.examples)
+    if not pages:
+        parser.error('No Markdown files found in: {}'.format(args.examples))
+
+    results = {}
+    for name, func in (('new converter', parse_with_new_converters),
+            ('pooled', parse_with_pooled_converters),
+            ('mistune', parse_with_mistune)):
+        seconds = min(timeit.repeat(lambda: func(pages), number=1, repeat=args.repeat))
+        results[name] = seconds
+        print('{:<14} {:.3f} ms per page ({} pages)'.format(
+            name + ':', seconds * 1000 / len(pages), len(pages)))
+    print('mistune is {:.1f}x as fast as the pooled Python-Markdown parser'.format(
+        results['pooled'] / results['mistune']))
+
+    md = _Markdown()
+    create_seconds = min(timeit.repeat(_Markdown, number=100, repeat=args.repeat)) / 100
+    reset_seconds = min(timeit.repeat(md.reset, number=100, repeat=args.repeat)) / 100
+    print('creating a converter {:.1f} us, resetting one {:.1f} us'.format(
+        create_seconds * 10 ** 6, reset_seconds * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+    benchmarks.bench_structure
+    ~~~~~
+
+    Measures the memory used by, and the latency of reading the derived fields
+    of, the parts of a synthetic summary and the chapters loaded from it; and
+    the latency of looking up every chapter's node in the chapter graph.
+
+    Usage::
+
+        python benchmarks/bench_structure.py [--entries 100000]
+"""
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hon.structure import Chapter, ChapterGraph, Part  # noqa: E402
+
+
+def make_parts(entries):
+    """Create a summary of ``entries`` parts, in sections of ten parts each,
+    where every part has a nested part."""
+    parts = [Part('README', source='README.md', level=0)]
+    for index in range(1, entries, 2):
+        section = 'section-{}'.format(index // 20)
+        child = Part('Part {}.1'.format(index), level=1,
+            source='{}/part-{}/child.md'.format(section, index))
+        parts.append(Part('Part {}'.format(index), level=0,
+            source='{}/part-{}.md'.format(section, index), children=[child]))
+    return parts
+
+
+def make_chapters(parts, root='/books/synthetic', parent=None):
+    chapters = []
+    for part in parts:
+        chapter = Chapter(name=part.name, raw_text='',
+            path=os.path.join(root, part.source), link=part.link, parent=parent)
+        chapter.children = make_chapters(part.children, root=root, parent=part)
+        chapters.append(chapter)
+    return chapters
+
+
+def measure_memory(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def read_part_fields(parts):
+    for part in parts:
+        part.id, part.link, part.link_name, part.is_readme
+
+
+def read_chapter_fields(chapters):
+    for chapter in chapters:
+        chapter.filename, chapter.is_readme, chapter.link
+
+
+def lookup_nodes(graph, chapters):
+    for chapter in chapters:
+        graph.get(chapter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--lookups', type=int, default=1000,
+        help='The number of chapters to look up in the chapter graph')
+    args = parser.parse_args()
+
+    parts, parts_memory = measure_memory(make_parts, args.entries)
+    chapters, chapters_memory = measure_memory(make_chapters, parts)
+
+    all_parts = parts + [child for part in parts for child in part.children]
+    graph, graph_memory = measure_memory(ChapterGraph, chapters)
+    all_chapters = [node.chapter for node in graph]
+
+    part_seconds = min(timeit.repeat(lambda: read_part_fields(all_parts),
+        number=1, repeat=args.repeat))
+    chapter_seconds = min(timeit.repeat(lambda: read_chapter_fields(all_chapters),
+        number=1, repeat=args.repeat))
+
+    lookups = all_chapters[-args.lookups:]
+    lookup_seconds = min(timeit.repeat(lambda: lookup_nodes(graph, lookups),
+        number=1, repeat=args.repeat))
+
+    print('{} parts, {} chapters'.format(len(all_parts), len(all_chapters)))
+    print('memory:  parts {:.1f} MiB, chapters {:.1f} MiB, graph {:.1f} MiB'.format(
+        parts_memory / 2 ** 20, chapters_memory / 2 ** 20, graph_memory / 2 ** 20))
+    print('latency: part fields {:.1f} ms, chapter fields {:.1f} ms'.format(
+        part_seconds * 1000, chapter_seconds * 1000))
+    print('latency: {} graph lookups {:.1f} ms'.format(len(lookups), lookup_seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
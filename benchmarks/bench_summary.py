@@ -0,0 +1,53 @@
+"""
+    benchmarks.bench_summary
+    ~~~~~
+
+    Measures the latency of parsing a synthetic `SUMMARY.md`, of sections of
+    fifty parts each, where every part has a nested part.
+
+    Usage::
+
+        python benchmarks/bench_summary.py [--entries 30000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hon.parsers.summary_parser import SummaryParser  # noqa: E402
+
+
+def make_summary(entries):
+    lines = ['# Summary', '']
+    for index in range(0, entries, 2):
+        if index % 100 == 0:
+            lines.extend(['', '## Section {}'.format(index // 100), ''])
+        lines.append('- [Part {}](./section-{}/part-{}.md)'.format(index, index // 100, index))
+        lines.append('    - [Part {}.1](./section-{}/part-{}/child.md)'.format(index, index // 100, index))
+    return '\n'.join(lines) + '\n'
+
+
+def parse_summary(source):
+    parser = SummaryParser(src=source)
+    return parser.parse_title(), parser.parse_sections()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--entries', type=int, default=30000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    source = make_summary(args.entries)
+    _, sections = parse_summary(source)
+    seconds = min(timeit.repeat(lambda: parse_summary(source), number=1, repeat=args.repeat))
+
+    parts = sum(len(section.parts) for section in sections)
+    print('{} sections, {} top level parts'.format(len(sections), parts))
+    print('latency: {:.1f} ms'.format(seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
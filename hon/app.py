@@ -7,19 +7,44 @@
 """
 import os
 import configparser
+import json
 import sys
+import time
 from collections import namedtuple
 from datetime import datetime
-from functools import update_wrapper
+from functools import partial, update_wrapper
 from operator import attrgetter
 
 from .book import Book
+from .cancellation import raise_if_cancelled
+from .cache import (
+    BuildCache,
+    BuildJournal,
+    DependencyGraph,
+    DEFAULT_CACHE_DIR,
+    make_key,
+    TemplateBytecodeCache
+)
 from .config import (_read_yaml_config, BookConfig)
 from .ctx import _AppCtxGlobals, AppContext
+from .exc import BuildError
 from .helpers import locked_cached_property
 from .logging import create_logger
+from .parsing import DEFAULT_MARKDOWN_PARSER
+from .parsing.chunked import ChunkedParser, DEFAULT_PARSE_CHUNK_SIZE
+from .parsing.highlight import (
+    CodeHighlighter, DEFAULT_HIGHLIGHT_STYLE, is_highlighting_available
+)
+from .parsing.incremental import IncrementalParser, INCREMENTAL_PARSE_MIN_SIZE
+from .parsing.outline import Outline
 from .plugins import Plugin
+from .preprocessors.jinja import TEMPLATE_REFERENCE_RE
+from .scheduler import TaskGraph
 from .signals import before_build, after_build
+from .utils.changeutils import get_changed_files
+from .utils.fileutils import filename_matches_pattern
+from .utils.numberutils import to_int_ns
+from .utils.processutils import can_fork, fork_map
 
 # a singleton sentinel value for parameter defaults
 _sentinel = object()
@@ -28,6 +53,15 @@ _sentinel = object()
 #: interface, or otherwise specified in the configuration.
 DEFAULT_OUTPUT_PATH = 'book'
 
+#: The margin, in seconds, by which an entry of the build cache must be older
+#: than the build for the entry to be pruned, see: ``Hon.prune_cache``.
+CACHE_PRUNE_MARGIN = 2
+
+#: The number of days that an entry of the build cache may go unused before
+#: it's pruned, unless the project chooses another with
+#: ``build.cache-prune-age``.
+DEFAULT_CACHE_PRUNE_AGE = 7
+
 #: A collection of valid book configuration files which, if present, identify
 #: a directory as being the root of a book.
 VALID_BOOK_CONFIGURATIONS = ['book.yaml']  # TODO: ['book.json', 'book.toml', 'book.yaml']
@@ -107,6 +141,72 @@ class Hon():
             'build-dir': 'book',
             'create-missing': True,
             'use-default-preprocessors': True,
+
+            #: The number of worker processes used to render a book's pages.
+            'workers': 1,
+
+            #: The parser for every book's Markdown, unless the book chooses
+            #: another with ``markdown-parser`` in its book.yaml: either
+            #: "markdown" (Python-Markdown) or "mistune".
+            'markdown-parser': DEFAULT_MARKDOWN_PARSER,
+
+            #: Keep the parse result of each top-level block of large chapters
+            #: between builds, so that rebuilding after an edit only converts
+            #: the blocks which changed. It's enabled when serving a book.
+            'incremental-parse': False,
+
+            #: Chapters larger than this many characters are parsed in chunks
+            #: of about this size, so that the parser's working set is bounded
+            #: by the chunk size; 0 parses every chapter whole.
+            'parse-chunk-size': DEFAULT_PARSE_CHUNK_SIZE,
+
+            #: Highlight the code blocks of every chapter which have a
+            #: language (e.g. fenced code blocks), with Pygments, in the given
+            #: style. Highlighting is opt-in since it changes the markup of
+            #: every book, and with it the Python-Markdown parser also parses
+            #: fenced code blocks. It needs the ``highlight`` extra.
+            'highlight': False,
+            'highlight-style': DEFAULT_HIGHLIGHT_STYLE,
+
+            #: The number of threads used to read a book's chapter files.
+            'load-workers': 8,
+
+            #: Once a complete build (i.e. not a partial or resumed build, and
+            #: with every renderer) has finished, remove the entries of the
+            #: build cache that haven't been used for ``cache-prune-age`` days,
+            #: see: ``hon.cache.BuildCache.prune``. Entries that builds only
+            #: use now and then (e.g. compiled templates, or the highlighted
+            #: code of chapters that haven't been edited) are kept for a
+            #: while; 0 removes everything the build didn't use.
+            'cache-prune': True,
+            'cache-prune-age': DEFAULT_CACHE_PRUNE_AGE,
+
+            #: Reuse the chapters and pages of previous builds, whose inputs
+            #: haven't changed, from the build cache.
+            'cache': True,
+
+            #: The directory of the build cache, relative to the project root.
+            'cache-dir': DEFAULT_CACHE_DIR,
+
+            #: The maximum number of books which are built at the same time,
+            #: each in its own worker process.
+            'book-workers': 1,
+
+            #: Write each page as soon as it has been rendered, rather than
+            #: keeping every rendered page in memory until all of them have
+            #: been rendered.
+            'streaming': False,
+
+            #: Schedule the stages of every book's renderers (e.g. preparing the
+            #: chapters, generating assets, rendering pages, and finishing) as a
+            #: graph of tasks, run on a pool of threads as soon as the stages
+            #: they depend on are done. This takes the place of book-workers and
+            #: concurrent-renderers.
+            'scheduler': False,
+
+            #: Run each of the renderers for a book in its own worker process,
+            #: at the same time, rather than one after another.
+            'concurrent-renderers': False,
         },
     }
 
@@ -122,6 +222,95 @@ class Hon():
         """
         return create_logger(self)
 
+    @property
+    def book_workers(self):
+        """The maximum number of books built at the same time, each in its own
+        worker process.
+
+        This is read from the ``build.book-workers`` configuration, unless it
+        was overridden when the build was started, and is never less than
+        ``1``.
+        """
+        book_workers = self._book_workers or self.build_config.get('book-workers') or 1
+        return max(1, to_int_ns(book_workers))
+
+    @property
+    def build_config(self):
+        """Convenience property for accessing the build configuration."""
+        return self.config.get('build') or {}
+
+    @property
+    def cache(self):
+        """The build cache, see :class:`~hon.cache.BuildCache`.
+
+        The cache is enabled by the ``build.cache`` configuration, unless it
+        was overridden when the build was started, and is written to the
+        ``build.cache-dir`` directory under the project root.
+        """
+        if self._cache is None:
+            enabled = self._use_cache
+            if enabled is None:
+                enabled = bool(self.build_config.get('cache', True))
+            cache_dir = self.build_config.get('cache-dir') or DEFAULT_CACHE_DIR
+            self._cache = BuildCache(os.path.join(self.root, cache_dir), enabled=enabled)
+        return self._cache
+
+    @property
+    def concurrent_renderers(self):
+        """Whether a book's renderers are run concurrently, each in its own
+        worker process."""
+        if self._concurrent_renderers is not None:
+            return self._concurrent_renderers
+        return bool(self.build_config.get('concurrent-renderers', False))
+
+    @property
+    def highlighter(self):
+        """The highlighter of chapters' code blocks, see:
+        :class:`~hon.parsing.highlight.CodeHighlighter`; or ``None`` if
+        highlighting isn't enabled by ``build.highlight``, or Pygments isn't
+        installed.
+
+        The highlighter lives as long as the application, so code blocks it
+        has highlighted are kept in memory between builds.
+        """
+        if not self.build_config.get('highlight', False):
+            return None
+        if not is_highlighting_available():
+            if self._highlighter is None:
+                self.logger.warning('Pygments isn\'t installed, code blocks won\'t be highlighted.')
+                self._highlighter = False
+            return None
+
+        style = self.build_config.get('highlight-style') or DEFAULT_HIGHLIGHT_STYLE
+        if not self._highlighter or self._highlighter.style != style:
+            self._highlighter = CodeHighlighter(style)
+        return self._highlighter
+
+    @property
+    def incremental_parse(self):
+        """Whether large chapters are parsed incrementally, see:
+        :meth:`get_chapter_parser`."""
+        if self._incremental_parse is not None:
+            return self._incremental_parse
+        return bool(self.build_config.get('incremental-parse', False))
+
+    @property
+    def is_partial(self):
+        """Whether the build only renders the pages of some chapters, see:
+        :meth:`get_selected_paths`."""
+        return bool(self._only) or self._changed_since is not None
+
+    @property
+    def markdown_parser(self):
+        """The name of the default parser for books' Markdown, see:
+        :attr:`hon.book.Book.markdown_parser`."""
+        return self.build_config.get('markdown-parser') or DEFAULT_MARKDOWN_PARSER
+
+    @property
+    def load_workers(self):
+        """The number of threads used to read a book's chapter files."""
+        return max(1, to_int_ns(self.build_config.get('load-workers') or 8))
+
     @property
     def output_config(self):
         """Convenience property for accessing the output configuration."""
@@ -135,6 +324,13 @@ class Hon():
             output_path = DEFAULT_OUTPUT_PATH
         return  os.path.join(self.root, output_path)
 
+    @property
+    def parse_chunk_size(self):
+        """The size of the chunks that large chapters are parsed in, see:
+        :meth:`get_chapter_parser`; ``0`` if chapters are parsed whole."""
+        chunk_size = self.build_config.get('parse-chunk-size', DEFAULT_PARSE_CHUNK_SIZE)
+        return max(0, to_int_ns(chunk_size or 0))
+
     @property
     def preprocessor_config(self):
         """Convenience property for accessing the preprocessor configuration."""
@@ -144,11 +340,60 @@ class Hon():
     def root(self):
         return self._root
 
+    @property
+    def resume(self):
+        """Whether the build resumes from the book's build journal, skipping
+        the units completed by a previous build that didn't finish."""
+        return bool(self._resume)
+
+    @property
+    def scheduler(self):
+        """Whether the build is run by the task scheduler, see:
+        :meth:`build_scheduled`."""
+        if self._scheduler is not None:
+            return self._scheduler
+        return bool(self.build_config.get('scheduler', False))
+
+    @property
+    def streaming(self):
+        """Whether rendered pages are streamed to disk as soon as they are
+        rendered, see :attr:`hon.renderers.Renderer.supports_streaming`."""
+        if self._streaming is not None:
+            return self._streaming
+        return bool(self.build_config.get('streaming', False))
+
+    @property
+    def template_bytecode_cache(self):
+        """The cache of compiled Jinja2 templates, see:
+        :class:`~hon.cache.TemplateBytecodeCache`; or ``None`` if the build
+        cache is disabled.
+
+        Theme templates, and the templates chapters include, are compiled
+        once and kept in the build cache, so neither cold builds nor rebuilds
+        compile a template that hasn't changed.
+        """
+        cache = self.cache
+        if not cache.enabled:
+            return None
+        if self._template_bytecode_cache is None or self._template_bytecode_cache.cache is not cache:
+            self._template_bytecode_cache = TemplateBytecodeCache(cache)
+        return self._template_bytecode_cache
+
     @property
     def version(self):
         from . import __version__
         return __version__
 
+    @property
+    def workers(self):
+        """The number of worker processes used to render a book's pages.
+
+        This is read from the ``build.workers`` configuration, unless it was
+        overridden when the build was started, and is never less than ``1``.
+        """
+        workers = self._workers or self.build_config.get('workers') or 1
+        return max(1, to_int_ns(workers))
+
     def __init__(self, root=None, honrc_filepath=None, debug=False):
         #: Hon differentiates between a project path and a source path. The
         #: project path is the folder that encompasses all things related to
@@ -162,8 +407,29 @@ class Hon():
         self._root = root
         self._loaded_plugins = False
         self._loaded_renderers = False
+        self._workers = None
+        self._book_workers = None
+        self._concurrent_renderers = None
+        self._cache = None
+        self._use_cache = None
+        self._streaming = None
+        self._scheduler = None
+        self._resume = None
+        self._incremental_parse = None
+        self._highlighter = None
+        self._template_bytecode_cache = None
         self.honrc_filepath = honrc_filepath
 
+        #: The cancellation token of the build that is running, if any, see:
+        #: :meth:`build`.
+        self.cancel_token = None
+        self._only = ()
+        self._changed_since = None
+
+        #: The incremental parsers of large chapters, which outlive each build,
+        #: see: :meth:`get_chapter_parser`.
+        self._incremental_parsers = {}
+
         #: Assign default values to the configuration. The default values do
         #: not include any of the default configuration for renderers (i.e.
         #: outputs), preprocessors, etc. These are treated like plugins, even
@@ -305,7 +571,10 @@ class Hon():
         """
         return AppContext(self)
 
-    def build(self, output_path_override=None, build_only=None):
+    def build(self, output_path_override=None, build_only=None, workers=None,
+            concurrent_renderers=None, book_workers=None, use_cache=None,
+            streaming=None, scheduler=None, resume=None, cancel_token=None,
+            only=None, changed_since=None, incremental_parse=None):
         """Build a book in one or more formats.
 
         The ``build_only`` argument specifies which book renderers should be
@@ -313,29 +582,239 @@ class Hon():
         all book renderers will be run. The book renders supported by Hon are:
         ``html``, ``pdf``, ``epub``, and ``mobi``. Hon extensions may make
         additional renderers available.
+
+        The ``workers`` argument overrides the ``build.workers`` configuration,
+        i.e. the number of worker processes used to render a book's pages.
+
+        The ``concurrent_renderers`` argument overrides the
+        ``build.concurrent-renderers`` configuration. When enabled, each of a
+        book's renderers is run in its own worker process (with its own render
+        context) at the same time as the others. Signals sent while rendering
+        are then only seen by receivers within that worker process.
+
+        The ``book_workers`` argument overrides the ``build.book-workers``
+        configuration, i.e. the maximum number of books that are built at the
+        same time, each in its own worker process.
+
+        The ``use_cache`` argument overrides the ``build.cache`` configuration,
+        i.e. whether chapters and pages are reused from the build cache.
+
+        The ``streaming`` argument overrides the ``build.streaming``
+        configuration, i.e. whether each page is written as soon as it has
+        been rendered.
+
+        The ``scheduler`` argument overrides the ``build.scheduler``
+        configuration, i.e. whether the build is run as a graph of tasks.
+
+        If ``resume`` is ``True``, the build continues from where the previous
+        build stopped, e.g. if it was killed partway through; every renderer
+        that already finished rendering a book, whose inputs haven't changed
+        since, isn't run again, and pages already rendered are restored from
+        the build cache. Resuming requires the build cache.
+
+        If a ``cancel_token`` (see :class:`~hon.cancellation.CancellationToken`)
+        is given, the build checks it between units of work, e.g. before each
+        page is rendered, and once it's cancelled the build stops by raising
+        :class:`~hon.exc.BuildCancelled`.
+
+        The ``only`` and ``changed_since`` arguments make the build a partial
+        build, which only renders the pages of some chapters; the pages of the
+        others are restored from the build cache, as they were last rendered.
+        ``only`` is one or more glob patterns matched against the chapters'
+        source paths (relative to the book), and ``changed_since`` is a git
+        revision or a timestamp, see :meth:`get_selected_paths`.
+
+        The ``incremental_parse`` argument overrides the
+        ``build.incremental-parse`` configuration, i.e. whether large chapters
+        are parsed incrementally, see :meth:`get_chapter_parser`.
         """
         self.logger.info('Found {} books to build...'.format(len(self.books)))
         if output_path_override:
             self._output_path = output_path_override
             self.logger.info('Overriding output path. Output path is now: {}'.format(self.output_path))
 
+        if workers:
+            self._workers = workers
+            self.logger.info('Overriding workers. Rendering pages with: {} workers'.format(self.workers))
+
+        if concurrent_renderers is not None:
+            self._concurrent_renderers = concurrent_renderers
+
+        if book_workers:
+            self._book_workers = book_workers
+
+        if use_cache is not None:
+            self._use_cache = use_cache
+
+        if streaming is not None:
+            self._streaming = streaming
+
+        if scheduler is not None:
+            self._scheduler = scheduler
+
+        if resume is not None:
+            self._resume = resume
+
+        if incremental_parse is not None:
+            self._incremental_parse = incremental_parse
+
+        self.cancel_token = cancel_token
+        self._only = tuple(only or ())
+        self._changed_since = changed_since
+        self._cache = None
+        if self.resume and not self.cache.enabled:
+            self.logger.warning('The build cache is disabled, the build can\'t be resumed.')
+        if self.is_partial and not self.cache.enabled:
+            self.logger.warning('The build cache is disabled, every page will be rendered.')
+
         if build_only is None:
             build_only = tuple([renderer.name for renderer in self.renderers])
 
         # TODO: Get and create output directory
         start_time = datetime.now()
-        for book in self.books:
-            self.logger.info('Building book: {} ({})'.format(book.name, book.path))
-
-            before_build.send(book)
-            for renderer in self.renderers:
-                if build_only and renderer.name in build_only:
-                    renderer.render(book)
-            after_build.send(book)
+        start_timestamp = time.time()
+        book_workers = self.book_workers
+        if self.scheduler:
+            self.build_scheduled(self.books, build_only)
+        elif book_workers > 1 and len(self.books) > 1 and can_fork():
+            self.build_books_concurrently(self.books, build_only, book_workers)
+        else:
+            for book in self.books:
+                raise_if_cancelled(self.cancel_token)
+                self.build_book(book, build_only=build_only)
 
         elapsed_time = datetime.now() - start_time
+        if self.cache.enabled:
+            self.logger.info('Build cache: {} hits, {} misses'.format(
+                self.cache.hits, self.cache.misses))
+            self.prune_cache(start_timestamp, build_only)
         self.logger.info('Finished rendering all books in {}s!'.format(elapsed_time))
 
+    def prune_cache(self, start_timestamp, build_only):
+        """Remove the entries of the build cache that haven't been used for
+        ``build.cache-prune-age`` days, and that the build (which started at
+        ``start_timestamp``) didn't use either; see
+        :meth:`hon.cache.BuildCache.prune`.
+
+        Only a complete build prunes the cache: a partial build, a resumed
+        build, or a build by only some of the renderers, doesn't use the
+        entries of everything that it didn't build, though they're still up to
+        date. Pruning is disabled by the ``build.cache-prune`` configuration.
+        """
+        if not self.build_config.get('cache-prune', True):
+            return
+        if self.is_partial or self.resume:
+            return
+        if any(renderer.name not in build_only for renderer in self.renderers):
+            return
+
+        #: Modification times may only be kept to the second (or two), so the
+        #: entries used at the very start of the build are kept either way.
+        max_age = self.build_config.get('cache-prune-age', DEFAULT_CACHE_PRUNE_AGE)
+        max_age = max(0, to_int_ns(max_age or 0))
+        before = min(start_timestamp - CACHE_PRUNE_MARGIN, time.time() - max_age * 24 * 60 * 60)
+        removed, size = self.cache.prune(before)
+        if removed:
+            self.logger.info('Pruned {} unused entries ({} bytes) from the build cache.'.format(
+                removed, size))
+
+    def build_book(self, book, build_only=None):
+        """Build a single book, returning how long it took to build.
+
+        The book's chapters are prepared once, and then the book is rendered
+        by each of the renderers named in ``build_only``.
+        """
+        self.logger.info('Building book: {} ({})'.format(book.name, book.path))
+        start_time = datetime.now()
+
+        before_build.send(book)
+        self.prepare_book(book)
+        renderers = [r for r in self.renderers if build_only and r.name in build_only]
+        if self.concurrent_renderers and len(renderers) > 1 and can_fork():
+            self.render_concurrently(book, renderers)
+        else:
+            for renderer in renderers:
+                renderer.render(book, cancel_token=self.cancel_token)
+        after_build.send(book)
+
+        elapsed_time = datetime.now() - start_time
+        self.logger.info('Finished building book: {} in {}s!'.format(book.name, elapsed_time))
+        return elapsed_time
+
+    def build_books_concurrently(self, books, build_only, max_workers):
+        """Build each book in its own worker process.
+
+        At most ``max_workers`` books are built at the same time. Books are
+        independent of one another, so a book that fails to build doesn't stop
+        the others; once every book has been built the time taken by each of
+        them is reported, and if any failed a :class:`~hon.exc.BuildError` is
+        raised naming them. The ``before_build`` and ``after_build`` signals
+        are sent from within each book's worker process.
+        """
+        self.logger.info('Building {} books with {} workers'.format(len(books), max_workers))
+
+        results = fork_map(
+            lambda book: self.build_book(book, build_only=build_only),
+            books, max_workers=max_workers)
+
+        #: Books that were stopped because the build was cancelled aren't
+        #: failures.
+        raise_if_cancelled(self.cancel_token)
+
+        errors = []
+        for book, (ok, value) in zip(books, results):
+            if ok:
+                self.logger.info('  {}: built in {}s'.format(book.name, value))
+            else:
+                self.logger.info('  {}: failed'.format(book.name))
+                errors.append((book, value))
+
+        for book, error in errors:
+            self.logger.error('Failed to build book: {} ({})\n{}'.format(
+                book.name, book.path, error))
+        if errors:
+            raise BuildError('Failed to build {} of {} books: {}'.format(
+                len(errors), len(books), ', '.join(book.name for book, _ in errors)))
+
+    def build_scheduled(self, books, build_only, max_workers=None):
+        """Build the books as a graph of tasks, see :class:`hon.scheduler.TaskGraph`.
+
+        Each book is prepared by a task of its own, and every renderer's stages
+        are scheduled against it (see :meth:`hon.renderers.Renderer.schedule`).
+        Independent tasks run at the same time, e.g. a renderer's assets are
+        generated while the book's chapters are being parsed, and the EPUB is
+        packaged while the PDF is laid out. A renderer only renders one book's
+        pages at a time.
+
+        The tasks are run on threads, so pages aren't rendered in worker
+        processes (forking a process that is running threads isn't safe).
+        """
+        renderers = [r for r in self.renderers if build_only and r.name in build_only]
+
+        #: Create the build cache up front, so that every task shares it.
+        self.logger.debug('Using the build cache at: {}'.format(self.cache.path))
+
+        graph = TaskGraph()
+        last_tasks = {}
+        for book in books:
+            started = graph.add_task('{}:before_build'.format(book.path),
+                partial(before_build.send, book))
+            prepared = graph.add_task('{}:prepare'.format(book.path),
+                partial(self.prepare_book, book), depends_on=[started])
+
+            finished = []
+            for renderer in renderers:
+                task = renderer.schedule(book, graph, prepared,
+                    after=last_tasks.get(renderer.name))
+                last_tasks[renderer.name] = task
+                finished.append(task)
+
+            graph.add_task('{}:after_build'.format(book.path),
+                partial(after_build.send, book), depends_on=finished)
+
+        self.logger.info('Building {} books as {} tasks'.format(len(books), len(graph)))
+        graph.run(max_workers=max_workers, cancel_token=self.cancel_token)
+
     def do_teardown_appcontext(self, exc=_sentinel):
         """Called right before the application context is popped.
 
@@ -389,6 +868,54 @@ class Hon():
                     located_books.append(book_path)
         return sorted(set(located_books), key=attrgetter('filepath'))
 
+    def get_chapter_cache_key(self, book, chapter, raw_text=None):
+        """Return the build cache key for a chapter's markup.
+
+        The key is made from the chapter's raw text (unless another
+        ``raw_text`` is given), the book's configuration (including its
+        variables), the Markdown parser, the code highlighting, and the
+        configuration of the preprocessors. Chapters that include or import other templates also
+        depend on the contents of those templates, as recorded in the book's
+        dependency graph. If the templates a chapter depends on aren't known
+        yet, the chapter can't be cached and ``None`` is returned.
+        """
+        if raw_text is None:
+            raw_text = chapter.raw_text
+
+        templates = None
+        if TEMPLATE_REFERENCE_RE.search(raw_text):
+            templates = book.dependencies.get_digests(chapter.path)
+            if templates is None:
+                return None
+        highlighter = self.highlighter
+        highlighting = (highlighter.style, highlighter.version) if highlighter else None
+        return make_key(self.version, chapter.path, raw_text, book.config,
+            book.markdown_parser, highlighting, self.preprocessor_config, templates)
+
+    def get_chapter_parser(self, book, chapter, parser_class, text):
+        """Return a parser for the text of a chapter.
+
+        When incremental parsing is enabled, chapters of at least
+        ``INCREMENTAL_PARSE_MIN_SIZE`` characters are parsed by an
+        :class:`~hon.parsing.incremental.IncrementalParser`, which is kept for
+        as long as the application, e.g. while the book is being served; after
+        an edit only the chapter's blocks which changed are parsed again.
+
+        Otherwise chapters larger than ``build.parse-chunk-size`` are parsed
+        chunk by chunk, by a :class:`~hon.parsing.chunked.ChunkedParser`.
+        """
+        if not self.incremental_parse or len(text) < INCREMENTAL_PARSE_MIN_SIZE:
+            chunk_size = self.parse_chunk_size
+            if chunk_size and len(text) > chunk_size:
+                return ChunkedParser(parser_class, chunk_size=chunk_size)
+            return parser_class()
+
+        key = (book.path, chapter.path)
+        parser = self._incremental_parsers.get(key)
+        if parser is None or parser.parser_class is not parser_class:
+            parser = self._incremental_parsers[key] = IncrementalParser(parser_class)
+        return parser
+
     def get_plugin(self, name):
         """
         """
@@ -419,6 +946,9 @@ class Hon():
 
         book_paths = self.find_books(source_path)
 
+        #: Loading the books again, e.g. when rebuilding after a change while
+        #: serving the book, replaces any previously loaded books.
+        self.books = []
         for book_path in book_paths:
             book_config = BookConfig.from_file(book_path.config_filepath)
             book = Book(name=book_path.name, path=book_path.filepath, config=book_config)
@@ -429,6 +959,143 @@ class Hon():
             self.books.append(book)
         return self
 
+    def prepare_book(self, book):
+        """Load, preprocess, and parse a book's chapters.
+
+        This is done once per build, before any of the renderers are run. Each
+        renderer is then handed the same chapters, and their parsed markup,
+        rather than reading and parsing every chapter for itself.
+
+        Preprocessors are run against a book level render context, since they
+        are no longer run for a specific renderer the ``renderer`` they are
+        passed is ``None``.
+
+        The build's :attr:`cancel_token` is checked between chapters, as they
+        are preprocessed and parsed.
+        """
+        from .renderers import RenderContext
+
+        self.logger.debug('Preparing book: {}'.format(book.name))
+        chapters = book.load_chapters()
+        self.logger.debug('Successfully loaded {} chapters.'.format(len(chapters)))
+
+        #: Restore the markup of any chapter whose source, and everything else
+        #: that went into parsing it (including the templates it depends on,
+        #: as recorded by a previous build), is unchanged since a previous
+        #: build.
+        dependency_graph_filepath = self.cache.get_dependency_graph_filepath(book)
+        if self.cache.enabled:
+            book.dependencies = DependencyGraph.load(dependency_graph_filepath)
+
+        book.selected_paths = self.get_selected_paths(book)
+        if book.selected_paths is not None:
+            self.logger.info('Partial build, rendering the pages of {} of {} chapters.'.format(
+                len(book.selected_paths), len(book.items)))
+
+        #: The build journal records the units of the build as they are
+        #: completed. Unless the build is being resumed, it's started afresh.
+        book.journal = BuildJournal()
+        if self.cache.enabled:
+            journal_filepath = self.cache.get_journal_filepath(book)
+            if self.resume:
+                book.journal = BuildJournal.load(journal_filepath)
+                self.logger.info('Resuming the build of book: {}, {} units were completed.'.format(
+                    book.name, len(book.journal)))
+            else:
+                book.journal = BuildJournal(journal_filepath)
+                book.journal.reset()
+
+        for item in book.items:
+            raise_if_cancelled(self.cancel_token)
+            item.source_key = self.get_chapter_cache_key(book, item)
+            item.markup = self.cache.get('markup', item.source_key)
+            if item.markup is not None:
+                outline = self.cache.get('outline', item.source_key)
+                if outline is None:
+                    item.markup = None
+                else:
+                    item.outline = Outline.from_json(json.loads(outline))
+
+                    #: The chapter won't be preprocessed or parsed, so its
+                    #: source isn't needed any more.
+                    item.release_source()
+
+        context = RenderContext(book=book)
+        for preprocessor in self.preprocessors:
+            raise_if_cancelled(self.cancel_token)
+            if preprocessor.enabled:
+                self.logger.debug("Running the {} preprocessor.".format(preprocessor.name))
+                preprocessor.run(book, None, context)
+        book.data = context.data['book']
+
+        parsed_items = book.unparsed_items
+        book.parse_chapters()
+        for item in parsed_items:
+            item.source_key = self.get_chapter_cache_key(book, item, raw_text=item.source_text)
+            self.cache.set('markup', item.source_key, item.markup)
+            self.cache.set('outline', item.source_key, json.dumps(item.outline.to_json()))
+
+        #: The renderers only need each chapter's markup, so the chapters'
+        #: sources are released rather than kept in memory for the build.
+        for item in book.items:
+            item.release_source()
+
+        if self.cache.enabled:
+            book.dependencies.save(dependency_graph_filepath)
+        return book
+
+    def get_selected_paths(self, book):
+        """Return the paths of the chapters whose pages are rendered by a
+        partial build, or ``None`` if it isn't a partial build.
+
+        A chapter is selected if its source path, relative to the book, matches
+        any of the ``only`` patterns (if given) and its source, or a template
+        that it depends on, has changed since ``changed_since`` (if given).
+        """
+        if not self.is_partial:
+            return None
+
+        selected = set(item.path for item in book.items)
+        if self._only:
+            selected = set(path for path in selected if filename_matches_pattern(
+                os.path.relpath(path, start=book.path), self._only))
+
+        if self._changed_since is not None:
+            templates = set()
+            for path in selected:
+                templates.update(book.dependencies.get_dependencies(path) or ())
+            changed = get_changed_files(book.path, self._changed_since, selected | templates)
+            for template in changed & templates:
+                changed.update(book.dependencies.get_dependants(template))
+            selected = selected & changed
+        return selected
+
+    def render_concurrently(self, book, renderers):
+        """Run each of the renderers for a book in its own worker process.
+
+        The worker processes are forked after the book has been prepared, so
+        every renderer shares the book's already parsed chapters. If any of
+        the renderers fail, a :class:`~hon.exc.BuildError` is raised once all
+        of them have finished.
+        """
+        self.logger.info('Rendering book: {} with {} concurrent renderers'.format(
+            book.name, len(renderers)))
+
+        results = fork_map(
+            lambda renderer: renderer.render(book, cancel_token=self.cancel_token),
+            renderers)
+        raise_if_cancelled(self.cancel_token)
+
+        errors = []
+        for renderer, (ok, value) in zip(renderers, results):
+            if not ok:
+                self.logger.error('The {} renderer failed for book: {}\n{}'.format(
+                    renderer.name, book.name, value))
+                errors.append(renderer.name)
+        if errors:
+            raise BuildError('Failed to render book: {} with: {}'.format(
+                book.name, ', '.join(errors)))
+
     def register_plugin(self, plugin):
         key = 'plugin.{}'.format(plugin.get_name())
         plugin_config = dict(plugin.default_config)
@@ -6,6 +6,12 @@ import os
 import markdown
 
 from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Template
+
+from .cache import BuildJournal, DependencyGraph
+from .cancellation import raise_if_cancelled
+from .parsing import get_markdown_parser
 from .structure import Chapter, Part
 from .summary import parse_summary
 
@@ -23,10 +29,40 @@ class Book(object):
     :type config: Config
     """
 
+    @property
+    def items(self):
+        """A tuple containing all of the book's chapters, including any nested
+        chapters, in the order that they are read."""
+        def _flatten(chapters):
+            items = []
+            for chapter in chapters:
+                items.append(chapter)
+                if chapter.has_children:
+                    items.extend(_flatten(chapter.children))
+            return items
+        return tuple(_flatten(self.chapters))
+
+    @property
+    def markdown_parser(self):
+        """The name of the parser for the book's Markdown, i.e. its chapters
+        and summary. This is ``markdown-parser`` from the book's configuration
+        or, if it's not set, ``build.markdown-parser`` from .honrc."""
+        app = getattr(self, 'app', None)
+        return self.config.get('markdown-parser') or (app.markdown_parser if app else None)
+
     @property
     def title(self):
         return self.name
 
+    @property
+    def unparsed_items(self):
+        """A tuple of the book's chapters which haven't been parsed yet.
+
+        Chapters restored from the build cache already have their markup, and
+        don't need to be preprocessed or parsed again.
+        """
+        return tuple(item for item in self.items if item.markup is None)
+
     def __init__(self, app=None, name=None, path=None, author=None, language=None, config=None):
         #: The configuration associated with the book, if the configuration
         #: supplies overrides for the book's name, author, etc. it will
@@ -52,6 +88,29 @@ class Book(object):
         self.readme = None
         self.summary = None
 
+        #: The chapters of the book, loaded from disk as described by the
+        #: book's summary. Chapters are loaded, preprocessed, and parsed once
+        #: per build and then shared by every renderer.
+        self.chapters = []
+
+        #: The book's data in the render context that the book was prepared
+        #: with (e.g. the variables added by the variables preprocessor), which
+        #: is given to the render context of every renderer as ``book``.
+        self.data = {}
+
+        #: The templates that each of the book's chapters depends on, e.g.
+        #: through Jinja2 ``include`` or ``import`` statements.
+        self.dependencies = DependencyGraph()
+
+        #: The units of the book's build which have been completed, see:
+        #: ``hon.app.Hon.prepare_book``.
+        self.journal = BuildJournal()
+
+        #: The paths of the chapters whose pages are rendered by a partial
+        #: build, or ``None`` if every page is rendered, see:
+        #: ``hon.app.Hon.get_selected_paths``.
+        self.selected_paths = None
+
         if app:
             self.init_app(app)
 
@@ -73,6 +132,89 @@ class Book(object):
         self.app.logger.info('Loading book: {}'.format(self.name))
         self.parse_structure()
 
+    def load_chapters(self, max_workers=None):
+        """Use the book's summary to load the book's chapters from disk.
+
+        The chapter tree is built in the order of the summary, and then every
+        chapter's file is checked concurrently, by a pool of at most
+        ``max_workers`` threads (by default ``build.load-workers``). If any of
+        the files are missing, a ``FileNotFoundError`` naming all of them is
+        raised. The chapters' text is still only read when it's needed, see:
+        :attr:`hon.structure.Chapter.source_text`.
+        """
+        self.app.logger.debug('Loading chapters from disk')
+
+        chapters = []
+        for item in self.summary.all_parts:
+            if isinstance(item, Part):
+                chapter = self.load_chapter(item)
+                chapters.append(chapter)
+        self.chapters = chapters
+
+        if max_workers is None:
+            max_workers = self.app.load_workers
+
+        def find_missing(chapter):
+            if chapter.source_filepath is None or os.path.isfile(chapter.source_filepath):
+                return None
+            return chapter.source_filepath
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            missing = [path for path in executor.map(find_missing, self.items) if path]
+
+        if missing:
+            raise FileNotFoundError('{} chapter file(s) not found: {}'.format(
+                len(missing), ', '.join(missing)))
+        return self.chapters
+
+    def load_chapter(self, item, parent=None):
+        chapter_path = os.path.abspath(os.path.join(self.path, item.source))
+
+        #: The chapter's text is read later, see: ``load_chapters``.
+        chapter = Chapter(name=item.name, path=chapter_path, link=item.link,
+            parent=parent, source_filepath=chapter_path)
+
+        sub_chapters = []
+        if item.children:
+            for sub_item in item.children:
+                sub_chapter = self.load_chapter(sub_item, parent=item)
+                sub_chapters.append(sub_chapter)
+
+        if sub_chapters:
+            chapter.children = sub_chapters
+        return chapter
+
+    def parse_chapters(self):
+        """Parse the (preprocessed) raw text of each chapter into markup.
+
+        The markup is assigned to each chapter's ``markup`` attribute, and the
+        outline collected while parsing it (its headings, links, and images)
+        to its ``outline`` attribute. The markup is independent of any
+        renderer and is shared by all of them. Chapters
+        which already have their markup are not parsed again. Code blocks are
+        highlighted, see: :attr:`hon.app.Hon.highlighter`. Large chapters
+        may be parsed incrementally, see:
+        :meth:`hon.app.Hon.get_chapter_parser`. If the build is cancelled, no
+        more chapters are parsed.
+        """
+        highlighter = self.app.highlighter
+        parser_class = get_markdown_parser(self.markdown_parser,
+            highlighting=highlighter is not None)
+        self.app.logger.debug('Parsing chapters with: {}'.format(parser_class.__name__))
+        for item in self.unparsed_items:
+            raise_if_cancelled(self.app.cancel_token)
+            raw_text = str(item.raw_text)
+            parser = self.app.get_chapter_parser(self, item, parser_class, raw_text)
+            markup = parser.parse(raw_text)
+            if markup:
+                intermediate_template = Template(markup)
+                markup = intermediate_template.render(book={})
+            if markup and highlighter is not None:
+                markup = highlighter.highlight(markup, cache=self.app.cache)
+            item.markup = markup
+            item.outline = parser.outline
+        return self.chapters
+
     def parse_structure(self):
         """Parse a the structure files defining a book.
 
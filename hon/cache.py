@@ -0,0 +1,421 @@
+"""
+    hon.cache
+    ~~~~~
+
+    A persistent, content addressed cache of build outputs.
+
+    Every entry in the cache is stored under a key which is a hash of all of
+    the inputs that produced it, e.g. a chapter's raw text, the book's
+    configuration, and the versions of the theme templates. If none of the
+    inputs change the key doesn't change either, and the cached output can be
+    reused rather than built again. Entries are never invalidated, a change to
+    any input simply results in a different key.
+
+    Instead, the cache is pruned: every entry that a build uses (reads, or
+    writes) is marked as used, by its modification time, and once a complete
+    build has finished the entries that haven't been used for a while, e.g.
+    those of a chapter's text before it was edited, are removed. See:
+    :meth:`BuildCache.prune` and the ``build.cache-prune`` configuration.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import jinja2
+
+#: The default directory, relative to the project root, of the build cache.
+DEFAULT_CACHE_DIR = '.hon-cache'
+
+#: The namespace of the build cache where compiled templates are kept, see:
+#: :class:`TemplateBytecodeCache`.
+TEMPLATE_BYTECODE_NAMESPACE = 'jinja-bytecode'
+
+#: The directories of the build cache which aren't namespaces of entries, and
+#: so are never pruned.
+UNPRUNED_DIRS = ('latest', 'dependencies', 'journal')
+
+
+def make_key(*parts):
+    """Make a cache key from one or more inputs.
+
+    The inputs can be anything that can be serialized to JSON; values that
+    can't be serialized, e.g. paths or dates, are converted to strings.
+    """
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class BuildCache(object):
+    """A persistent, content addressed cache of build outputs.
+
+    Entries are grouped into namespaces, e.g. ``markup`` for parsed chapters
+    or the name of a renderer for rendered pages, and are written to disk
+    atomically so that worker processes can share the same cache. A disabled
+    cache never has any entries, and ignores anything that is stored in it.
+
+    :type path: str
+    :type enabled: bool
+    """
+
+    def __init__(self, path, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def _get_filepath(self, namespace, key):
+        return os.path.join(self.path, namespace, key[:2], key)
+
+    def contains(self, namespace, key):
+        """Return ``True`` if the key is cached, without reading its entry.
+
+        A key that isn't cached is counted as a miss.
+        """
+        if not self.enabled or key is None:
+            return False
+        if self._touch(self._get_filepath(namespace, key)):
+            return True
+        self.misses += 1
+        return False
+
+    def get(self, namespace, key):
+        """Return the cached entry for a key, or ``None`` if the key isn't
+        cached."""
+        if not self.enabled or key is None:
+            return None
+
+        filepath = self._get_filepath(namespace, key)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                value = f.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(filepath)
+        return value
+
+    def set(self, namespace, key, value):
+        """Store an entry in the cache, under the given key."""
+        if not self.enabled or key is None or value is None:
+            return
+        _write_atomically(self._get_filepath(namespace, key), value)
+
+    def get_bytes(self, namespace, key):
+        """Return the cached binary entry for a key, or ``None`` if the key
+        isn't cached."""
+        if not self.enabled or key is None:
+            return None
+
+        filepath = self._get_filepath(namespace, key)
+        try:
+            with open(filepath, 'rb') as f:
+                value = f.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(filepath)
+        return value
+
+    def set_bytes(self, namespace, key, value):
+        """Store a binary entry in the cache, under the given key."""
+        self.set(namespace, key, value)
+
+    def touch(self, namespace, key):
+        """Mark an entry as used, without reading it, e.g. when it was read
+        from memory instead; see: :meth:`prune`."""
+        if self.enabled and key is not None:
+            self._touch(self._get_filepath(namespace, key))
+
+    def _touch(self, filepath):
+        """Set the modification time of an entry's file to now, returning
+        ``False`` if the file doesn't exist."""
+        now = time.time()
+        try:
+            os.utime(filepath, (now, now))
+        except OSError:
+            return False
+        return True
+
+    def prune(self, before):
+        """Remove every entry that hasn't been used since ``before`` (a
+        timestamp, e.g. the time the last complete build started); returning
+        the number of entries removed, and their size in bytes.
+
+        An entry is used whenever it's written or read, or checked for, so the
+        entries that remain are those that the build used. The index of the
+        latest entries, the dependency graphs, and the journals aren't pruned.
+        """
+        removed = 0
+        size = 0
+        if not self.enabled or not os.path.isdir(self.path):
+            return removed, size
+
+        for name in os.listdir(self.path):
+            if name in UNPRUNED_DIRS:
+                continue
+            for dirpath, _, filenames in os.walk(os.path.join(self.path, name)):
+                for filename in filenames:
+                    filepath = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(filepath)
+                        if stat.st_mtime >= before:
+                            continue
+                        os.remove(filepath)
+                    except OSError:
+                        continue
+                    removed += 1
+                    size += stat.st_size
+        return removed, size
+
+    def get_latest_key(self, namespace, name):
+        """Return the key of the entry most recently stored for a name (e.g.
+        a page's path), whatever its inputs were, or ``None``."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._get_latest_filepath(namespace, name), 'r', encoding='utf-8') as f:
+                key = f.read()
+        except (IOError, OSError):
+            return None
+        if not os.path.exists(self._get_filepath(namespace, key)):
+            return None
+        return key
+
+    def set_latest_key(self, namespace, name, key):
+        """Record the key of the entry most recently stored for a name."""
+        if not self.enabled or key is None:
+            return
+        if self.get_latest_key(namespace, name) != key:
+            _write_atomically(self._get_latest_filepath(namespace, name), key)
+
+    def _get_latest_filepath(self, namespace, name):
+        return os.path.join(self.path, 'latest', namespace, make_key(name))
+
+    def get_dependency_graph_filepath(self, book):
+        """Return the path of the persisted dependency graph for a book."""
+        return os.path.join(self.path, 'dependencies', '{}.json'.format(make_key(book.path)))
+
+    def get_journal_filepath(self, book):
+        """Return the path of the build journal for a book."""
+        return os.path.join(self.path, 'journal', '{}.jsonl'.format(make_key(book.path)))
+
+
+class BuildJournal(object):
+    """A journal of the units of a book's build that have been completed.
+
+    A unit, e.g. a page rendered by a renderer, or all of a renderer's work for
+    the book, is appended to the journal as a line of JSON as soon as it's
+    complete; so the units completed by a build that died partway through
+    survive it, and a later build can be resumed from them (see the
+    ``--resume`` option of ``hon build``).
+
+    Each unit is recorded with the key of its inputs, a unit is only complete
+    if it was completed with the same inputs. A journal without a filepath is
+    only kept in memory.
+
+    :type filepath: str
+    """
+
+    def __init__(self, filepath=None, entries=None):
+        self.filepath = filepath
+        self._completed = set(tuple(entry) for entry in (entries or ()))
+
+    def __len__(self):
+        return len(self._completed)
+
+    def count(self, unit, name):
+        """Return the number of completed units of a kind, e.g. the pages
+        rendered by a renderer."""
+        return sum(1 for entry in self._completed if entry[:2] == (unit, name))
+
+    def is_complete(self, unit, name, key):
+        return key is not None and (unit, name, key) in self._completed
+
+    def record(self, unit, name, key):
+        """Record that a unit has been completed, a unit without a key is
+        never recorded."""
+        if key is None:
+            return
+        entry = (unit, name, key)
+        self._completed.add(entry)
+
+        if self.filepath:
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            with open(self.filepath, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def reset(self):
+        """Forget every completed unit, e.g. when a build is started afresh."""
+        self._completed = set()
+        if self.filepath and os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+    @classmethod
+    def load(cls, filepath):
+        """Load a journal, ignoring any entry that can't be read (e.g. one
+        that was only partially written when a build died). If the file
+        doesn't exist the journal is empty."""
+        entries = []
+        line = '\n'
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, list) and len(entry) == 3:
+                        entries.append(entry)
+
+            #: End a partially written entry, so that entries recorded by the
+            #: resumed build start on a line of their own.
+            if not line.endswith('\n'):
+                with open(filepath, 'a', encoding='utf-8') as f:
+                    f.write('\n')
+        except (IOError, OSError):
+            pass
+        return cls(filepath, entries)
+
+
+class DependencyGraph(object):
+    """A graph of the templates that each of a book's chapters depends on.
+
+    When a chapter is preprocessed, every template that it includes or imports
+    (directly, or through another template) is recorded against the chapter.
+    The graph can then be used to find the chapters affected by a change to a
+    template, e.g. a shared file of macros, and to make cache keys for
+    chapters that include the current contents of every template they depend
+    on. All paths in the graph are absolute.
+    """
+
+    def __init__(self, dependencies=None):
+        self._dependencies = {}
+        for path, templates in (dependencies or {}).items():
+            self.set_dependencies(path, templates)
+
+    def __len__(self):
+        return len(self._dependencies)
+
+    def get_dependants(self, template_path):
+        """Return the paths of the chapters which depend on a template."""
+        template_path = os.path.abspath(template_path)
+        return sorted(path for path, templates in self._dependencies.items()
+            if template_path in templates)
+
+    def get_dependencies(self, path):
+        """Return the paths of the templates a chapter depends on, or ``None``
+        if the chapter isn't in the graph."""
+        return self._dependencies.get(os.path.abspath(path))
+
+    def get_digests(self, path):
+        """Return the path and a digest of the contents of every template a
+        chapter depends on, or ``None`` if the chapter isn't in the graph.
+
+        The digest of a template that no longer exists is ``None``.
+        """
+        dependencies = self.get_dependencies(path)
+        if dependencies is None:
+            return None
+        return [(template, file_digest(template)) for template in dependencies]
+
+    def set_dependencies(self, path, templates):
+        """Record the templates that a chapter depends on, replacing those that
+        were previously recorded."""
+        dependencies = []
+        for template in templates:
+            template = os.path.abspath(template)
+            if template not in dependencies:
+                dependencies.append(template)
+        self._dependencies[os.path.abspath(path)] = tuple(dependencies)
+
+    def to_json(self):
+        return {path: list(templates) for path, templates in self._dependencies.items()}
+
+    @classmethod
+    def load(cls, filepath):
+        """Load a persisted dependency graph, if the file doesn't exist (or
+        can't be read) the graph is empty."""
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (IOError, OSError, ValueError):
+            return cls()
+
+    def save(self, filepath):
+        _write_atomically(filepath, json.dumps(self.to_json(), sort_keys=True, indent=2))
+
+
+class TemplateBytecodeCache(jinja2.BytecodeCache):
+    """A Jinja2 bytecode cache, which keeps compiled templates in the build
+    cache's ``jinja-bytecode`` namespace.
+
+    Each template is keyed by its name and filename, a hash of its source, and
+    the versions of Jinja2 and Python that compiled it; a template that hasn't
+    changed is never compiled again, by this build or any later one. Templates
+    without a filename, e.g. a chapter's text, aren't cached.
+
+    :type cache: BuildCache
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get_cache_key(self, name, filename=None):
+        if filename is None:
+            return None
+        return super(TemplateBytecodeCache, self).get_cache_key(name, filename)
+
+    def get_bucket_key(self, bucket):
+        """Return the build cache key of a bucket's compiled template, or
+        ``None`` if it can't be cached."""
+        if bucket.key is None:
+            return None
+        return make_key(jinja2.__version__, sys.version_info[:2], bucket.key, bucket.checksum)
+
+    def load_bytecode(self, bucket):
+        bytecode = self.cache.get_bytes(TEMPLATE_BYTECODE_NAMESPACE, self.get_bucket_key(bucket))
+        if bytecode is not None:
+            bucket.bytecode_from_string(bytecode)
+
+    def dump_bytecode(self, bucket):
+        self.cache.set_bytes(TEMPLATE_BYTECODE_NAMESPACE, self.get_bucket_key(bucket),
+            bucket.bytecode_to_string())
+
+    def clear(self):
+        #: Entries are never invalidated, see: :class:`BuildCache`.
+        pass
+
+
+def file_digest(filepath):
+    """Return a digest of a file's contents, or ``None`` if the file can't be
+    read."""
+    try:
+        with open(filepath, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (IOError, OSError):
+        return None
+
+
+def _write_atomically(filepath, value):
+    """Write a file by writing a temporary file and renaming it, so that the
+    file is never seen partially written."""
+    dirname = os.path.dirname(filepath)
+    os.makedirs(dirname, exist_ok=True)
+
+    handle, temp_filepath = tempfile.mkstemp(dir=dirname)
+    try:
+        if isinstance(value, bytes):
+            f = os.fdopen(handle, 'wb')
+        else:
+            f = os.fdopen(handle, 'w', encoding='utf-8')
+        with f:
+            f.write(value)
+        os.replace(temp_filepath, filepath)
+    except BaseException:
+        os.remove(temp_filepath)
+        raise
@@ -0,0 +1,49 @@
+"""
+    hon.cancellation
+    ~~~~~
+
+    Cooperative cancellation of builds.
+
+    A build is handed a :class:`CancellationToken`, and checks it between
+    units of work, e.g. before rendering each page. Cancelling the token (from
+    another thread, e.g. when a newer change to the book has made the build
+    stale) stops the build at the next check, by raising
+    :class:`~hon.exc.BuildCancelled`.
+"""
+import multiprocessing
+
+from .exc import BuildCancelled
+
+
+class CancellationToken(object):
+    """A token that signals a build to stop.
+
+    The token is backed by a :class:`multiprocessing.Event`, so worker
+    processes forked by the build (see :mod:`hon.utils.processutils`) see it
+    being cancelled too.
+    """
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def __init__(self):
+        self._event = multiprocessing.Event()
+
+    def __repr__(self):
+        return '<CancellationToken(cancelled={})>'.format(self.cancelled)
+
+    def cancel(self):
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        """Raise :class:`~hon.exc.BuildCancelled` if the token was cancelled."""
+        if self.cancelled:
+            raise BuildCancelled('The build was cancelled.')
+
+
+def raise_if_cancelled(cancel_token):
+    """Raise :class:`~hon.exc.BuildCancelled` if ``cancel_token`` is given and
+    was cancelled."""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
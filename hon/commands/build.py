@@ -55,8 +55,39 @@ The book is built using one or more of the configured renderers.
 """, short_help='Builds a book from its markdown files', cls=BuildCommand)
 @click.argument('book', default=None, required=False)
 @click.argument('output', default=None, required=False)
+@click.option('-j', '--jobs', 'jobs', type=int, default=None,
+    help=('Number of worker processes used to render pages (Default is '
+        'build.workers from .honrc, or 1)'))
+@click.option('--book-jobs', 'book_jobs', type=int, default=None,
+    help=('Maximum number of books built at the same time, each in its own '
+        'worker process (Default is build.book-workers from .honrc, or 1)'))
+@click.option('--concurrent-renderers/--serial-renderers', 'concurrent_renderers',
+    default=None, help=('Run the renderers concurrently, each in its own '
+        'worker process (Default is build.concurrent-renderers from .honrc, '
+        'or serial)'))
+@click.option('--cache/--no-cache', 'use_cache', default=None,
+    help=('Reuse unchanged chapters and pages from the build cache (Default is '
+        'build.cache from .honrc, or true)'))
+@click.option('--stream/--no-stream', 'streaming', default=None,
+    help=('Write each page as soon as it is rendered, keeping memory use '
+        'bounded (Default is build.streaming from .honrc, or false)'))
+@click.option('--schedule/--no-schedule', 'scheduler', default=None,
+    help=('Run the build as a graph of tasks, overlapping independent stages '
+        '(Default is build.scheduler from .honrc, or false)'))
+@click.option('--resume', 'resume', is_flag=True, default=False,
+    help=('Resume a build that didn\'t finish, skipping the renderers and pages '
+        'it already completed'))
+@click.option('--only', 'only', multiple=True, metavar='GLOB',
+    help=('Only render the pages of the chapters whose source paths match the '
+        'pattern, the other pages are reused from the build cache (May be '
+        'given more than once)'))
+@click.option('--changed-since', 'changed_since', default=None, metavar='REV|TIMESTAMP',
+    help=('Only render the pages of the chapters that have changed since a '
+        'git revision or a timestamp, the other pages are reused from the '
+        'build cache'))
 @with_context
-def build_command(book, output, **kwargs):
+def build_command(book, output, jobs, book_jobs, concurrent_renderers, use_cache,
+        streaming, scheduler, resume, only, changed_since, **kwargs):
     """
     """
     #: The enabled/disabled renderers for this run of the build command are
@@ -83,5 +114,14 @@ def build_command(book, output, **kwargs):
     current_app.load_books(source_path=book_abspath)
     current_app.build(
         build_only=tuple(build_only),
-        output_path_override=output
+        output_path_override=output,
+        workers=jobs,
+        concurrent_renderers=concurrent_renderers,
+        book_workers=book_jobs,
+        use_cache=use_cache,
+        streaming=streaming,
+        scheduler=scheduler,
+        resume=resume,
+        only=only or None,
+        changed_since=changed_since
     )
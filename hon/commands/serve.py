@@ -17,7 +17,8 @@
 """
 import click
 import os
-from flask import Flask, send_from_directory
+from flask import abort, Flask, send_from_directory
+from html import escape
 
 from hon import _app_ctx_stack, current_app as hon_app
 from ..cli import with_context
@@ -26,11 +27,23 @@ from ..server import FlaskHon
 
 def build_book(book_path):
     hon_app.load_books(source_path=book_path)
-    hon_app.build()
 
+    #: Large chapters are parsed incrementally, so that the rebuild after an
+    #: edit only parses the blocks of the chapter which changed.
+    hon_app.build(incremental_parse=True)
+
+
+def create_flask_app(serve_from=None, book_dirs=None):
+    """Create the Flask app that will be used to serve the book.
+
+    A project with more than one book writes each book under a directory of
+    its own (see: :meth:`hon.renderers.RenderContext.init_book`), those
+    directories are given as ``book_dirs``. Each book is then served under
+    ``/<book>/``, and the root lists the books.
+    """
+    if book_dirs:
+        return _create_multi_book_flask_app(serve_from, book_dirs)
 
-def create_flask_app(serve_from=None):
-    """Create the Flask app that will be used to serve the book."""
     static_folder = None
     if serve_from:
         static_folder = os.path.abspath(os.path.join(serve_from, 'html'))
@@ -44,6 +57,25 @@ def create_flask_app(serve_from=None):
     return app
 
 
+def _create_multi_book_flask_app(serve_from, book_dirs):
+    serve_from = os.path.abspath(serve_from or '.')
+    app = Flask('hon', static_folder=None)
+
+    @app.route('/')
+    def send_index():
+        links = ''.join('<li><a href="{0}/">{0}</a></li>'.format(escape(book_dir))
+            for book_dir in book_dirs)
+        return '<!DOCTYPE html>\n<html><body><ul>{}</ul></body></html>'.format(links)
+
+    @app.route('/<book_dir>/', defaults={'path': 'index.html'})
+    @app.route('/<book_dir>/<path:path>')
+    def send_html(book_dir, path):
+        if book_dir not in book_dirs:
+            abort(404)
+        return send_from_directory(os.path.join(serve_from, book_dir, 'html'), path)
+    return app
+
+
 @click.command('serve', short_help='Serve the book as a website for testing')
 @click.argument('book', default=None, required=False)
 @click.argument('output', default='book', required=False)
@@ -66,9 +98,13 @@ def serve_command(book, output, port, watch):
 
     build_book(book_abspath)
 
+    book_dirs = None
+    if len(hon_app.books) > 1:
+        book_dirs = [os.path.basename(loaded.path) for loaded in hon_app.books]
+
     flask_app = None
     try:
-        flask_app = create_flask_app(serve_from=output)
+        flask_app = create_flask_app(serve_from=output, book_dirs=book_dirs)
         flask_hon = FlaskHon(flask_app, hon_app=hon_app._get_current_object(),
             book_path=book_abspath, enable_watch=watch)
 
@@ -62,6 +62,10 @@ class BookConfig(dict):
     def language(self):
         return self.get('language', HON_DEFAULT_LANGUAGE)
 
+    @property
+    def markdown_parser(self):
+        return self.get('markdown-parser')
+
     @property
     def preprocessors(self):
         return self.get('preprocessors', {})
@@ -1,3 +1,13 @@
 class InvalidBookError(Exception):
     """Raised if a book is invalid, usually raised when a NoneType is passed in
     place of a Book object."""
+
+
+class BuildError(Exception):
+    """Raised if part of a build, e.g. a renderer run in a worker process,
+    failed."""
+
+
+class BuildCancelled(BuildError):
+    """Raised when a build is stopped because its cancellation token was
+    cancelled, see :class:`hon.cancellation.CancellationToken`."""
@@ -2,11 +2,12 @@
     hon.parsers.summary_parser
     ~~~~~
 """
+import html
 import os
+import re
 
-from hon.parsing import MarkdownParser
+from hon.parsing import get_markdown_parser
 from hon.structure import Part, Section, Summary
-from hon.utils import xmlutils
 
 
 def stringify_events(element):
@@ -16,8 +17,71 @@ def stringify_events(element):
     return ''.join(element.itertext()).strip()
 
 
+#: The lines of a `SUMMARY.md` which the parser recognizes.
+ATX_HEADING_RE = re.compile(r'^(#{1,6})(.*?)#*\s*$')
+SETEXT_UNDERLINE_RE = re.compile(r'^(=+|-+)\s*$')
+SEPARATOR_RE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+LIST_ITEM_RE = re.compile(r'^[ \t]*(?:[-*+]|\d+[.)])(?:[ \t]+(.*))?$')
+LIST_MARKERS = frozenset('-*+0123456789')
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+
+#: Inline Markdown, for finding links and for stripping styling from text.
+#: A link's destination is either wrapped in angle brackets, when it may
+#: contain spaces, or has none.
+LINK_RE = re.compile(r'(?<!!)\[((?:[^\[\]\\]|\\.)*)\]\(\s*(?:<([^>]*)>|([^)\s]*))(?:\s+["\'(][^)]*["\')])?\s*\)')
+IMAGE_RE = re.compile(r'!\[((?:[^\[\]\\]|\\.)*)\]\([^)]*\)')
+CODE_RE = re.compile(r'(`+)(.+?)\1')
+STRONG_RE = re.compile(r'(\*\*|__)(.+?)\1')
+EMPHASIS_RE = re.compile(r'\*(.+?)\*|(?<!\w)_(.+?)_(?!\w)')
+TAG_RE = re.compile(r'<[^>]+>')
+ESCAPE_RE = re.compile(r'\\(.)')
+INLINE_MARKUP_RE = re.compile(r'[\[`*_<>\\&]')
+
+
+def get_link_href(link):
+    """Return the destination of a link matched by ``LINK_RE``."""
+    if link.group(2) is not None:
+        return link.group(2)
+    return link.group(3)
+
+
+def strip_inline_markdown(text):
+    """Return the plain text of a line of Markdown, without any of its inline
+    styling, e.g. ``My **Awesome** Summary`` becomes ``My Awesome Summary``."""
+    if not INLINE_MARKUP_RE.search(text):
+        return text.strip()
+    text = IMAGE_RE.sub(r'\1', text)
+    text = LINK_RE.sub(r'\1', text)
+    text = CODE_RE.sub(lambda m: m.group(2).strip(), text)
+    text = STRONG_RE.sub(r'\2', text)
+    text = EMPHASIS_RE.sub(lambda m: m.group(1) or m.group(2), text)
+    text = TAG_RE.sub('', text)
+    return html.unescape(ESCAPE_RE.sub(r'\1', text)).strip()
+
+
+#: The indentation, in spaces, of each level of a nested list.
+TAB_LENGTH = 4
+
+
+def _get_indent(text):
+    if '\t' in text:
+        text = text.expandtabs(TAB_LENGTH)
+    return len(text) - len(text.lstrip())
+
+
+class _ListItem(object):
+    """An item of a list in a `SUMMARY.md`, which becomes a part once every
+    line of the item, and of its nested items, has been read."""
+    __slots__ = ('level', 'lines', 'children')
+
+    def __init__(self, level, text):
+        self.level = level
+        self.lines = [text]
+        self.children = []
+
+
 class SummaryParser():
-    """A recursive descent (-ish) parser for a `SUMMARY.md`.
+    """A single pass, line oriented, parser for a `SUMMARY.md`.
 
 
     # Grammar
@@ -42,13 +106,38 @@ class SummaryParser():
 
     > **Note:** the `TEXT` terminal is "normal" text, and should (roughly)
     > match the following regex: "[^<>\n[]]+".
+
+    The summary is read a line at a time, building the summary's sections
+    and parts directly rather than converting the whole summary to HTML and
+    walking the element tree. A heading (other than the title) or a separator
+    starts a new section; a list's items become numbered parts, nested by
+    their indentation; and the links of a paragraph become the prefix or
+    suffix parts, which have no level. A list item without a link is skipped,
+    along with the items nested in it.
+
+    Items are nested as they are by Python-Markdown: each level of a nested
+    list is indented by four spaces (or a tab), so an item indented by less
+    than that, e.g. two spaces, is a sibling of the item before it. An item
+    indented by more than one level deeper than the item before it is only a
+    continuation of that item's text.
     """
     def __init__(self, app=None, src=None, book=None):
         self.app = app
         self.book = book
         self.src = src
-        self.stream = MarkdownParser()
-        self.stream.parse(self.src or '')
+        self._stream = None
+        self._title = None
+        self._sections = None
+
+    @property
+    def stream(self):
+        """The summary parsed by the book's Markdown parser, which is only
+        done if something asks for it; the summary itself is parsed without
+        it."""
+        if self._stream is None:
+            self._stream = get_markdown_parser(self.book.markdown_parser if self.book else None)()
+            self._stream.parse(self.src or '')
+        return self._stream
 
     def parse(self):
         """Parse the text the `SummaryParser` was created with."""
@@ -70,88 +159,158 @@ class SummaryParser():
         return Part('README', source=os.path.relpath(readme_file, self.book.path))
 
     def parse_sections(self):
-        sections = []
-
-        section_heading_tags = ['h2', 'h3', 'h4', 'h5', 'h6', 'hr']
-        section_body_tags = ['ul', 'ol', 'p', 'a']
-
-        tags = tuple(section_heading_tags + section_body_tags)
-        events = xmlutils.find_elements_by_tag(self.stream.parse_tree, tag_names=tags, max_depth=1)
-
-        for e in events:
-            if e.tag in section_heading_tags:
-                title = None
-                if e.tag in ('h2', 'h3', 'h4', 'h5', 'h6'):
-                    title = stringify_events(e)
-                section = Section(title=title)
-                sections.append(section)
-            elif e.tag == 'ul' or e.tag == 'ol':
-                if not sections:
-                    section = Section()
-                    sections.append(section)
-                parts = self.parse_parts(e)
-                sections[-1].add_parts(parts)
-            elif e.tag == 'p':
-                if not sections:
-                    section = Section()
-                    sections.append(section)
-                parts = self.parse_parts(e)
-                sections[-1].add_parts(parts)
-        return sections
-
-    def parse_parts(self, parent, level=0):
-        self.app.logger.debug('(LEVEL {level}) Parsing parts for: {parent}'.format(level=level, parent=parent))
-        parts = []
-
-        for e in list(parent):
-            if e.tag == 'a':
-                part = self.create_part(e)
-                parts.append(part)
-            elif e.tag == 'li':
-                part = self.parse_part(e, level=level)
-                if part:
-                    self.app.logger.debug(('(LEVEL {level}) Adding part link: '
-                        '{part}').format(level=level, part=part))
-                    parts.append(part)
-            else:
-                if len(parts) < 1:
-                    raise IndexError('Encountered nested list before any parts were parsed')
-                bunch_of_parts = self.parse_parts(e, level=level + 1 if level else None)
-                parts[-1].extend(bunch_of_parts)
-        return parts
+        if self._sections is None:
+            self._read()
+        return self._sections
 
-    def parse_part(self, list_item, level=0):
-        self.app.logger.debug('(LEVEL {level}) Parsing part from : {list_item}'.format(level=level, list_item=list_item))
-
-        part = None
-        link_element = xmlutils.find_first_element_by_tag(list_item, 'a', skip=['ul', 'ol'])
-        if link_element is not None:
-            self.app.logger.debug(('(LEVEL {level}) Found chapter link: '
-                '{link_element} for: {link_element_text}').format(level=level,
-                link_element=link_element, link_element_text=link_element.text))
-            part = self.create_part(link_element, level=level)
-
-        if part:
-            children = []
-            subparts = xmlutils.find_elements_by_tag(list_item, tag_names=('ul', 'ol'), max_depth=1)
-            for e in list(subparts):
-                if e.tag in ('ul', 'ol'):
-                    children = self.parse_parts(e, level=level + 1)
-            part.children = children
-        return part
+    def parse_title(self):
+        """Try to parse the title line."""
+        if self._sections is None:
+            self._read()
+        return self._title or ''
 
     def create_part(self, element, level=None):
-        href = element.get('href')
+        return self._create_part(element.text, element.get('href'), level=level)
+
+    def _create_part(self, name, href, level=None):
         if not href:
             raise ValueError("You can't have an empty link.")
-        return Part(name=element.text, source=href, level=level)
+        return Part(name=name, source=href, level=level)
+
+    def _read(self):
+        """Read the summary, a line at a time, into its title and sections."""
+        self._title = None
+        self._sections = []
+
+        paragraph = []
+
+        #: The items of the list being read, the items at its root, and the
+        #: items that are open (i.e. that a nested item could belong to).
+        roots = []
+        items = []
+        fence = None
+        in_comment = False
+        previous_blank = True
+
+        for line in (self.src or '').splitlines():
+            stripped = line.strip()
+
+            #: Code blocks and HTML comments are never a part of the summary.
+            if fence:
+                if stripped.startswith(fence):
+                    fence = None
+                continue
+            if in_comment:
+                in_comment = '-->' not in line
+                continue
+            if not stripped:
+                self._end_paragraph(paragraph)
+                previous_blank = True
+                continue
+
+            first = stripped[0]
+            match = FENCE_RE.match(line) if first in '`~' else None
+            if match:
+                fence = match.group(1)
+                continue
+            if stripped.startswith('<!--'):
+                in_comment = '-->' not in stripped
+                continue
+
+            indent = _get_indent(line)
+            match = SETEXT_UNDERLINE_RE.match(line) if len(paragraph) == 1 else None
+            if match:
+                self._add_heading(1 if match.group(1)[0] == '=' else 2, paragraph.pop())
+            elif first in '-*_' and SEPARATOR_RE.match(line):
+                self._end_paragraph(paragraph)
+                self._end_list(roots, items)
+                self._add_section()
+            elif line[0] == '#':
+                self._end_paragraph(paragraph)
+                self._end_list(roots, items)
+                match = ATX_HEADING_RE.match(line)
+                self._add_heading(len(match.group(1)), match.group(2))
+            elif first in LIST_MARKERS and not paragraph and (
+                    items or indent < 4 or not previous_blank) and LIST_ITEM_RE.match(line):
+                match = LIST_ITEM_RE.match(line)
+                level = indent // TAB_LENGTH
+                while items and items[-1].level >= level:
+                    items.pop()
+                if items and level > items[-1].level + 1:
+                    items[-1].lines.append(stripped)
+                    previous_blank = False
+                    continue
+
+                item = _ListItem(level, match.group(1) or '')
+                if items:
+                    items[-1].children.append(item)
+                else:
+                    roots.append(item)
+                items.append(item)
+            elif items and (indent > 0 or not previous_blank):
+                #: A continuation of the last list item.
+                items[-1].lines.append(stripped)
+            elif indent >= 4 and previous_blank and not paragraph:
+                #: An indented code block.
+                pass
+            else:
+                self._end_list(roots, items)
+                paragraph.append(stripped)
+            previous_blank = False
 
-    def parse_title(self):
-        """Try to parse the title line."""
-        if self.stream.parse_tree:
-            title_tag = self.stream.parse_tree.find('h1')
-            return stringify_events(title_tag)
-        return ''
+        self._end_paragraph(paragraph)
+        self._end_list(roots, items)
+
+    def _add_section(self, title=None):
+        self._sections.append(Section(title=title))
+
+    def _add_heading(self, level, text):
+        text = strip_inline_markdown(text)
+        if level == 1:
+            if self._title is None:
+                self._title = text
+        else:
+            self._add_section(title=text)
+
+    def _current_section(self):
+        if not self._sections:
+            self._add_section()
+        return self._sections[-1]
+
+    def _end_paragraph(self, paragraph):
+        """Add the links of a paragraph, as parts without a level."""
+        if not paragraph:
+            return
+        section = self._current_section()
+        for line in paragraph:
+            for link in LINK_RE.finditer(line):
+                section.add_part(self._create_part(strip_inline_markdown(link.group(1)),
+                    get_link_href(link)))
+        del paragraph[:]
+
+    def _end_list(self, roots, items):
+        """Add the parts of a list, once all of its items have been read."""
+        if not roots:
+            return
+        self._current_section().add_parts(self._create_list_parts(roots, 0))
+        del roots[:]
+        del items[:]
+
+    def _create_list_parts(self, items, level):
+        parts = []
+        for item in items:
+            link = None
+            for line in item.lines:
+                link = LINK_RE.search(line)
+                if link:
+                    break
+            if link is None:
+                continue
+            part = self._create_part(strip_inline_markdown(link.group(1)),
+                get_link_href(link), level=level)
+            part.children = self._create_list_parts(item.children, level + 1)
+            parts.append(part)
+        return parts
 
 
 class SectionNumber():
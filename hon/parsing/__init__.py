@@ -1,3 +1,33 @@
 from .parser import Parser
 from .asciidoc import AsciiDocParser
-from .markdown import MarkdownParser, MistuneParser
+from .markdown import FencedMarkdownParser, MarkdownParser, MistuneParser
+
+
+#: The Markdown parsers that a book can be parsed with, by name.
+MARKDOWN_PARSERS = {
+    'markdown': MarkdownParser,
+    'mistune': MistuneParser,
+}
+
+#: The Markdown parsers used instead when code blocks are highlighted, which
+#: parse fenced code blocks so that their language is known. Mistune always
+#: parses fenced code blocks.
+HIGHLIGHTING_MARKDOWN_PARSERS = {
+    'markdown': FencedMarkdownParser,
+}
+
+#: The Markdown parser used unless a book, or the project, chooses another.
+DEFAULT_MARKDOWN_PARSER = 'markdown'
+
+
+def get_markdown_parser(name=None, highlighting=False):
+    """Return the class of the Markdown parser with the given name, see:
+    ``MARKDOWN_PARSERS``. If code blocks are being ``highlighting``, the
+    parser parses fenced code blocks, see: ``HIGHLIGHTING_MARKDOWN_PARSERS``."""
+    name = name or DEFAULT_MARKDOWN_PARSER
+    if name not in MARKDOWN_PARSERS:
+        raise ValueError('Unknown markdown parser: {}, expected one of: {}'.format(
+            name, ', '.join(sorted(MARKDOWN_PARSERS))))
+    if highlighting and name in HIGHLIGHTING_MARKDOWN_PARSERS:
+        return HIGHLIGHTING_MARKDOWN_PARSERS[name]
+    return MARKDOWN_PARSERS[name]
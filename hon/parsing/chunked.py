@@ -0,0 +1,107 @@
+"""
+    hon.parsing.chunked
+    ~~~~~
+
+    Chunked parsing of very large documents, e.g. a generated appendix.
+    Rather than converting the whole document at once, with the parse tree of
+    all of it in memory, the document is split into chunks at the boundaries
+    of its top-level blocks (see: :func:`~hon.parsing.incremental.split_block_spans`),
+    and each chunk is converted, and its markup written out, before the next
+    one.
+
+    Only the parser's working set, i.e. the lines, element tree, and stashed
+    HTML of the chunk being converted, is bounded by the chunk size. The
+    markup of the whole document is still put together, e.g. by
+    :meth:`ChunkedParser.parse`, and a chapter's markup is then handled like
+    any other's; so the memory used to build the chapter is still proportional
+    to its size, but without the parse tree of all of it.
+"""
+import io
+
+from .incremental import (
+    add_block_outline, add_definitions, rename_anchors, split_block_spans,
+    WHOLE_DOCUMENT_RE
+)
+from .outline import AnchorIds, Outline
+from .parser import Parser
+
+#: The size, in characters, of the chunks that chapters larger than it are
+#: parsed in, unless the project chooses another with
+#: ``build.parse-chunk-size``.
+DEFAULT_PARSE_CHUNK_SIZE = 1024 * 1024
+
+
+class ChunkedParser(Parser):
+    """A parser which converts a document chunk by chunk, with a parser of
+    ``parser_class``; each chunk is a run of the document's top-level blocks
+    of at least ``chunk_size`` characters (unless it's the last one).
+
+    The markup of the chunks is the same as the markup of the whole document:
+    the link reference definitions of the document are given to every chunk
+    that might use them, and anchor ids are made unique across the document.
+    The outline of the document is collected as it's parsed, but its parse
+    tree is never put together, so :attr:`parse_tree` is always ``None``.
+
+    Documents with footnotes are parsed whole, see:
+    :data:`~hon.parsing.incremental.WHOLE_DOCUMENT_RE`.
+    """
+
+    def __init__(self, parser_class, chunk_size=DEFAULT_PARSE_CHUNK_SIZE):
+        super(ChunkedParser, self).__init__()
+        self.parser_class = parser_class
+        self.chunk_size = max(1, chunk_size)
+
+        #: The number of chunks the last document was converted in.
+        self.chunk_count = 0
+
+    def iter_chunks(self, text):
+        """Yield the source of each chunk of the text."""
+        spans, definitions, unclosed = split_block_spans(text)
+        last = len(spans) - 1
+        start = None
+        for index, (block_start, block_end) in enumerate(spans):
+            if start is None:
+                start = block_start
+            if block_end - start < self.chunk_size and index < last:
+                continue
+
+            source = text[start:block_end]
+            if not (unclosed and index == last):
+                source = add_definitions(source, definitions)
+            yield source
+            start = None
+
+    def parse(self, text):
+        output = io.StringIO()
+        self.parse_to(text, output)
+        return output.getvalue()
+
+    def parse_to(self, text, stream):
+        """Parse the text, writing its markup to a stream (i.e. any object with
+        a ``write`` method) chunk by chunk."""
+        self._parse_tree = None
+        self.chunk_count = 0
+        if WHOLE_DOCUMENT_RE.search(text):
+            parser = self.parser_class()
+            stream.write(parser.parse(text))
+            self._outline = parser.outline or Outline()
+            self.chunk_count = 1
+            return
+
+        anchors = AnchorIds()
+        outline = Outline()
+        separator = ''
+        for source in self.iter_chunks(text):
+            #: Only the parser of the chunk being converted is kept, and with
+            #: it the chunk's parse tree.
+            parser = self.parser_class()
+            markup = parser.parse(source)
+            renamed = add_block_outline(outline, anchors, parser.outline or Outline())
+            if renamed:
+                markup = rename_anchors(markup, renamed)
+            if markup:
+                stream.write(separator)
+                stream.write(markup)
+                separator = '\n'
+            self.chunk_count += 1
+        self._outline = outline
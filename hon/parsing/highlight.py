@@ -0,0 +1,147 @@
+"""
+    hon.parsing.highlight
+    ~~~~~
+
+    Server-side syntax highlighting of the code blocks in a chapter's markup,
+    with Pygments. Highlighting is done once the chapter has been parsed, so
+    that it works the same with any of the Markdown parsers, and the
+    highlighted HTML of every code block is cached by its language, style, and
+    code; a code block which hasn't changed is never tokenized again.
+
+    Pygments is optional, without it code blocks are left as they are.
+"""
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+
+from hon.cache import make_key
+
+try:
+    import pygments
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    from pygments.styles import get_style_by_name
+    from pygments.util import ClassNotFound
+except ImportError:
+    pygments = None
+
+#: The style used to highlight code, unless the project chooses another with
+#: ``build.highlight-style``; any of the Pygments styles can be used.
+DEFAULT_HIGHLIGHT_STYLE = 'default'
+
+#: The CSS class of a highlighted code block.
+HIGHLIGHT_CSS_CLASS = 'highlight'
+
+#: The name of the stylesheet for highlighted code, which every renderer
+#: writes to its output once.
+HIGHLIGHT_CSS_FILENAME = 'highlight.css'
+
+#: Matches a code block with a language, e.g. a fenced code block, as it's
+#: written by the Python-Markdown (``language-``) and Mistune (``lang-``)
+#: parsers. Code blocks without a language aren't highlighted.
+CODE_BLOCK_RE = re.compile(
+    r'<pre><code class="(?:lang|language)-([^"\s]+)">(.*?)</code></pre>', re.DOTALL)
+
+
+def is_highlighting_available():
+    """Whether code can be highlighted, i.e. Pygments is installed."""
+    return pygments is not None
+
+
+class CodeHighlighter(object):
+    """Highlights the code blocks of markup, see: :data:`CODE_BLOCK_RE`.
+
+    The highlighted HTML of each code block is kept in memory, for as long as
+    the highlighter, and in the build cache's ``highlight`` namespace; either
+    is keyed by the code block's language, the style, and a hash of its code.
+    Highlighted code blocks only use CSS classes, the stylesheet for the style
+    is given by :meth:`get_css`.
+
+    :type style: str
+    """
+
+    #: The number of highlighted code blocks kept in memory.
+    max_memory_entries = 8192
+
+    def __init__(self, style=None):
+        if not is_highlighting_available():
+            raise RuntimeError('Highlighting code requires Pygments, which '
+                'isn\'t installed.')
+
+        style = style or DEFAULT_HIGHLIGHT_STYLE
+        try:
+            get_style_by_name(style)
+        except ClassNotFound:
+            raise ValueError('Unknown highlight style: {}'.format(style))
+
+        self.style = style
+        self.version = pygments.__version__
+        self.formatter = HtmlFormatter(cssclass=HIGHLIGHT_CSS_CLASS, wrapcode=True)
+        self._lexers = {}
+        self._highlighted = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_css(self):
+        """Return the stylesheet of the highlighter's style."""
+        formatter = HtmlFormatter(style=self.style, cssclass=HIGHLIGHT_CSS_CLASS)
+        return formatter.get_style_defs('.{}'.format(HIGHLIGHT_CSS_CLASS))
+
+    def get_lexer(self, language):
+        """Return the lexer for a language, or ``None`` if Pygments doesn't
+        know of the language."""
+        if language not in self._lexers:
+            try:
+                self._lexers[language] = get_lexer_by_name(language)
+            except ClassNotFound:
+                self._lexers[language] = None
+        return self._lexers[language]
+
+    def get_cache_key(self, language, code):
+        code_hash = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        return make_key(self.version, language, self.style, code_hash)
+
+    def highlight(self, markup, cache=None):
+        """Return the markup, with each of its code blocks highlighted.
+
+        :param cache: The build cache, see: :class:`~hon.cache.BuildCache`.
+        """
+        if '<pre><code class="' not in markup:
+            return markup
+
+        def _highlight(match):
+            language = match.group(1).lower()
+            highlighted = self.highlight_code(language, html.unescape(match.group(2)), cache=cache)
+            return highlighted if highlighted is not None else match.group(0)
+        return CODE_BLOCK_RE.sub(_highlight, markup)
+
+    def highlight_code(self, language, code, cache=None):
+        """Return the highlighted HTML of code in a language, or ``None`` if
+        the language isn't known."""
+        lexer = self.get_lexer(language)
+        if lexer is None:
+            return None
+
+        key = self.get_cache_key(language, code)
+        with self._lock:
+            highlighted = self._highlighted.get(key)
+            if highlighted is not None:
+                self._highlighted.move_to_end(key)
+        if highlighted is not None:
+            #: The build cache's entry is used too, see: ``BuildCache.prune``.
+            if cache is not None:
+                cache.touch('highlight', key)
+            return highlighted
+
+        highlighted = cache.get('highlight', key) if cache is not None else None
+        if highlighted is None:
+            highlighted = pygments.highlight(code, lexer, self.formatter).strip()
+            if cache is not None:
+                cache.set('highlight', key, highlighted)
+
+        with self._lock:
+            self._highlighted[key] = highlighted
+            while len(self._highlighted) > self.max_memory_entries:
+                self._highlighted.popitem(last=False)
+        return highlighted
@@ -0,0 +1,377 @@
+"""
+    hon.parsing.incremental
+    ~~~~~
+
+    Incremental parsing of large documents, e.g. a chapter being edited while
+    the book is served. The document is split into its top-level blocks, and
+    the parse result of each block is kept; when the document is parsed again
+    only the blocks which have changed are converted, and the document's
+    markup is spliced back together from its blocks.
+"""
+import copy
+import re
+from xml.etree.ElementTree import Element
+
+from .outline import AnchorIds, HEADING_LEVELS, Outline
+from .parser import Parser
+from hon.utils.xmlutils import VOID_ELEMENTS
+
+#: Chapters of at least this many characters are parsed incrementally, when
+#: incremental parsing is enabled; smaller chapters are cheap to parse whole.
+INCREMENTAL_PARSE_MIN_SIZE = 256 * 1024
+
+#: Matches the blank lines between chunks of a document.
+BLANK_LINES_RE = re.compile(r'\n(?:[ \t]*\n)+')
+
+#: Matches the opening line of a fenced code block.
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})', re.MULTILINE)
+
+#: Matches a list item, bulleted or numbered.
+LIST_ITEM_RE = re.compile(r'^ {0,3}(?:[*+-]|\d+[.)])(?:[ \t]|$)', re.MULTILINE)
+
+#: Matches a line of a blockquote.
+QUOTE_RE = re.compile(r'^ {0,3}>', re.MULTILINE)
+
+#: Matches the start of a block of raw HTML, and the tag which opens it.
+HTML_BLOCK_RE = re.compile(r'<(!--|[a-zA-Z][a-zA-Z0-9-]*)(?=[\s/>]|$)')
+
+#: Matches the definition of a link reference.
+REFERENCE_RE = re.compile(r'^ {0,3}\[[^\]^\n][^\]\n]*\]:.*$', re.MULTILINE)
+
+#: Matches the features of a document which span its blocks, so that the
+#: document is always parsed whole: footnotes, which are collected at the end
+#: of the document, and link references with their title on the next line,
+#: which the parsers don't agree on.
+WHOLE_DOCUMENT_RE = re.compile(r'^ {0,3}\[\^[^\]]+\]:|^ {0,3}\[[^\]]+\]:[^\n]*\n[ \t]+["\'(]', re.MULTILINE)
+
+#: Matches the id of a heading in markup.
+HEADING_ID_RE = re.compile(r'(<h[1-6]\b[^>]*?\bid=")([^"]*)(")')
+
+
+def _scan_chunk(text, start, end, fence, definitions):
+    """Scan the chunk ``[start, end)`` of the text for the definitions of link
+    references, which are added to ``definitions``; ``fence`` is the marker
+    of the fenced code block open at the start of the chunk, if any. Returns
+    the marker of the fenced code block still open at its end, if any."""
+    chunk = text[start:end]
+    if fence is None and '```' not in chunk and '~~~' not in chunk:
+        definitions.extend(REFERENCE_RE.findall(chunk))
+        return None
+
+    for line in chunk.split('\n'):
+        if fence is not None:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+            continue
+        match = FENCE_RE.match(line)
+        if match:
+            fence = match.group(1)
+        elif REFERENCE_RE.match(line):
+            definitions.append(line)
+    return fence
+
+
+def _skip_definitions(text, start, end):
+    """Return the position of the first line of the chunk ``[start, end)`` of
+    the text which isn't the definition of a link reference, or ``end`` if
+    every line of the chunk is one."""
+    while start < end:
+        match = REFERENCE_RE.match(text, start, end)
+        if match is None:
+            return start
+        start = match.end() + 1
+    return end
+
+
+class _Group(object):
+    """A span of the document which is parsed as one block, see:
+    :func:`split_blocks`."""
+    __slots__ = ('start', 'end', 'has_list', 'has_quote', 'html_tag', 'html_depth')
+
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.has_list = False
+        self.has_quote = False
+        self.html_tag = None
+        self.html_depth = 0
+
+    @property
+    def is_open(self):
+        """Whether the group ends inside a block of raw HTML."""
+        return self.html_depth > 0
+
+    def add(self, text, start, end):
+        """Add the chunk ``[start, end)`` of the text to the group.
+
+        The chunk's leading link reference definitions are skipped, see:
+        :func:`split_block_spans`.
+        """
+        self.end = end
+        start = _skip_definitions(text, start, end)
+        if start == end:
+            return
+        self.has_list = self.has_list or LIST_ITEM_RE.search(text, start, end) is not None
+        self.has_quote = self.has_quote or QUOTE_RE.search(text, start, end) is not None
+
+        if not self.is_open:
+            match = HTML_BLOCK_RE.match(text, start, end)
+            self.html_tag = match.group(1).lower() if match else None
+            if self.html_tag in VOID_ELEMENTS:
+                self.html_tag = ''
+
+        if self.html_tag == '!--':
+            self.html_depth = 0 if '-->' in text[start:end] else 1
+        elif self.html_tag:
+            chunk = text[start:end].lower()
+            self.html_depth += len(re.findall(r'<{}[\s/>]'.format(self.html_tag), chunk))
+            self.html_depth -= chunk.count('</{}>'.format(self.html_tag))
+
+    def continues_with(self, text, start, end):
+        """Whether the chunk ``[start, end)`` of the text, after a blank line,
+        could still be part of this group's block. A chunk of only link
+        reference definitions always is.
+
+        The chunk after a block of raw HTML is always kept with it, since the
+        parsers differ in how they separate raw HTML from the markup after it.
+        """
+        start = _skip_definitions(text, start, end)
+        if start == end or self.is_open or self.html_tag is not None or text[start] in ' \t':
+            return True
+        if self.has_list and LIST_ITEM_RE.match(text, start):
+            return True
+        return self.has_quote and QUOTE_RE.match(text, start) is not None
+
+
+def split_blocks(text):
+    """Split a document into its top-level blocks, see:
+    :func:`split_block_spans`.
+
+    Returns a tuple of the blocks' source, the document's link reference
+    definitions, and whether the last block is unclosed.
+    """
+    spans, definitions, unclosed = split_block_spans(text)
+    return [text[start:end] for start, end in spans], definitions, unclosed
+
+
+def split_block_spans(text):
+    """Split a document into its top-level blocks.
+
+    The document is split on its blank lines, except inside fenced code. A
+    chunk that could continue the block before it, e.g. an indented chunk, a
+    list item after a list, or the rest of a block of raw HTML, is kept with
+    that block; whenever there's doubt the blocks are kept together, since
+    that's never wrong, only slower.
+
+    Python-Markdown removes link reference definitions before it parses the
+    document's blocks, so a block continues across the definitions after it
+    as it would across a blank line: the definitions are kept with the block
+    before them, and the block is held open for the chunk after them.
+
+    A fence which runs to the end of the document isn't a fence to the
+    parsers, so the document is then a single block.
+
+    Returns a tuple of the ``(start, end)`` span of each block in the text,
+    the document's link reference definitions (which any block may use), and
+    whether the last block is unclosed, e.g. it's a fence that runs to the
+    end of the document.
+    """
+    groups = []
+    definitions = []
+    fence = None
+
+    chunk_start = 0
+    spans = []
+    for match in BLANK_LINES_RE.finditer(text):
+        spans.append((chunk_start, match.start()))
+        chunk_start = match.end()
+    spans.append((chunk_start, len(text)))
+
+    for start, end in spans:
+        if not text[start:end].strip():
+            continue
+        if fence is None and not (groups and groups[-1].continues_with(text, start, end)):
+            groups.append(_Group(start))
+        if fence is None:
+            groups[-1].add(text, start, end)
+        else:
+            groups[-1].end = end
+        fence = _scan_chunk(text, start, end, fence, definitions)
+
+    if fence is not None:
+        return [(groups[0].start, len(text))], '', True
+
+    spans = [(group.start, group.end) for group in groups]
+    unclosed = bool(groups and groups[-1].is_open)
+    return spans, '\n'.join(definitions), unclosed
+
+
+def add_definitions(source, definitions):
+    """Return the source of a block, followed by the document's link reference
+    definitions if the block might use them."""
+    if definitions and '[' in source:
+        return '{}\n\n{}'.format(source, definitions)
+    return source
+
+
+def _is_made_from(heading):
+    """Whether the heading's anchor id was made from its text, rather than
+    being given in the document."""
+    base = AnchorIds.get_base(heading.text)
+    if heading.id == base:
+        return True
+    prefix = base + '-'
+    return heading.id.startswith(prefix) and heading.id[len(prefix):].isdigit()
+
+
+def add_block_outline(outline, anchors, block_outline):
+    """Add the outline of a block to the outline of its document.
+
+    Anchor ids made for the block's headings which are already used in the
+    document, by the blocks before it, are made again with the document's
+    ``anchors``. Returns a list of ``(id, new id)``, of the block's headings
+    whose anchor ids changed, see: :func:`rename_anchors`.
+    """
+    renamed = []
+    for heading in block_outline.headings:
+        if heading.id in anchors and _is_made_from(heading):
+            renamed.append((heading.id, anchors.make(heading.text)))
+            heading = heading._replace(id=renamed[-1][1])
+        else:
+            anchors.add(heading.id)
+        outline.headings.append(heading)
+    outline.links.extend(block_outline.links)
+    outline.images.extend(block_outline.images)
+    return renamed
+
+
+def rename_anchors(markup, renamed):
+    """Rename the anchor ids of the headings in a block's markup, ``renamed``
+    is a list of ``(id, new id)`` in document order."""
+    pending = list(renamed)
+
+    def _rename(match):
+        if pending and match.group(2) == pending[0][0]:
+            return match.group(1) + pending.pop(0)[1] + match.group(3)
+        return match.group(0)
+    return HEADING_ID_RE.sub(_rename, markup)
+
+
+def _rename_tree_anchors(parse_tree, renamed):
+    """Return a copy of a block's parse tree, with the anchor ids of its
+    headings renamed. The tree is copied since it's shared with the block's
+    cached parse result."""
+    parse_tree = copy.deepcopy(parse_tree)
+    pending = list(renamed)
+    for element in parse_tree.iter():
+        if pending and element.tag in HEADING_LEVELS and element.get('id') == pending[0][0]:
+            element.set('id', pending.pop(0)[1])
+    return parse_tree
+
+
+class IncrementalParser(Parser):
+    """A parser which keeps the parse result of each top-level block of the
+    last document it parsed, see: :func:`split_blocks`. Parsing the document
+    again, after an edit, only converts the blocks which have changed.
+
+    Every block is converted on its own by a parser of ``parser_class``, and
+    its markup is joined with the others. The link reference definitions of
+    the document are given to every block that might use them. Anchor ids
+    are made unique across the document, as they would be if the document was
+    parsed whole.
+
+    An incremental parser holds the blocks of a single document, e.g. one for
+    each chapter, and isn't thread safe.
+    """
+
+    @property
+    def parse_tree(self):
+        """The parse tree of the last document, which is only put together
+        from the trees of its blocks when it's needed."""
+        if self._block_trees is not None:
+            root = Element('div')
+            if self._block_trees:
+                root.text = self._block_trees[0][0].text
+                root.tail = self._block_trees[-1][0].tail
+            for parse_tree, renamed in self._block_trees:
+                if renamed:
+                    parse_tree = _rename_tree_anchors(parse_tree, renamed)
+                if len(root) and len(parse_tree) and not root[-1].tail:
+                    #: The blocks' markup is joined by a new line, and so are
+                    #: their elements; the element is copied, since it's
+                    #: shared with the block's cached parse result.
+                    root[-1] = copy.copy(root[-1])
+                    root[-1].tail = '\n'
+                root.extend(parse_tree)
+            self._parse_tree = root if len(root) else None
+            self._block_trees = None
+        return self._parse_tree
+
+    def __init__(self, parser_class):
+        super(IncrementalParser, self).__init__()
+        self.parser_class = parser_class
+
+        #: The parse result of each block of the last document, by the block's
+        #: source: a tuple of its markup, parse tree, and outline.
+        self._blocks = {}
+        self._block_trees = None
+
+        #: The number of blocks in the last document, and how many of them
+        #: were converted.
+        self.block_count = 0
+        self.converted_count = 0
+
+    def convert_block(self, source):
+        parser = self.parser_class()
+        markup = parser.parse(source)
+        return markup, parser.parse_tree, parser.outline or Outline()
+
+    def parse(self, text):
+        if WHOLE_DOCUMENT_RE.search(text):
+            self._blocks = {}
+            self._block_trees = None
+            self.block_count = self.converted_count = 1
+            return self._parse_whole(text)
+
+        sources, definitions, unclosed = split_blocks(text)
+        last = len(sources) - 1
+        blocks = {}
+        self.block_count = len(sources)
+        self.converted_count = 0
+
+        anchors = AnchorIds()
+        outline = Outline()
+        markups = []
+        block_trees = []
+        for index, source in enumerate(sources):
+            if not (unclosed and index == last):
+                source = add_definitions(source, definitions)
+
+            result = blocks.get(source) or self._blocks.get(source)
+            if result is None:
+                result = self.convert_block(source)
+                self.converted_count += 1
+            blocks[source] = result
+
+            markup, parse_tree, block_outline = result
+            renamed = add_block_outline(outline, anchors, block_outline)
+            if renamed:
+                markup = rename_anchors(markup, renamed)
+            if markup:
+                markups.append(markup)
+            if parse_tree is not None:
+                block_trees.append((parse_tree, renamed))
+
+        self._blocks = blocks
+        self._block_trees = block_trees
+        self._parse_tree = None
+        self._outline = outline
+        return '\n'.join(markups)
+
+    def _parse_whole(self, text):
+        parser = self.parser_class()
+        markup = parser.parse(text)
+        self._parse_tree = parser.parse_tree
+        self._outline = parser.outline or Outline()
+        return markup
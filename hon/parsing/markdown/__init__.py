@@ -1,2 +1,2 @@
-from .markdown_python import MarkdownParser
+from .markdown_python import FencedMarkdownParser, MarkdownParser
 from .mistune import MistuneParser
@@ -2,10 +2,13 @@
     hon.parsing.markdown.markdown
     ~~~~~
 """
+from functools import partial
 from markdown import Markdown as MarkdownPython
+from markdown.treeprocessors import Treeprocessor
 from xml.etree.ElementTree import Element, ElementTree
 
-from ..parser import Parser
+from ..outline import extract_outline, Outline
+from ..parser import ConverterPool, Parser
 
 
 def _build_reverse(element, items):
@@ -16,6 +19,15 @@ def _build_reverse(element, items):
     return element
 
 
+class _OutlineTreeprocessor(Treeprocessor):
+    """Collects the outline of the document (see: ``hon.parsing.outline``),
+    giving every heading an anchor id. It runs after every other
+    treeprocessor, so the tree's text is final."""
+
+    def run(self, root):
+        self.md.outline = extract_outline(root)
+
+
 class _Markdown(MarkdownPython):
     @property
     def parse_tree(self):
@@ -32,6 +44,17 @@ class _Markdown(MarkdownPython):
     def __init__(self, **kwargs):
         super(_Markdown, self).__init__(**kwargs)
         self.elements = None
+        self.outline = None
+        self.treeprocessors.register(_OutlineTreeprocessor(self), 'outline', -10)
+
+    def reset(self):
+        """Reset the converter's state, including the parse tree of the last
+        document, so that it can convert another document."""
+        super(_Markdown, self).reset()
+        self.elements = None
+        self.outline = None
+        self.lines = None
+        return self
 
     def convert(self, source):
         """Convert markdown to serialized XHTML or HTML.
@@ -47,8 +70,9 @@ class _Markdown(MarkdownPython):
            pre-processed text into an ElementTree.
         3. A bunch of "treeprocessors" are run against the ElementTree. One
            such treeprocessor runs InlinePatterns against the ElementTree,
-           detecting inline markup. After which the state of the parse tree is
-           saved to the instance's ``parse_tree``.
+           detecting inline markup, and a last one collects the document's
+           outline. After which the state of the parse tree is saved to the
+           instance's ``parse_tree``.
         4. Some post-processors are run against the text after the ElementTree
            has been serialized into text.
         5. The output is written to a string.
@@ -106,16 +130,38 @@ class _Markdown(MarkdownPython):
         return output.strip()
 
 
+#: Converters are created once, and are reused for every document.
+_converter_pool = ConverterPool(_Markdown)
+
+#: Converters which also parse fenced code blocks, see:
+#: :class:`FencedMarkdownParser`.
+_fenced_converter_pool = ConverterPool(partial(_Markdown, extensions=['fenced_code']))
+
+
 class MarkdownParser(Parser):
     """A markdown parser implementing the Markdown-Python library.
+
+    Documents are converted by converters from a shared pool, see:
+    :class:`~hon.parsing.parser.ConverterPool`.
     """
 
+    converter_pool = _converter_pool
+
     def parse_front_matter(self):
         pass
 
     def parse(self, text):
-        md = _Markdown()
-
-        markedup_text = md.convert(text)
-        self._parse_tree = md.parse_tree
+        with self.converter_pool.converter() as md:
+            markedup_text = md.convert(text)
+            self._parse_tree = md.parse_tree
+            self._outline = md.outline or Outline()
         return markedup_text
+
+
+class FencedMarkdownParser(MarkdownParser):
+    """A :class:`MarkdownParser` which also parses fenced code blocks (as
+    Mistune does), so that their language is known when highlighting them.
+    It's used when code blocks are highlighted, see:
+    :func:`hon.parsing.get_markdown_parser`.
+    """
+    converter_pool = _fenced_converter_pool
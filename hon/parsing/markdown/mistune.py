@@ -2,15 +2,74 @@
     hon.parsing.markdown.mistune
     ~~~~~
 """
-from ..parser import Parser
+import mistune
+
+from ..outline import AnchorIds, extract_outline, Outline
+from ..parser import ConverterPool, Parser
+from hon.utils.xmlutils import TAG_RE, build_element_tree
+
+
+class _Renderer(mistune.Renderer):
+
+    def __init__(self, **kwargs):
+        super(_Renderer, self).__init__(**kwargs)
+        self.anchors = AnchorIds()
+
+    def header(self, text, level, raw=None):
+        #: Headings are given anchor ids, as Python-Markdown's are.
+        anchor_id = self.anchors.make(TAG_RE.sub('', text))
+        return '<h%d id="%s">%s</h%d>\n' % (level, anchor_id, text, level)
+
+    def block_quote(self, text):
+        #: Python-Markdown starts the quote's content on a line of its own.
+        return '<blockquote>\n%s</blockquote>\n' % text
+
+
+class _Mistune(mistune.Markdown):
+    """A Mistune converter, configured to match the output of the
+    Python-Markdown converter as closely as it can, i.e. raw HTML is passed
+    through rather than being escaped, and empty elements are closed as in
+    XHTML.
+    """
+
+    def __init__(self, **kwargs):
+        renderer = _Renderer(escape=False, use_xhtml=True)
+        super(_Mistune, self).__init__(renderer=renderer, **kwargs)
+
+    def reset(self):
+        """Reset the converter's state, e.g. the link definitions of the last
+        document, so that it can convert another document."""
+        self.block.def_links = {}
+        self.block.def_footnotes = {}
+        self.renderer.anchors = AnchorIds()
+        return self
+
+
+#: Converters are created once, and are reused for every document.
+_converter_pool = ConverterPool(_Mistune)
 
 
 class MistuneParser(Parser):
     """A markdown parser implementing the Mistune markdown library.
+
+    Mistune converts Markdown straight to HTML, without an element tree, so
+    the parse tree is built from the HTML afterwards. The parse tree matches
+    the Python-Markdown parser's, a ``div`` element which contains the
+    document's elements; see: :func:`~hon.utils.xmlutils.build_element_tree`.
+    The outline is then collected from the parse tree.
     """
 
     def parse_front_matter(self):
         pass
 
     def parse(self, text):
-        pass 
+        if not text.strip():
+            self._parse_tree = None
+            self._outline = Outline()
+            return ''
+
+        with _converter_pool.converter() as md:
+            markedup_text = md.parse(text).strip()
+        self._parse_tree = build_element_tree(markedup_text)
+        self._outline = extract_outline(self._parse_tree)
+        return markedup_text
@@ -0,0 +1,143 @@
+"""
+    hon.parsing.outline
+    ~~~~~
+
+    The outline of a parsed document, i.e. its headings (and their anchors),
+    links, and images. The outline is collected from the document's parse tree
+    while it is being parsed, so that features like a page's table of
+    contents, or a search index, never need to parse the document again.
+"""
+import html
+import re
+from collections import namedtuple
+from functools import lru_cache
+from pydash.strings import slugify
+
+#: The level of each heading tag.
+HEADING_LEVELS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+
+#: Matches the placeholders Python-Markdown leaves in the text of its parse
+#: tree, e.g. for raw HTML, which are removed from the outline's text; except
+#: for the placeholder of an ampersand.
+PLACEHOLDER_RE = re.compile('\x02[^\x03]*\x03')
+AMP_SUBSTITUTE = '\x02amp\x03'
+
+#: A heading in a document, ``id`` is the heading's anchor.
+Heading = namedtuple('Heading', ['level', 'text', 'id'])
+
+#: A link in a document.
+Link = namedtuple('Link', ['href', 'text', 'title'])
+
+#: An image in a document.
+Image = namedtuple('Image', ['src', 'alt', 'title'])
+
+
+def get_text(element):
+    """Return the plain text of an element, and of all of its children."""
+    text = ''.join(element.itertext()).replace(AMP_SUBSTITUTE, '&')
+    return PLACEHOLDER_RE.sub('', text).strip()
+
+
+class AnchorIds(object):
+    """Makes anchor ids for the headings of a document, each of which is
+    unique within the document."""
+
+    def __init__(self):
+        self._used = set()
+
+        #: The next suffix to try for each base id, so that making an id for
+        #: the hundredth heading with the same text doesn't try the other 99.
+        self._counts = {}
+
+    def __contains__(self, anchor_id):
+        return anchor_id in self._used
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_base(text):
+        """Return the anchor id made from the text of a heading, before it's
+        made unique."""
+        return slugify(html.unescape(text)) or 'section'
+
+    def add(self, anchor_id):
+        """Reserve an id which the document already uses."""
+        self._used.add(anchor_id)
+
+    def make(self, text):
+        """Make a unique anchor id from the text of a heading."""
+        base = self.get_base(text)
+        anchor_id = base
+        count = self._counts.get(base, 1)
+        while anchor_id in self._used:
+            anchor_id = '{}-{}'.format(base, count)
+            count += 1
+        self._counts[base] = count
+        self._used.add(anchor_id)
+        return anchor_id
+
+
+class Outline(object):
+    """The headings, links, and images of a document, in document order.
+
+    :type headings: [Heading]
+    :type links: [Link]
+    :type images: [Image]
+    """
+    __slots__ = ('headings', 'links', 'images')
+
+    def __init__(self, headings=None, links=None, images=None):
+        self.headings = list(headings or ())
+        self.links = list(links or ())
+        self.images = list(images or ())
+
+    def __eq__(self, other):
+        return isinstance(other, Outline) and self.to_json() == other.to_json()
+
+    def __repr__(self):
+        return '<Outline(headings={}, links={}, images={})>'.format(
+            len(self.headings), len(self.links), len(self.images))
+
+    def to_json(self):
+        return {
+            'headings': [list(heading) for heading in self.headings],
+            'links': [list(link) for link in self.links],
+            'images': [list(image) for image in self.images],
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            headings=[Heading(*heading) for heading in data.get('headings', ())],
+            links=[Link(*link) for link in data.get('links', ())],
+            images=[Image(*image) for image in data.get('images', ())])
+
+
+def extract_outline(root, anchors=None):
+    """Return the :class:`Outline` of a parse tree.
+
+    Every heading without an ``id`` is given one, i.e. the heading's anchor,
+    which is set on the heading's element; ids already in the tree are kept.
+    """
+    outline = Outline()
+    if root is None:
+        return outline
+
+    anchors = anchors or AnchorIds()
+    for element in root.iter():
+        if element.tag in HEADING_LEVELS and element.get('id'):
+            anchors.add(element.get('id'))
+
+    for element in root.iter():
+        tag = element.tag
+        if tag in HEADING_LEVELS:
+            text = get_text(element)
+            anchor_id = element.get('id')
+            if not anchor_id:
+                anchor_id = anchors.make(text)
+                element.set('id', anchor_id)
+            outline.headings.append(Heading(HEADING_LEVELS[tag], text, anchor_id))
+        elif tag == 'a' and element.get('href') is not None:
+            outline.links.append(Link(element.get('href'), get_text(element), element.get('title')))
+        elif tag == 'img':
+            outline.images.append(Image(element.get('src'), element.get('alt'), element.get('title')))
+    return outline
@@ -5,6 +5,9 @@
     Parsers provide a standard interface for converting a book's source
     to a target output, e.g. HTML, eBooks, and PDFs.
 """
+import os
+import threading
+from contextlib import contextmanager
 
 
 class Parser(object):
@@ -13,14 +16,64 @@ class Parser(object):
     :type parse_tree: []
     """
 
+    @property
+    def outline(self):
+        """The outline of the last document parsed, i.e. its headings, links,
+        and images; see: :class:`~hon.parsing.outline.Outline`."""
+        return self._outline
+
     @property
     def parse_tree(self):
         return self._parse_tree
 
     def __init__(self):
         self._parse_tree = None
+        self._outline = None
 
     def parse(self, text):
         """Parse the given text.
         """
         raise NotImplementedError('Parsers must implement the parse method.')
+
+
+class ConverterPool(object):
+    """A pool of configured converters, e.g. Markdown converters.
+
+    Creating a converter can cost more than converting a typical page, e.g.
+    a Python-Markdown converter registers all of its extensions,
+    preprocessors, treeprocessors, and inline patterns. Instead converters are
+    created once, and are reset and returned to the pool after each document.
+    Each thread (or worker process) that is converting a document holds its
+    own converter, so the pool holds at most one converter for each worker.
+
+    A converter must have a ``reset()`` method, which clears any state left by
+    the document it last converted.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._converters = []
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def __len__(self):
+        return len(self._converters)
+
+    @contextmanager
+    def converter(self):
+        with self._lock:
+            converter = self._converters.pop() if self._converters else None
+        if converter is None:
+            converter = self.factory()
+        try:
+            yield converter
+        finally:
+            converter.reset()
+            with self._lock:
+                self._converters.append(converter)
+
+    def _after_fork(self):
+        #: A forked worker process might have copied the lock while another
+        #: thread held it.
+        self._lock = threading.Lock()
@@ -3,16 +3,25 @@
     ~~~~~
 """
 import errno
+import json
 import os
 import re
 from collections import namedtuple
+import jinja2
+from jinja2 import meta
 from jinja2 import Environment, BaseLoader, ChoiceLoader, DictLoader, select_autoescape, TemplateNotFound
 from six import string_types
 
 from .preprocessor import Preprocessor
+from hon.cache import make_key
+from hon.utils.fileutils import read_text
 from hon.utils.numberutils import to_int_ns
 
 
+#: Matches the Jinja2 tags with which a chapter can depend on other templates.
+TEMPLATE_REFERENCE_RE = re.compile(r'{%-?\s*(include|import|from|extends)\b')
+
+
 def resolve_template_filepath(paths, template_reference):
     """Resolves a template filepath, given a reference and a collection of
     possible paths where it might be found.
@@ -30,6 +39,29 @@ def resolve_template_filepath(paths, template_reference):
     return None
 
 
+def get_template_variables(sources, data):
+    """Return the values in ``data`` of the variables that the templates, with
+    the given sources, read; or ``None`` if any of the templates can't be
+    parsed, or any of the values can't be serialized to JSON.
+    """
+    env = Environment()
+    names = set()
+    try:
+        for source in sources:
+            names.update(meta.find_undeclared_variables(env.parse(source)))
+    except jinja2.TemplateSyntaxError:
+        return None
+
+    variables = {}
+    for name in sorted(names):
+        variables[name] = data.get(name)
+        try:
+            json.dumps(variables[name])
+        except (TypeError, ValueError):
+            return None
+    return variables
+
+
 class ChapterLoader(BaseLoader):
     """Loads templates from the filesystem in relation to the location of a
     chapter. This loader is dynamic and resolves templates as it comes across
@@ -74,6 +106,10 @@ class ChapterLoader(BaseLoader):
         self.encoding = encoding
         self.followlinks = followlinks
 
+        #: The filepath of every template that the loader has resolved, in the
+        #: order that they were first resolved.
+        self.dependencies = []
+
     def get_source(self, environment, template):
         # find the template, relative to the markdown file's path
         # record the last location of the
@@ -91,6 +127,8 @@ class ChapterLoader(BaseLoader):
                 except OSError:
                     return False
 
+        if filename not in self.dependencies:
+            self.dependencies.append(filename)
         self.paths.append(os.path.dirname(filename))
         return contents, filename, uptodate
 
@@ -101,23 +139,73 @@ class ChapterLoader(BaseLoader):
 
 
 class JinjaPreprocessor(Preprocessor):
-    """
+    """Renders each chapter as a Jinja2 template, so chapters can use the
+    book's variables and include or import other templates.
+
+    The preprocessor is pure: a chapter's output only depends on its text,
+    the book's configuration, the templates it includes, and the values of
+    the render context's variables that it (or the templates it includes)
+    reads, see: :meth:`get_cache_key`.
     """
     _name = 'jinja'
 
+    pure = True
 
     def on_run(self, book, renderer, context):
-
-        for item in renderer.items:
-            path = os.path.dirname(item.path)
-
-            env = Environment(
-                loader=ChoiceLoader([
-                    DictLoader({ '__markdown__': item.raw_text }),
-                    ChapterLoader(item.path)
-                ]),
-                autoescape=False
-            )
-            template = env.get_template('__markdown__')
-            content = template.render(context.data)
-            item.raw_text = content
+        for item in book.unparsed_items:
+            self.run_chapter(book, item, context)
+
+    def get_cache_key(self, book, chapter, context):
+        """Return the cache key of a chapter's rendered text.
+
+        The templates a chapter includes are only known once it's rendered,
+        so the key uses those recorded by a previous build (see:
+        ``hon.cache.DependencyGraph``); if they aren't known the chapter can't
+        be cached.
+
+        The key covers the value of every variable of the render context that
+        the chapter and its templates read, e.g. a chapter that reads the
+        ``date`` is rendered again by every build. A chapter which reads a
+        value that can't be serialized to JSON (e.g. the ``summary``) can't be
+        cached.
+        """
+        templates = None
+        sources = [chapter.raw_text]
+        if TEMPLATE_REFERENCE_RE.search(chapter.raw_text):
+            templates = book.dependencies.get_digests(chapter.path)
+            if templates is None:
+                return None
+            try:
+                sources.extend(read_text(filepath)
+                    for filepath in book.dependencies.get_dependencies(chapter.path))
+            except (IOError, OSError, UnicodeDecodeError):
+                return None
+
+        variables = get_template_variables(sources, context.data)
+        if variables is None:
+            return None
+        return make_key(jinja2.__version__, chapter.path, chapter.raw_text,
+            book.config, variables, self.config, templates)
+
+    def on_run_chapter(self, book, chapter, context):
+        chapter_loader = ChapterLoader(chapter.path)
+        env = Environment(
+            loader=ChoiceLoader([
+                DictLoader({ '__markdown__': chapter.raw_text }),
+                chapter_loader
+            ]),
+            autoescape=False,
+            bytecode_cache=book.app.template_bytecode_cache
+        )
+        template = env.get_template('__markdown__')
+        return {
+            'text': template.render(context.data),
+            'dependencies': chapter_loader.dependencies
+        }
+
+    def apply_output(self, book, chapter, output):
+        chapter.raw_text = output['text']
+
+        #: Record the templates the chapter included or imported, so that
+        #: a change to any of them is known to affect the chapter.
+        book.dependencies.set_dependencies(chapter.path, output['dependencies'])
@@ -1,3 +1,7 @@
+import json
+
+from hon.cancellation import raise_if_cancelled
+
 #: TODO: There needs to be a better way of configuring preprocessors.
 #:       right now the preprocessor instance is unaware of configuration loaded
 #:       by the app.
@@ -10,11 +14,27 @@ class Preprocessor(object):
     configuration which applies to all preprocessors and then book specific
     configuration which is read from the book.yaml file.
 
+    Preprocessors are run once per build for each book, before any renderer
+    is run, so the ``renderer`` passed to :meth:`run` is ``None`` and the
+    ``context`` is not associated with a renderer. Preprocessors that change
+    chapters only need to change the book's ``unparsed_items``, the others
+    were restored from the build cache.
+
+    A preprocessor is *pure* if its output for a chapter depends only on the
+    inputs that make up its cache key, e.g. the chapter's text, the book's
+    variables, and the templates the chapter includes; see:
+    :meth:`get_cache_key`. The output of a pure preprocessor is persisted in
+    the build cache, and later builds reuse it rather than running the
+    preprocessor again, see: :meth:`run_chapter`.
+
     :param app: The instance of the hon application.
     :type app: hon.app.Hon
     """
     _name = None
 
+    #: Whether the preprocessor is pure, see: :meth:`get_cache_key`.
+    pure = False
+
     default_config = {
         'enabled': True
     }
@@ -46,3 +66,41 @@ class Preprocessor(object):
 
     def on_run(self, book, renderer, context):
         raise NotImplementedError('A preprocessor must implement this method.')
+
+    def get_cache_key(self, book, chapter, context):
+        """Return the build cache key of the preprocessor's output for a
+        chapter, made from every input that affects the output; or ``None`` if
+        the output can't be cached. Only the output of a pure preprocessor is
+        ever cached."""
+        return None
+
+    def run_chapter(self, book, chapter, context):
+        """Preprocess a chapter, see: :meth:`on_run_chapter`.
+
+        If the preprocessor is pure, and its inputs are unchanged since a
+        previous build, its output is restored from the build cache; otherwise
+        the output is persisted for the builds that follow. If the build was
+        cancelled the chapter isn't preprocessed, see:
+        :attr:`hon.app.Hon.cancel_token`.
+        """
+        raise_if_cancelled(self.app.cancel_token)
+        cache = self.app.cache
+        key = self.get_cache_key(book, chapter, context) if self.pure else None
+        cached = cache.get(self.name, key)
+        if cached is not None:
+            output = json.loads(cached)
+        else:
+            output = self.on_run_chapter(book, chapter, context)
+            cache.set(self.name, key, json.dumps(output))
+        self.apply_output(book, chapter, output)
+
+    def on_run_chapter(self, book, chapter, context):
+        """Preprocess a chapter, returning the output to apply to it with
+        :meth:`apply_output`. The output must be serializable to JSON."""
+        raise NotImplementedError(('The preprocessor: {} must implement this '
+            'method to preprocess chapters.').format(self.name))
+
+    def apply_output(self, book, chapter, output):
+        """Apply the preprocessor's output to a chapter, by default the output
+        is the chapter's new raw text."""
+        chapter.raw_text = output
@@ -9,6 +9,10 @@ class VariablesPreprocessor(Preprocessor):
 
     The variable preprocessor takes the variables defined in the book's
     configuration file, i.e. ``book.yaml``, and adds them to the context.
+
+    Its output is the render context rather than a chapter, so it isn't
+    cached; the variables are part of the cache key of the preprocessors that
+    use them, e.g. the jinja preprocessor.
     """
     _name = 'variables'
 
@@ -9,8 +9,7 @@ from jinja2 import Template
 from tempfile import mkstemp
 from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
-from hon.parsing import MarkdownParser
-from hon.utils.fileutils import copy_from, filename_matches_pattern
+from hon.utils.fileutils import copy_from, filename_matches_pattern, get_package_dir
 from .ebook_renderer import EbookRenderer
 
 IGNORED_FILES = ('**/__pycache__/*', '**/__init__.py', )
@@ -47,6 +46,8 @@ class EpubRenderer(EbookRenderer):
     """
     _name = 'epub'
 
+    supports_streaming = True
+
     default_config = {
         'enabled': True,
         'styles': []
@@ -68,40 +69,39 @@ class EpubRenderer(EbookRenderer):
     def create_ebook_container(self, book, context):
         write_to = os.path.join(context.path, 'book.epub')
 
-        with EpubContainer(write_to, 'w', ZIP_STORED) as container:
-            mimetype_filepath = os.path.join(context.path, 'mimetype')
-            container.write(mimetype_filepath, arcname='mimetype')
-
-            for dirpath, _, filenames in os.walk(context.path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-
-                    ignore = filename_matches_pattern(filepath, ('**/mimetype', '*.epub'))
-                    if os.path.isfile(filepath) and not ignore:
-                        relative_filepath = os.path.relpath(filepath, start=context.path)
-                        container.write(filepath, arcname=relative_filepath)
+        #: The container is written to a temporary file in the output
+        #: directory, so it's never held in memory, and then moved into place
+        #: by the render context's writer so that an unchanged ebook isn't
+        #: written again.
+        handle, temp_filepath = mkstemp(dir=context.path, prefix='.hon-', suffix='.epub')
+        try:
+            with os.fdopen(handle, 'wb') as f, EpubContainer(f, 'w', ZIP_STORED) as container:
+                mimetype_filepath = os.path.join(context.path, 'mimetype')
+                container.write(mimetype_filepath, arcname='mimetype')
+
+                for dirpath, _, filenames in os.walk(context.path):
+                    for filename in filenames:
+                        filepath = os.path.join(dirpath, filename)
+
+                        ignore = filename_matches_pattern(filepath, ('**/mimetype', '*.epub'))
+                        if os.path.isfile(filepath) and not ignore:
+                            relative_filepath = os.path.relpath(filepath, start=context.path)
+                            container.write(filepath, arcname=relative_filepath)
+        except BaseException:
+            os.remove(temp_filepath)
+            raise
+        context.writer.move(temp_filepath, write_to)
 
     def generate_chapters(self, book, context):
         """
         """
-        for item in self.items:
-            filename = '{}.xhtml'.format(item.filename)
-            if item.is_readme:
-                continue
-
-            #: Get the item's path, relative to the book's root. This allows
-            #: us to actually write the transformed items to a structure that
-            #: is similar to the source. [SWQ]
-            relative_item_path = os.path.relpath(item.path, start=book.path)
-            relative_item_dir = os.path.dirname(relative_item_path)
-
-            output_path = os.path.join(context.path, relative_item_dir)
-            if not os.path.exists(output_path):
-                os.makedirs(output_path, exist_ok=True)
+        #: When streaming, each chapter has already been written as soon as it
+        #: was rendered.
+        if self.is_streaming:
+            return
 
-            write_to = os.path.join(output_path, filename)
-            with open(write_to, 'w') as f:
-                f.write(item.text)
+        for item in self.items:
+            self.on_write_page(item, book, context)
 
     def generate_manifest(self, book, context):
         """Creates the ``content.opf`` manifest file for the ebook.
@@ -111,7 +111,7 @@ class EpubRenderer(EbookRenderer):
 
         data = {}
         data.update(context.data)
-        template.stream(data).dump(write_to)
+        context.writer.write(write_to, template.render(data))
 
     def generate_titlepage(self, book, context):
         template = context.environment.get_template('titlepage.xhtml.jinja')
@@ -119,7 +119,7 @@ class EpubRenderer(EbookRenderer):
 
         data = {}
         data.update(context.data)
-        template.stream(data).dump(write_to)
+        context.writer.write(write_to, template.render(data))
 
     def generate_toc(self, book, context):
         """Creates the table of contents (``toc.ncx``) file for the ebook.
@@ -129,25 +129,26 @@ class EpubRenderer(EbookRenderer):
 
         data = {}
         data.update(context.data)
-        template.stream(data).dump(write_to)
+        context.writer.write(write_to, template.render(data))
 
     def on_finish(self, book, context):
         self.create_ebook_container(book, context)
 
     def on_generate_assets(self, book, context):
-        import hon.renderers.ebook.epub_assets
-        assets_path = os.path.dirname(hon.renderers.ebook.epub_assets.__file__)
-        copy_from(assets_path, context.path, exclude=IGNORED_FILES)
+        assets_path = get_package_dir('hon.renderers.ebook.epub_assets')
+        copy_from(assets_path, context.path, exclude=IGNORED_FILES,
+            writer=context.writer)
 
-        import hon.theme.light.epub
-        theme_path = os.path.dirname(hon.theme.light.epub.__file__)
+        theme_path = get_package_dir('hon.theme.light.epub')
         theme_css_path = os.path.join(theme_path, 'css')
-        copy_from(theme_css_path, context.path, include=('*.css', ))
+        copy_from(theme_css_path, context.path, include=('*.css', ),
+            writer=context.writer)
 
         user_styles = self.config.get('styles', [])
         for style in user_styles:
             context.add_style(os.path.basename(style))
-            copy_from(style, context.path, exclude=IGNORED_FILES)
+            copy_from(style, context.path, exclude=IGNORED_FILES,
+                writer=context.writer)
 
     def on_generate_pages(self, book, context):
         """
@@ -187,21 +188,35 @@ class EpubRenderer(EbookRenderer):
         context.data['epub_chapters'] = structure
         return context
 
+    def on_write_page(self, page, book, context):
+        if page.is_readme:
+            return
+        filename = '{}.xhtml'.format(page.filename)
+
+        #: Get the item's path, relative to the book's root. This allows
+        #: us to actually write the transformed items to a structure that
+        #: is similar to the source. [SWQ]
+        relative_item_path = os.path.relpath(page.path, start=book.path)
+        relative_item_dir = os.path.dirname(relative_item_path)
+
+        output_path = os.path.join(context.path, relative_item_dir)
+        if not os.path.exists(output_path):
+            os.makedirs(output_path, exist_ok=True)
+
+        write_to = os.path.join(output_path, filename)
+        context.writer.write(write_to, page.text)
+
     def on_render_page(self, page, book, context):
         """
 
         :type page: hon.structure.chapter.Chapter
         """
-        raw_text = str(page.raw_text)
-        parser = MarkdownParser()
-        markedup_text = parser.parse(raw_text)
-
         page_template = context.environment.get_template('page.xhtml.jinja')
 
-        if markedup_text:
-            intermediate_template = Template(markedup_text)
-            content = intermediate_template.render(book={})
-
+        #: The page's markup was parsed once for the whole build, before any
+        #: renderer was run, see: ``hon.book.Book.parse_chapters``.
+        content = page.markup
+        if content:
             relative_page_path = os.path.relpath(page.path, start=book.path)
             abs_page_path = os.path.join(context.path, relative_page_path)
             page_dir = os.path.dirname(abs_page_path)
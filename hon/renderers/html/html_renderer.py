@@ -7,8 +7,7 @@ from jinja2 import (
     select_autoescape
 )
 
-from hon.parsing import MarkdownParser
-from hon.utils.fileutils import copy_from
+from hon.utils.fileutils import copy_from, get_package_dir
 from ..renderer import Renderer
 
 IGNORED_FILES = ('**/__pycache__/*', '**/__init__.py', )
@@ -19,6 +18,8 @@ class HtmlRenderer(Renderer):
     """
     _name = 'html'
 
+    supports_streaming = True
+
     #: The default configuration state for the HTML renderer, this is loaded
     #: into the application configuration.
     default_config = {
@@ -69,41 +70,31 @@ class HtmlRenderer(Renderer):
         pass
 
     def on_generate_assets(self, book, context):
-        import hon.renderers.html.assets
-        assets_dir = os.path.dirname(hon.renderers.html.assets.__file__)
+        assets_dir = get_package_dir('hon.renderers.html.assets')
         assets_js_dir = os.path.join(assets_dir, 'js')
-        copy_from(assets_js_dir, context.path, exclude=('**/__init__.py',))
+        copy_from(assets_js_dir, context.path, exclude=('**/__init__.py',),
+            writer=context.writer)
 
-        import hon.theme.light.website
-        theme_dir = os.path.dirname(hon.theme.light.website.__file__)
-        copy_from(theme_dir, context.path, include=('*.css', '*.js'))
+        theme_dir = get_package_dir('hon.theme.light.website')
+        copy_from(theme_dir, context.path, include=('*.css', '*.js'),
+            writer=context.writer)
 
         user_styles = self.config.get('styles', [])
         for style in user_styles:
             context.add_style(os.path.basename(style))
-            copy_from(style, context.path, exclude=IGNORED_FILES)
+            copy_from(style, context.path, exclude=IGNORED_FILES,
+                writer=context.writer)
 
     def on_generate_pages(self, book, context):
         """
         """
-        for item in self.items:
-            filename = '{}.html'.format(item.filename)
-            if item.is_readme:
-                filename = 'index.html'
-
-            #: Get the item's path, relative to the book's root. This allows
-            #: us to actually write the transformed items to a structure that
-            #: is similar to the source. [SWQ]
-            relative_item_path = os.path.relpath(item.path, start=book.path)
-            relative_item_dir = os.path.dirname(relative_item_path)
+        #: When streaming, each page has already been written as soon as it
+        #: was rendered.
+        if self.is_streaming:
+            return
 
-            output_path = os.path.join(context.path, relative_item_dir)
-            if not os.path.exists(output_path):
-                os.makedirs(output_path, exist_ok=True)
-
-            write_to = os.path.join(output_path, filename)
-            with open(write_to, 'w') as f:
-                f.write(item.text)
+        for item in self.items:
+            self.on_write_page(item, book, context)
 
     def on_init(self, book, context):
         """
@@ -114,18 +105,32 @@ class HtmlRenderer(Renderer):
         context.configure_environment('theme/light/website/templates')
         return context
 
+    def on_write_page(self, page, book, context):
+        filename = '{}.html'.format(page.filename)
+        if page.is_readme:
+            filename = 'index.html'
+
+        #: Get the item's path, relative to the book's root. This allows
+        #: us to actually write the transformed items to a structure that
+        #: is similar to the source. [SWQ]
+        relative_item_path = os.path.relpath(page.path, start=book.path)
+        relative_item_dir = os.path.dirname(relative_item_path)
+
+        output_path = os.path.join(context.path, relative_item_dir)
+        if not os.path.exists(output_path):
+            os.makedirs(output_path, exist_ok=True)
+
+        write_to = os.path.join(output_path, filename)
+        context.writer.write(write_to, page.text)
+
     def on_render_page(self, page, book, context):
         #: TODO more intelligible error handling, we don't even know for which item that we're rendering that the error occurred!
-        raw_text = str(page.raw_text)
-        parser = MarkdownParser()
-        markedup_text = parser.parse(raw_text)
-
         page_template = context.environment.get_template('page.html.jinja')
 
-        if markedup_text:
-            intermediate_template = Template(markedup_text)
-            content = intermediate_template.render(book={})
-
+        #: The page's markup was parsed once for the whole build, before any
+        #: renderer was run, see: ``hon.book.Book.parse_chapters``.
+        content = page.markup
+        if content:
             relative_page_path = os.path.relpath(page.path, start=book.path)
             abs_page_path = os.path.join(context.path, relative_page_path)
             page_dir = os.path.dirname(abs_page_path)
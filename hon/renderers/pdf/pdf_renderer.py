@@ -4,6 +4,7 @@
 """
 import os
 import shutil
+import tempfile
 from jinja2 import (
     Environment,
     PackageLoader,
@@ -12,8 +13,7 @@ from jinja2 import (
 )
 from weasyprint import HTML
 
-from hon.parsing import MarkdownParser
-from hon.utils.fileutils import copy_from
+from hon.utils.fileutils import copy_from, get_package_dir
 from ..renderer import Renderer
 
 PAGE_BREAK = 'page break'
@@ -50,6 +50,11 @@ class PdfRenderer(Renderer):
     """
     _name = 'pdf'
 
+    #: The PDF is written as a single document, so when streaming, each page
+    #: is spooled to a temporary file as it's rendered, and read back one page
+    #: at a time when the document is written.
+    supports_streaming = True
+
     default_config = {
         'enabled': True,
         'styles': [],
@@ -86,17 +91,20 @@ class PdfRenderer(Renderer):
 
         super(PdfRenderer, self).__init__(app, config=config)
 
+        self._spool = None
+        self._spooled_pages = None
+
     def on_generate_assets(self, book, context):
-        import hon.theme.light.pdf
-        theme_dir = os.path.dirname(hon.theme.light.pdf.__file__)
+        theme_dir = get_package_dir('hon.theme.light.pdf')
 
         theme_css_dir = os.path.join(theme_dir, 'css')
-        copy_from(theme_css_dir, context.path, include=('*.css', ))
+        copy_from(theme_css_dir, context.path, include=('*.css', ),
+            writer=context.writer)
 
         user_styles = self.config.get('styles', [])
         for style in user_styles:
             context.add_style(os.path.basename(style))
-            copy_from(style, context.path)
+            copy_from(style, context.path, writer=context.writer)
 
     def on_generate_pages(self, book, context):
         """
@@ -105,15 +113,47 @@ class PdfRenderer(Renderer):
         write_pdf_to = os.path.join(context.path, 'book.pdf')
         pdf_template = context.environment.get_template('pdf.html.jinja')
 
+        pages = self.items
+        if self.is_streaming:
+            pages = self.read_spooled_pages()
+
         data = {
-            'pages': self.items
+            'pages': pages
         }
         data.update(context.data)
 
-        output = pdf_template.stream(data).dump(write_html_to)
+        try:
+            context.writer.write_chunks(write_html_to, pdf_template.generate(data))
+        finally:
+            self.close_spool()
 
         document = HTML(filename=write_html_to).render()
-        document.write_pdf(write_pdf_to)
+        context.writer.write(write_pdf_to, document.write_pdf())
+
+    def on_write_page(self, page, book, context):
+        if self._spool is None:
+            self._spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+            self._spooled_pages = []
+
+        self._spool.seek(0, os.SEEK_END)
+        position = self._spool.tell()
+        self._spool.write(page.text)
+        self._spooled_pages.append((page, position, len(page.text)))
+
+    def read_spooled_pages(self):
+        """Yield each spooled page, with its text read back from the spool for
+        only as long as the page is being written."""
+        for page, position, length in self._spooled_pages or []:
+            self._spool.seek(position)
+            page.text = self._spool.read(length)
+            yield page
+            page.text = None
+
+    def close_spool(self):
+        if self._spool is not None:
+            self._spool.close()
+        self._spool = None
+        self._spooled_pages = None
 
     def on_init(self, book, context):
         """
@@ -125,16 +165,12 @@ class PdfRenderer(Renderer):
         return context
 
     def on_render_page(self, page, book, context):
-        raw_text = str(page.raw_text)
-        parser = MarkdownParser()
-        markedup_text = parser.parse(raw_text)
-
         page_template = context.environment.get_template('page.html.jinja')
 
-        if markedup_text:
-            intermediate_template = Template(markedup_text)
-            content = intermediate_template.render(book={})
-
+        #: The page's markup was parsed once for the whole build, before any
+        #: renderer was run, see: ``hon.book.Book.parse_chapters``.
+        content = page.markup
+        if content:
             node = self.chapter_graph.get(page)
             data = {
                 'page': {
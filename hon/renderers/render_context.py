@@ -1,5 +1,7 @@
 """
 """
+import copy
+import hashlib
 import os
 from datetime import datetime
 from jinja2 import (
@@ -9,6 +11,8 @@ from jinja2 import (
 )
 from six import string_types
 
+from hon.utils.fileutils import OutputWriter
+
 
 class RenderContext():
     """A render context that is passed to each rendering stage.
@@ -34,6 +38,27 @@ class RenderContext():
     def environment(self):
         return self._environment
 
+    @property
+    def template_digest(self):
+        """A digest of the source of every template available to the render
+        context's environment.
+
+        If the environment hasn't been configured, or its templates can't be
+        listed, this is ``None``.
+        """
+        if self._template_digest is None and self._environment is not None:
+            loader = self._environment.loader
+            try:
+                digest = hashlib.sha256()
+                for name in sorted(loader.list_templates()):
+                    source, _, _ = loader.get_source(self._environment, name)
+                    digest.update(name.encode('utf-8'))
+                    digest.update(source.encode('utf-8'))
+                self._template_digest = digest.hexdigest()
+            except TypeError:
+                self._template_digest = None
+        return self._template_digest
+
     @property
     def is_initialized(self):
         return self._initialized
@@ -51,12 +76,22 @@ class RenderContext():
         #: The environment is instantiated when ``configure_environment`` is
         #: called.`
         self._environment = None
+        self._template_digest = None
+
+        #: The cache of compiled templates that the environment uses, see:
+        #: :class:`~hon.cache.TemplateBytecodeCache`. This is the application's,
+        #: once a book is associated with the render context.
+        self.bytecode_cache = None
 
         #: The path that the rendering context writes to.
         self._path = None
 
-        #: The mutable dictionary of data
-        self.data = self._default_data
+        #: Writes the rendered output, skipping any files that are unchanged.
+        self.writer = OutputWriter()
+
+        #: The mutable dictionary of data, each render context has its own
+        #: copy of the default data.
+        self.data = copy.deepcopy(self._default_data)
 
         self.render_path = render_path
 
@@ -78,11 +113,21 @@ class RenderContext():
     def init_book(self, book):
         app = book.app
 
-        #: Assign the path
-        self._path = os.path.join(app.output_path, self.render_path)
+        #: Assign the path, a render context that isn't associated with any
+        #: renderer (e.g. when preprocessing) writes to the output root. When a
+        #: project contains more than one book (e.g. localizations of the same
+        #: book), each book is written under a directory named for the book's
+        #: source directory so that books never overwrite one another.
+        self._path = app.output_path
+        if len(app.books) > 1:
+            self._path = os.path.join(self._path, os.path.basename(book.path))
+        if self.render_path:
+            self._path = os.path.join(self._path, self.render_path)
         if not os.path.exists(self._path):
             os.makedirs(self._path, exist_ok=True)
 
+        self.bytecode_cache = app.template_bytecode_cache
+
         #: Populate the data for the render context.
         self.data['_hon']['version'] = app.version
         self.data['_book'] = book
@@ -96,19 +141,28 @@ class RenderContext():
         self.data['isbn'] = '000-0000000000'
         self.data['date'] = datetime.now().isoformat()
         self.data['publisher'] = 'Hon'
-        self.data['book'] = {}
         self.data['summary'] = book.summary
+        self.init_book_data(book)
 
         #: Complete initialization and mark context as initialized.
         self._initialized = True
 
+    def init_book_data(self, book):
+        """Give the render context the book's variables, see:
+        :attr:`hon.book.Book.data`. These are only known once the book has been
+        prepared (see: :meth:`hon.app.Hon.prepare_book`).
+        """
+        self.data['book'] = dict(book.data)
+
     def configure_environment(self, template_path, pkg='hon'):
         """
         """
         self._environment = Environment(
             loader=PackageLoader(pkg, template_path),
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            bytecode_cache=self.bytecode_cache
         )
+        self._template_digest = None
         self.load_filters()
 
     def load_filters(self):
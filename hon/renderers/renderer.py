@@ -3,17 +3,45 @@
     ~~~~~
 """
 import click
+import multiprocessing
 import os
 from datetime import datetime
 
 import hon
-from hon.structure import Chapter, ChapterGraph, Part
+from hon.cache import make_key
+from hon.cancellation import raise_if_cancelled
+from hon.parsing.highlight import HIGHLIGHT_CSS_FILENAME
+from hon.structure import ChapterGraph
+from hon.utils.processutils import can_fork
 from .render_context import RenderContext
 
+#: The state shared with page rendering worker processes. Worker processes are
+#: forked from the renderer, and so inherit the renderer, the book, and the
+#: render context (including its Jinja2 environment) without having to pickle
+#: any of them.
+_worker_state = None
+
+
+def _render_page_in_worker(index):
+    """Render the page at the given index in a worker process, returning the
+    page's rendered text to the parent process."""
+    renderer, items, book, context = _worker_state
+    page = items[index]
+    renderer.on_render_page(page, book, context)
+    return page.text
+
 
 class Renderer(object):
     default_config = {}
 
+    #: Whether the renderer supports streaming its pages. When streaming (see
+    #: the ``build.streaming`` configuration), each page is written by
+    #: :meth:`on_write_page` as soon as it has been rendered, and its rendered
+    #: text is then dropped so that only one page's text is held in memory at a
+    #: time. A renderer that doesn't support streaming keeps every page's text
+    #: until :meth:`on_generate_pages`.
+    supports_streaming = False
+
     @property
     def items(self):
         """A tuple containing all of the chapters."""
@@ -32,6 +60,11 @@ class Renderer(object):
     def name(self):
         return self.get_name()
 
+    @property
+    def is_streaming(self):
+        """Whether pages are streamed, see :attr:`supports_streaming`."""
+        return self.supports_streaming and self.app.streaming
+
     def __init__(self, app, config=None):
         self.app = app
         self.config = config or dict(self.default_config)
@@ -88,69 +121,200 @@ class Renderer(object):
         self.app.logger.debug('Generating assets...')
         self.on_generate_assets(book, context)
 
+        #: The stylesheet for highlighted code is written once, for all of
+        #: the pages; see: ``hon.parsing.highlight``.
+        highlighter = self.app.highlighter
+        if highlighter is not None:
+            write_to = os.path.join(context.path, HIGHLIGHT_CSS_FILENAME)
+            context.writer.write(write_to, highlighter.get_css())
+
         #:
         hon.generate_assets.send(self.app, book=book, renderer=self, context=context)
 
-    def generate_pages(self, book, context):
+    def generate_pages(self, book, context, cancel_token=None, keys=None):
+        """Render the book's pages.
+
+        The ``keys`` are the cache keys of the pages, if they have already been
+        made (see: :meth:`get_page_cache_keys`).
+        """
         self.app.logger.debug('Generating pages...')
 
         # TODO: Write the README.md to file
         # TODO: Write the SUMMARY.md to file
         # TODO: Write the GLOSSARY.md to file
 
-        for item in self.items:
-            hon.before_render_page.send(self.app, book=book, renderer=self, page=item)
-            self.on_render_page(item, book, context)
+        #: Pages whose inputs haven't changed since a previous build are
+        #: restored from the build cache, rather than being rendered again.
+        #: Cached pages are only read from the cache as they're needed.
+        cache = self.app.cache
+        items = self.items
+        if keys is None:
+            keys = self.get_page_cache_keys(book, context)
+        stale = [index for index, key in enumerate(keys) if not cache.contains(self.name, key)]
+
+        #: A partial build only renders the pages of the selected chapters, the
+        #: others are restored from the cache as they were last rendered, even
+        #: though their inputs have changed since.
+        cached_keys = list(keys)
+        selected_paths = book.selected_paths if book is not None else None
+        if selected_paths is not None:
+            for index in list(stale):
+                if items[index].path in selected_paths:
+                    continue
+                latest_key = cache.get_latest_key(self.name, items[index].path)
+                if latest_key is not None:
+                    cached_keys[index] = latest_key
+                    stale.remove(index)
+        self.app.logger.debug('Rendering {} of {} pages, the others are unchanged.'.format(
+            len(stale), len(items)))
+        if self.app.resume and book is not None:
+            resumed = [key for key in keys if book.journal.is_complete('page', self.name, key)]
+            self.app.logger.info('Resuming, {} of {} pages were rendered by the previous build.'.format(
+                len(resumed), len(items)))
+
+        streaming = self.is_streaming
+        if streaming:
+            self.app.logger.debug('Streaming pages, each page is written as soon as it is rendered.')
+
+        def finish_page(index, item):
             hon.after_render_page.send(self.app, book=book, renderer=self, page=item)
+            if keys[index] is not None and cached_keys[index] == keys[index]:
+                book.journal.record('page', self.name, keys[index])
+                cache.set_latest_key(self.name, item.path, keys[index])
+            if streaming:
+                self.on_write_page(item, book, context)
+                item.text = None
+
+        workers = self.app.workers
+        if workers > 1 and len(stale) > 1 and can_fork():
+            for item in items:
+                hon.before_render_page.send(self.app, book=book, renderer=self, page=item)
+            rendered = self.render_pages_in_workers(book, context, workers, stale)
+            stale = set(stale)
+            try:
+                for index, item in enumerate(items):
+                    raise_if_cancelled(cancel_token)
+                    if index in stale:
+                        item.text = next(rendered)
+                        cache.set(self.name, keys[index], item.text)
+                    else:
+                        item.text = cache.get(self.name, cached_keys[index])
+                    finish_page(index, item)
+            finally:
+                #: Stops the worker processes, if the build was cancelled.
+                rendered.close()
+        else:
+            stale = set(stale)
+            for index, item in enumerate(items):
+                raise_if_cancelled(cancel_token)
+                hon.before_render_page.send(self.app, book=book, renderer=self, page=item)
+                if index in stale:
+                    self.on_render_page(item, book, context)
+                    cache.set(self.name, keys[index], item.text)
+                else:
+                    item.text = cache.get(self.name, cached_keys[index])
+                finish_page(index, item)
         self.on_generate_pages(book, context)
 
+    def get_page_cache_key(self, page, book, context, summary_digest=None):
+        """Return the build cache key for a rendered page.
+
+        Besides the page's own source (see: ``Chapter.source_key``), a rendered
+        page depends on the renderer and its configuration, the theme templates,
+        the plugins, the book's summary, and the pages that come before and
+        after it. If the page, or the templates, can't be cached ``None`` is
+        returned.
+
+        :param summary_digest: A digest of the book's summary, which is the
+            same for every page, see: :meth:`get_page_cache_keys`.
+        """
+        template_digest = context.template_digest if context else None
+        if page.source_key is None or template_digest is None:
+            return None
+
+        node = self.chapter_graph.get(page)
+        neighbours = []
+        for neighbour in (node.previous, node.next):
+            if neighbour:
+                neighbours.append((neighbour.chapter.name, neighbour.chapter.link))
+            else:
+                neighbours.append(None)
+
+        if summary_digest is None:
+            summary_digest = make_key(book.summary.to_json())
+        plugins = sorted(plugin.name for plugin in self.app.plugins)
+        return make_key(page.source_key, self.name, self.config, template_digest,
+            plugins, summary_digest, neighbours)
+
+    def get_page_cache_keys(self, book, context):
+        """Return the build cache key of every page, in order.
+
+        The keys are only needed by the build cache and the build journal, if
+        neither is kept (i.e. the cache is disabled) every key is ``None``.
+        """
+        items = self.items
+        if book is None or not (self.app.cache.enabled or book.journal.filepath):
+            return [None] * len(items)
+
+        summary_digest = make_key(book.summary.to_json())
+        return [self.get_page_cache_key(item, book, context, summary_digest) for item in items]
+
+    def render_pages_in_workers(self, book, context, workers, indices):
+        """Render pages using a pool of worker processes.
+
+        The pages rendered are those at the given ``indices`` of the renderer's
+        items, and the rendered text of each is yielded in the same order.
+        Only the rendered text of each page is returned from the workers, any
+        other changes made to the page by :meth:`on_render_page` are lost.
+
+        The ``before_render_page`` signal should be sent for every page before
+        the workers are started, so that any changes made by its receivers are
+        seen by the workers.
+        """
+        global _worker_state
+
+        self.app.logger.debug('Rendering {} pages with {} workers...'.format(
+            len(indices), workers))
+
+        _worker_state = (self, self.items, book, context)
+        try:
+            chunksize = max(1, len(indices) // (workers * 4))
+            with multiprocessing.get_context('fork').Pool(processes=workers) as pool:
+                for text in pool.imap(_render_page_in_worker, indices, chunksize):
+                    yield text
+        finally:
+            _worker_state = None
+
     def init(self, book):
         self.app.logger.debug('Initializing renderer...')
         context = RenderContext(book=book, render_path=self.render_path)
+        if self.app.highlighter is not None:
+            context.add_style(HIGHLIGHT_CSS_FILENAME)
 
         self.on_init(book, context)
         return context
 
     def init_chapters(self, book):
-        """Use the book's summary to load the book's pages from disk."""
-        self.app.logger.debug('Loading chapters from disk')
-
-        summary_items = book.summary.all_parts
-        for item in summary_items:
-            if type(item) == Part:
-                chapter = self.load_chapter(book, item)
-                self.add_chapter(chapter)
+        """Use the book's chapters as the renderer's pages.
+
+        Chapters are loaded, preprocessed, and parsed once per build by the
+        application (see :meth:`~hon.app.Hon.prepare_book`). If that hasn't
+        happened yet, e.g. when a renderer is run on its own, the book is
+        prepared now.
+        """
+        if not book.chapters:
+            self.app.prepare_book(book)
+
+        #: Each renderer renders its own copy of the chapters, so that
+        #: renderers may render the same book at the same time.
+        self.chapters = [chapter.copy() for chapter in book.chapters]
         self.build_chapter_graph()
         return self.chapters
-    
+
     def build_chapter_graph(self):
         self.chapter_graph = ChapterGraph()
         self.chapter_graph.extend(self.chapters)
 
-    def load_chapter(self, book, item, parent=None):
-        chapter = None
-        chapter_path = os.path.abspath(os.path.join(book.path, item.source))
-
-        if not os.path.exists(chapter_path):
-            raise FileNotFoundError('File: {} not found.'.format(chapter_path))
-
-        with open(chapter_path) as f:
-            raw = f.read()
-            chapter = Chapter(name=item.name, raw_text=raw, path=chapter_path, link=item.link, parent=parent)
-
-        if not chapter:
-            raise TypeError('Chapter not created')
-
-        sub_chapters = []
-        if item.children:
-            for sub_item in item.children:
-                sub_chapter = self.load_chapter(book, sub_item, parent=item)
-                sub_chapters.append(sub_chapter)
-
-        if sub_chapters:
-            chapter.children = sub_chapters
-        return chapter
-
     def on_before_finish(self, book, context):
         pass
 
@@ -166,19 +330,21 @@ class Renderer(object):
     def on_init(self, book, context):
         pass
 
-    def on_render_page(self, page, book, context):
+    def on_write_page(self, page, book, context):
         pass
 
-    def render(self, book):
-        """
-        """
-        self.app.logger.info('Rendering book: {} with: {} renderer'
-            .format(book.name, self.get_name()))
+    def on_render_page(self, page, book, context):
+        pass
 
-        start_time = datetime.now()
+    def render(self, book, cancel_token=None):
+        """Render a book.
 
-        chapters = self.init_chapters(book)
-        self.app.logger.debug('Successfully loaded {} chapters.'.format(len(chapters)))
+        If a ``cancel_token`` is given, it is checked between each stage of
+        rendering, and before each page is rendered; see:
+        :class:`~hon.cancellation.CancellationToken`.
+        """
+        start_time = self.start_render(book)
+        self.init_pages(book)
 
         context = self.init(book)
         print()
@@ -189,15 +355,14 @@ class Renderer(object):
         print()
         print()
 
-        #: We now preprocess for each renderer, this gives our preprocessors
-        #: access to the not only the book, but also the context. [SWQ]
-        for preprocessor in self.app.preprocessors:
-            if preprocessor.enabled:
-                self.app.logger.debug("Running the {} preprocessor.".format(preprocessor.name))
-                preprocessor.run(book, self, context)
+        #: When resuming a build, a renderer that already finished rendering
+        #: the book (with the same inputs) isn't run again.
+        keys, render_key = self.get_render_keys(book, context)
+        if self.is_complete(book, context, render_key):
+            return
 
-        #: After the context has been established and the preprocessors have
-        #: been run, but before any of the actual rendering has commenced,
+        #: After the context has been established (the book's chapters have
+        #: already been preprocessed and parsed), but before any of the actual rendering has commenced,
         #: trigger the "before_render" signal. This will allow more general
         #: plugins the opportunity to do some pre-render work. They can modify
         #: the context, or even make changes to the render items. [SWQ]
@@ -205,13 +370,136 @@ class Renderer(object):
 
         #: Run the logic for the renderer, this includes generating assets,
         #: pages, and finalizing the book's renderering.
+        raise_if_cancelled(cancel_token)
         self.generate_assets(book, context)
-        self.generate_pages(book, context)
+        raise_if_cancelled(cancel_token)
+        self.generate_pages(book, context, cancel_token=cancel_token, keys=keys)
+        raise_if_cancelled(cancel_token)
+        self.end_render(book, context, render_key, start_time)
+
+    def start_render(self, book):
+        """Log the start of rendering a book, returning the time it started."""
+        self.app.logger.info('Rendering book: {} with: {} renderer'
+            .format(book.name, self.get_name()))
+        return datetime.now()
+
+    def init_pages(self, book):
+        """Initialize the renderer's pages from the book's chapters, see:
+        :meth:`init_chapters`."""
+        chapters = self.init_chapters(book)
+        self.app.logger.debug('Successfully initialized {} chapters.'.format(len(chapters)))
+        return chapters
+
+    def get_render_keys(self, book, context):
+        """Return the cache key of every page (see: :meth:`get_page_cache_keys`)
+        and the renderer's key for the book (see: :meth:`get_render_key`). The
+        page keys are made once, and used for both."""
+        keys = self.get_page_cache_keys(book, context)
+        return keys, self.get_render_key(book, context, keys)
+
+    def end_render(self, book, context, render_key, start_time):
+        """Finish rendering a book, send the ``after_render`` signal, and record
+        in the book's journal that the renderer finished rendering it."""
         self.finish(book, context)
 
         #: After the book has been rendered, do any final clean up.
         hon.after_render.send(self.app, book=book, renderer=self, context=context)
+        book.journal.record('renderer', self.name, render_key)
+        self.log_render(book, context, start_time)
+
+    def get_render_key(self, book, context, keys=None):
+        """Return a key of everything that goes into the renderer's output for
+        a book, i.e. the cache key of every page (see:
+        :meth:`get_page_cache_keys`). If any page can't be cached the key is
+        ``None``, as it is for a partial build, whose output may be partly out
+        of date."""
+        if book.selected_paths is not None:
+            return None
+        if keys is None:
+            keys = self.get_page_cache_keys(book, context)
+        if None in keys:
+            return None
+        return make_key(self.name, context.path, keys)
+
+    def is_complete(self, book, context, render_key):
+        """Return ``True`` if the book's journal records that the renderer
+        finished rendering the book, with the same inputs, and its output is
+        still there."""
+        if not book.journal.is_complete('renderer', self.name, render_key):
+            return False
+        if not os.path.isdir(context.path):
+            return False
+        self.app.logger.info(('The {} renderer already finished rendering book: '
+            '{}, skipping it.').format(self.name, book.name))
+        return True
+
+    def log_render(self, book, context, start_time):
+        writer = context.writer
+        self.app.logger.info(('Wrote {} files ({} bytes), skipped {} unchanged '
+            'files ({} bytes)').format(writer.files_written, writer.bytes_written,
+            writer.files_skipped, writer.bytes_skipped))
 
         elapsed_time = datetime.now() - start_time
         self.app.logger.info('Finished rendering book: {} with: {} successfully in {}s!'.format(
             book.name, self.get_name(), elapsed_time))
+
+    def schedule(self, book, graph, prepared, after=None):
+        """Add the stages of rendering a book to a task graph, returning the
+        final task.
+
+        The stages are scheduled as the following tasks:
+
+        - ``init``, initializes the render context.
+        - ``assets``, generates the assets, once the context is initialized.
+        - ``pages``, renders the pages, once the context is initialized, and
+          the book has been ``prepared`` (the task that prepares the book's
+          chapters). The book's variables are given to the context, which may
+          have been initialized before the book was prepared, and the
+          ``before_render`` signal is sent first.
+        - ``finish``, once the assets and pages have been generated, and then
+          sends the ``after_render`` signal.
+
+        A renderer renders one book's pages at a time; if given, the ``pages``
+        task is run only once the task ``after`` (e.g. the renderer's final
+        task for the previous book) is done.
+
+        :type graph: hon.scheduler.TaskGraph
+        """
+        name = '{}:{}'.format(book.path, self.name)
+        state = {}
+
+        def init():
+            state['start_time'] = self.start_render(book)
+            state['context'] = self.init(book)
+
+        def generate_assets():
+            self.generate_assets(book, state['context'])
+
+        def generate_pages():
+            context = state['context']
+            self.init_pages(book)
+
+            #: The context may have been initialized before the book was
+            #: prepared, and so before the book's variables were known.
+            context.init_book_data(book)
+
+            keys, state['render_key'] = self.get_render_keys(book, context)
+            state['complete'] = self.is_complete(book, context, state['render_key'])
+            if state['complete']:
+                return
+
+            hon.before_render.send(self.app, book=book, renderer=self, context=context)
+            self.generate_pages(book, context, cancel_token=self.app.cancel_token, keys=keys)
+
+        def finish():
+            if state['complete']:
+                return
+            self.end_render(book, state['context'], state['render_key'], state['start_time'])
+
+        initialized = graph.add_task('{}:init'.format(name), init)
+        assets = graph.add_task('{}:assets'.format(name), generate_assets,
+            depends_on=[initialized])
+        pages = graph.add_task('{}:pages'.format(name), generate_pages,
+            depends_on=[initialized, prepared, after])
+        return graph.add_task('{}:finish'.format(name), finish,
+            depends_on=[assets, pages])
@@ -0,0 +1,147 @@
+"""
+    hon.scheduler
+    ~~~~~
+
+    A scheduler which runs a graph of tasks, each task is run as soon as all of
+    the tasks it depends on have finished.
+
+    Tasks are run on a pool of threads, so independent tasks that wait on I/O
+    (e.g. copying a theme's assets, or writing an ebook's container) overlap
+    with one another, and with other work.
+"""
+import logging
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from .cancellation import raise_if_cancelled
+from .exc import BuildError
+
+logger = logging.getLogger(__name__)
+
+
+class Task(object):
+    """A unit of work in a :class:`TaskGraph`.
+
+    :type name: str
+    :type dependencies: tuple
+    """
+
+    #: The states of a task.
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+    def __init__(self, name, func, dependencies=None):
+        #: The name of the task, used when reporting on the task.
+        self.name = name
+
+        #: The function that does the task's work, it takes no arguments.
+        self.func = func
+
+        #: The tasks that must be done before this task can be run.
+        self.dependencies = tuple(dependencies or ())
+
+        self.state = Task.PENDING
+
+        #: The value returned by the task's function, or the formatted
+        #: traceback of the error it raised.
+        self.result = None
+
+    def __repr__(self):
+        return '<Task(name={}, state={})>'.format(repr(self.name), self.state)
+
+    def run(self):
+        start_time = datetime.now()
+        logger.debug('Running task: {}'.format(self.name))
+        self.result = self.func()
+        logger.debug('Finished task: {} in {}s'.format(self.name, datetime.now() - start_time))
+        return self.result
+
+
+class TaskGraph(object):
+    """A directed acyclic graph of tasks.
+
+    A task can only depend on tasks that have already been added to the graph,
+    so the graph can never contain a cycle.
+    """
+
+    @property
+    def tasks(self):
+        return tuple(self._tasks)
+
+    def __init__(self):
+        self._tasks = []
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def add_task(self, name, func, depends_on=None):
+        """Add a task to the graph, returning the :class:`Task`.
+
+        The task is run once all of the tasks in ``depends_on`` are done.
+        """
+        dependencies = tuple(task for task in (depends_on or ()) if task is not None)
+        for dependency in dependencies:
+            if dependency not in self._tasks:
+                raise ValueError(('The task: {} depends on the task: {}, which '
+                    'is not in the graph.').format(name, dependency.name))
+
+        task = Task(name, func, dependencies=dependencies)
+        self._tasks.append(task)
+        return task
+
+    def run(self, max_workers=None, cancel_token=None):
+        """Run every task in the graph, using at most ``max_workers`` threads.
+
+        A task that fails doesn't stop tasks that are independent of it, but
+        every task that depends on it (directly or not) is skipped. Once every
+        task has either been run or skipped, if any failed a
+        :class:`~hon.exc.BuildError` is raised naming them.
+
+        Once the ``cancel_token`` is cancelled, no more tasks are started; when
+        the running tasks have stopped :class:`~hon.exc.BuildCancelled` is
+        raised.
+        """
+        waiting = list(self._tasks)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while waiting or running:
+                if cancel_token is not None and cancel_token.cancelled:
+                    for task in waiting:
+                        task.state = Task.SKIPPED
+                    waiting = []
+
+                for task in list(waiting):
+                    states = set(dependency.state for dependency in task.dependencies)
+                    if states & {Task.FAILED, Task.SKIPPED}:
+                        logger.debug('Skipping task: {}'.format(task.name))
+                        task.state = Task.SKIPPED
+                        waiting.remove(task)
+                    elif states <= {Task.DONE}:
+                        running[executor.submit(task.run)] = task
+                        waiting.remove(task)
+
+                if not running:
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        future.result()
+                        task.state = Task.DONE
+                    except Exception:
+                        task.state = Task.FAILED
+                        task.result = traceback.format_exc()
+
+        raise_if_cancelled(cancel_token)
+
+        failed = [task for task in self._tasks if task.state == Task.FAILED]
+        for task in failed:
+            logger.error('Failed to run task: {}\n{}'.format(task.name, task.result))
+        if failed:
+            raise BuildError('Failed to run {} of {} tasks: {}'.format(
+                len(failed), len(self._tasks), ', '.join(task.name for task in failed)))
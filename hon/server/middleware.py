@@ -2,9 +2,13 @@
     hon.server.middleware
     ~~~~~
 """
+import threading
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from hon.cancellation import CancellationToken
+from hon.exc import BuildCancelled
+
 
 class _FlaskHonStateMixin(object):
     """A mixin for the FlaskHon middleware."""
@@ -51,6 +55,11 @@ class FlaskHon(_FlaskHonStateMixin):
     the event handler will be scheduled with the file system observer and
     the observer will be started.
 
+    Each change to the book starts a new build, in a thread of its own, and
+    cancels the build that is in progress (if any); a build made stale by a
+    newer change stops before rendering its next page, so the latest change
+    is rendered as soon as possible.
+
     .. admonition:: Hon is required!
 
         This integration requires that the ``hon_app`` and ``book_path``
@@ -98,14 +107,42 @@ class FlaskHon(_FlaskHonStateMixin):
         self.observer = Observer()
         self.event_handler = _CustomHandler()
 
+        #: The cancellation token of the latest build. Only one build is run
+        #: at a time, any others wait for it to finish (or be cancelled).
+        self._cancel_token = None
+        self._token_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
         if app is not None:
             self.init_app(app)
 
     def build(self):
+        """Start a build of the book, cancelling the build in progress.
+
+        Returns the thread that the build is run in.
+        """
         self.app.logger.debug('Detected changes in book on path: {}. Rebuilding...'.format(self.book_path))
 
-        self.hon_app.load_books(source_path=self.book_path)
-        self.hon_app.build()
+        with self._token_lock:
+            if self._cancel_token is not None:
+                self._cancel_token.cancel()
+            cancel_token = self._cancel_token = CancellationToken()
+
+        thread = threading.Thread(target=self._build, args=(cancel_token, ), daemon=True)
+        thread.start()
+        return thread
+
+    def _build(self, cancel_token):
+        with self._build_lock:
+            #: A newer change may have made the build stale before it started.
+            if cancel_token.cancelled:
+                return
+
+            try:
+                self.hon_app.load_books(source_path=self.book_path)
+                self.hon_app.build(cancel_token=cancel_token, incremental_parse=True)
+            except BuildCancelled:
+                self.app.logger.debug('Cancelled a stale build of book on path: {}'.format(self.book_path))
 
     def init_app(self, app):
         app.logger.debug('Initializing Hon for Flask application: {}'.format(app))
@@ -2,8 +2,12 @@
     hon.structure.chapter
     ~~~~~
 """
+import copy
 import os
 
+from hon.parsing.outline import Outline
+from hon.utils.fileutils import read_text
+
 
 class Chapter(object):
     """A ``Chapter`` represents an entry in a book.
@@ -11,11 +15,27 @@ class Chapter(object):
     In many cases, a chapter usually maps to a single file on disk. However,
     a chapter may contain one-or-more subchapters as well.
 
+    A chapter's text can be loaded lazily, if it's created with a
+    ``source_filepath`` (rather than its ``raw_text``) its source is read from
+    that file the first time it's accessed. Once a chapter's markup has been
+    parsed its source can be released, see: :meth:`release_source`.
+
+    Chapters are slot based, a book may have a great many of them.
+
     :type name: str
     :type raw_text: str
     :type children: []
     :type path: str
+    :type source_filepath: str
     """
+    __slots__ = ('name', '_path', '_filename', 'is_readme', 'link',
+        'source_filepath', '_raw_text', '_source_text', 'markup', 'outline',
+        'source_key', '_text', 'parent', 'node', 'children')
+
+    @property
+    def anchors(self):
+        """The anchor ids of the chapter's headings."""
+        return [heading.id for heading in self.headings]
 
     @property
     def content(self):
@@ -23,41 +43,85 @@ class Chapter(object):
 
     @property
     def filename(self):
-        filename, _ = os.path.splitext(os.path.basename(self.path))
-        return filename
+        if self._filename is None and self._path is not None:
+            self._filename, _ = os.path.splitext(os.path.basename(self._path))
+        return self._filename
 
     @property
     def has_children(self):
         return len(self.children) >= 1
 
     @property
-    def is_readme(self):
-        filename = os.path.basename(self.path)
-        root, _ = os.path.splitext(filename)
-        if root.lower() == 'readme':
-            return True
-        return False
+    def headings(self):
+        """The headings of the chapter's markup, see: ``outline``."""
+        return self.outline.headings
+
+    @property
+    def images(self):
+        """The images in the chapter's markup, see: ``outline``."""
+        return self.outline.images
 
     @property
     def keywords(self):
         return []
 
+    @property
+    def links(self):
+        """The links in the chapter's markup, see: ``outline``."""
+        return self.outline.links
+
     @property
     def next(self):
         if self.node and self.node.next:
             return self.node.next.chapter
         return None
 
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        self._path = value
+
+        #: The fields derived from the path are read many times while
+        #: rendering, so they're computed once rather than on every access.
+        #: The filename is computed when it's first read.
+        self._filename = None
+        self.is_readme = False
+        if value is not None:
+            root, _ = os.path.splitext(os.path.basename(value))
+            self.is_readme = root.lower() == 'readme'
+
     @property
     def previous(self):
         if self.node and self.node.previous:
             return self.node.previous.chapter
         return None
 
+    @property
+    def raw_text(self):
+        """The entry's raw, unprocessed, text."""
+        if self._raw_text is None:
+            self._raw_text = self.source_text
+        return self._raw_text
+
+    @raw_text.setter
+    def raw_text(self, value):
+        self._raw_text = value
+
     @property
     def search(self):
         return True
 
+    @property
+    def source_text(self):
+        """The entry's text as it was loaded, the raw text may be changed when
+        the chapter is preprocessed but this stays the same."""
+        if self._source_text is None:
+            self._source_text = self.load_source()
+        return self._source_text
+
     @property
     def summary(self):
         return ''
@@ -76,7 +140,8 @@ class Chapter(object):
     def title(self):
         return self.name
 
-    def __init__(self, name=None, raw_text=None, path=None, link=None, parent=None, children=None):
+    def __init__(self, name=None, raw_text=None, path=None, link=None, parent=None,
+            children=None, source_filepath=None):
         #: The name of the entry.
         self.name = name
 
@@ -86,8 +151,30 @@ class Chapter(object):
         #: The link to this chapter.
         self.link = link
 
-        #: The entry's raw, unprocessed, text.
-        self.raw_text = raw_text or ''
+        #: The file that the entry's text is lazily loaded from, if the entry
+        #: wasn't given its text.
+        self.source_filepath = source_filepath
+
+        #: The entry's raw and source text, see: ``raw_text`` and
+        #: ``source_text``. If ``None`` the text hasn't been loaded yet.
+        self._raw_text = None
+        self._source_text = None
+        if raw_text is not None or source_filepath is None:
+            self._raw_text = self._source_text = raw_text or ''
+
+        #: The parsed markup, produced from the preprocessed raw text. This is
+        #: independent of any renderer, and is shared by all of them.
+        self.markup = None
+
+        #: The outline of the parsed markup, i.e. its headings (and their
+        #: anchors), links, and images; collected while the chapter is
+        #: parsed, see: ``hon.parsing.outline``.
+        self.outline = Outline()
+
+        #: The build cache key for the chapter's markup, see:
+        #: ``hon.app.Hon.get_chapter_cache_key``. If ``None`` the chapter can't
+        #: be cached.
+        self.source_key = None
 
         #: The processed text.
         self._text = ''
@@ -99,10 +186,39 @@ class Chapter(object):
         #: The children of this page.
         self.children = children or []
 
+    def copy(self):
+        """Return a copy of the chapter, and of its children.
+
+        The copy shares the chapter's text and parsed markup, but has its own
+        rendered text and its own place in a chapter graph; so that a copy can
+        be rendered without affecting the original.
+        """
+        chapter = copy.copy(self)
+        chapter.node = None
+        chapter._text = ''
+        chapter.children = [child.copy() for child in self.children]
+        return chapter
+
+    def load_source(self):
+        """Read the entry's source text from its ``source_filepath``."""
+        if self.source_filepath is None:
+            return ''
+        return read_text(self.source_filepath)
+
+    def release_source(self):
+        """Release the entry's raw and source text.
+
+        This is only done for chapters that are loaded lazily, so their text
+        can be loaded again if it's needed later.
+        """
+        if self.source_filepath is not None:
+            self._raw_text = self._source_text = None
+
     def __repr__(self):
+        #: Avoid loading the text of a lazily loaded entry.
         truncated_text = ''
-        if self.raw_text:
-            truncated_text = '{}...'.format(self.raw_text[:10])
+        if self._raw_text:
+            truncated_text = '{}...'.format(self._raw_text[:10])
         return ('<Chapter(name={name}, raw_text={raw_text}, path={path}, '
             'parent={parent}, children={children})>').format(
             name=self.name, raw_text=repr(truncated_text), path=self.path,
@@ -130,6 +246,7 @@ class ChapterNode(object):
     :type previous_chapter: Chapter
     :type next_chapter: Chapter
     """
+    __slots__ = ('chapter', 'previous', 'next')
 
     def __init__(self, chapter, next_node=None, previous_node=None):
         #: The chapter represented by this node in the graph.
@@ -148,49 +265,51 @@ class ChapterNode(object):
 
 class ChapterGraph(object):
     """A graph of all chapters in a book.
+
+    The graph's nodes are kept in an array, in reading order, along with a map
+    of each chapter (and of each chapter's path) to its node; looking up the
+    node for a chapter is a constant time operation. Iterating over the graph
+    returns an independent iterator, so the graph can be walked by more than
+    one iterator (or thread) at a time.
     """
 
     @property
     def first(self):
-        return self._head
+        return self._nodes[0] if self._nodes else None
 
     @property
     def last(self):
-        return self._tail
+        return self._nodes[-1] if self._nodes else None
 
     def __init__(self, chapters=None):
-        #: Used for tracking iteration state. This is reset to the head
-        self._current = None
-        self._head = None
-        self._tail = None
+        #: The graph's nodes, in reading order.
+        self._nodes = []
+
+        #: Map each chapter, and each chapter's path, to its node.
+        self._nodes_by_chapter = {}
+        self._nodes_by_path = {}
 
         if chapters:
             self.extend(chapters)
 
     def __iter__(self):
         """Return an iterator starting at the head of the graph."""
-        self._current = None
-        return self
+        return iter(self._nodes)
 
-    def __next__(self):
-        node = self._current.next if self._current else self._head
-        if node is None:
-            raise StopIteration
-        self._current = node
-        return self._current
+    def __len__(self):
+        return len(self._nodes)
 
     def append(self, chapter, include_children=True):
         """
         """
-        node = ChapterNode(chapter)
-        if self._head is None:
-            self._head = self._tail = node
-        else:
-            node.previous = self._tail
-            node.next = None
+        node = ChapterNode(chapter, previous_node=self.last)
+        if node.previous is not None:
+            node.previous.next = node
 
-            self._tail.next = node
-            self._tail = node
+        self._nodes.append(node)
+        self._nodes_by_chapter[chapter] = node
+        if chapter.path is not None:
+            self._nodes_by_path.setdefault(chapter.path, node)
 
         if chapter.has_children:
             for child in chapter.children:
@@ -201,9 +320,11 @@ class ChapterGraph(object):
             self.append(chapter, include_children=include_children)
 
     def get(self, chapter):
-        node = self._head
-        while node is not None:
-            if node.chapter == chapter:
-                return node
-            node = node.next
-        return None
+        """Return the node for a chapter, or ``None`` if the chapter isn't in
+        the graph."""
+        return self._nodes_by_chapter.get(chapter)
+
+    def get_by_path(self, path):
+        """Return the node for the (first) chapter with the given path, or
+        ``None`` if there isn't one."""
+        return self._nodes_by_path.get(path)
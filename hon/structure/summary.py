@@ -84,29 +84,46 @@ class Section():
 
 
 class Part():
+    """A part of the summary, i.e. an entry in the table of contents.
+
+    A book's summary can have a great many parts, and their derived fields are
+    read many times while rendering each page. So parts are slot based, and
+    the fields derived from the part's ``source`` by splitting its extension
+    (``link_name`` and ``is_readme``) are computed once, whenever the source
+    is assigned. The ``id`` is seldom needed, and slugifying is slow, so it is
+    computed the first time it's read.
+    """
+    __slots__ = ('name', '_source', 'level', 'children', '_id', 'link_name',
+        'is_readme')
 
     @property
     def id(self):
-        root, _ = os.path.splitext(self.source)
-        return slugify(root)
+        if self._id is None:
+            self._id = slugify(self.link_name)
+        return self._id
 
     @property
     def link(self):
         if self.is_readme:
             return 'index.html'
-        root, _ = os.path.splitext(self.source)
-        return '{}.html'.format(root)
-
-    @property
-    def link_name(self):
-        root, _ = os.path.splitext(self.source)
-        return root
+        if self.link_name is None:
+            return None
+        return '{}.html'.format(self.link_name)
 
     @property
-    def is_readme(self):
-        if 'readme' == str(self.link_name).lower():
-            return True
-        return False
+    def source(self):
+        return self._source
+
+    @source.setter
+    def source(self, value):
+        self._source = value
+
+        root = None
+        if value is not None:
+            root, _ = os.path.splitext(value)
+        self.link_name = root
+        self._id = None
+        self.is_readme = 'readme' == str(root).lower()
 
     def __init__(self, name, source=None, level=None, children=None):
         #: The name of the part.
@@ -0,0 +1,71 @@
+"""
+    hon.utils.changeutils
+    ~~~~~
+
+    Utilities for finding the files that have changed since a point in time,
+    or since a git revision.
+"""
+import os
+import subprocess
+from datetime import datetime
+
+
+def parse_timestamp(value):
+    """Parse a timestamp, either seconds since the epoch or an ISO 8601 date
+    (and time), returning seconds since the epoch; or ``None`` if the value
+    isn't a timestamp."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _git(root, *args):
+    try:
+        output = subprocess.check_output(('git', '-C', root) + args,
+            stderr=subprocess.PIPE)
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, 'stderr', None) or b''
+        raise ValueError('Unable to run git {} in: {} ({})'.format(
+            ' '.join(args), root, stderr.decode('utf-8', 'replace').strip() or e))
+    return output.decode('utf-8')
+
+
+def get_git_changed_files(root, revision):
+    """Return the absolute paths of the files under ``root`` that have changed
+    since a git ``revision``, including changes that aren't committed and
+    files that aren't tracked yet.
+
+    A ``ValueError`` is raised if ``root`` isn't in a git repository, or the
+    revision doesn't exist.
+    """
+    toplevel = _git(root, 'rev-parse', '--show-toplevel').strip()
+    changed = _git(root, 'diff', '--name-only', revision, '--', '.').splitlines()
+    untracked = _git(root, 'ls-files', '--others', '--exclude-standard', '--full-name', '.').splitlines()
+    return set(os.path.realpath(os.path.join(toplevel, path)) for path in changed + untracked if path)
+
+
+def get_changed_files(root, since, paths):
+    """Return which of the (absolute) ``paths`` have changed since ``since``.
+
+    If ``since`` is a timestamp (see :func:`parse_timestamp`) the files that
+    were modified after it have changed, otherwise it's a git revision, see
+    :func:`get_git_changed_files`.
+    """
+    timestamp = parse_timestamp(since)
+    if timestamp is None:
+        changed = get_git_changed_files(root, since)
+        return set(path for path in paths if os.path.realpath(path) in changed)
+
+    changed = set()
+    for path in paths:
+        try:
+            if os.path.getmtime(path) > timestamp:
+                changed.add(path)
+        except (IOError, OSError):
+            changed.add(path)
+    return changed
@@ -1,12 +1,220 @@
 """
 """
+import hashlib
+import importlib
 import os
-import shutil
+import tempfile
+import threading
 from fnmatch import fnmatch
 from six import string_types
 
 CURRENT_DIRECTORY = '.'
 
+#: The permissions of files created by the output writer. Temporary files are
+#: created readable only by their owner, so once written they are given the
+#: permissions of a file created normally, i.e. ``0o666`` less the umask.
+_umask = os.umask(0)
+os.umask(_umask)
+FILE_MODE = 0o666 & ~_umask
+
+
+class OutputWriter(object):
+    """Writes build output to disk.
+
+    Files are written atomically, a temporary file is written next to the
+    output file and then renamed over it, so a file is never seen partially
+    written. A file whose content is identical to what is already on disk,
+    e.g. from the previous build, is not written at all; its modification
+    time is left alone, so tools that sync the output (e.g. rsync) don't see
+    it as changed.
+
+    The writer keeps a count of the files and bytes that were written, and of
+    those that were skipped. A writer can be shared by threads.
+    """
+
+    def __init__(self):
+        self.files_written = 0
+        self.bytes_written = 0
+        self.files_skipped = 0
+        self.bytes_skipped = 0
+        self._lock = threading.Lock()
+
+    def _count(self, written, size):
+        with self._lock:
+            if written:
+                self.files_written += 1
+                self.bytes_written += size
+            else:
+                self.files_skipped += 1
+                self.bytes_skipped += size
+
+    def __repr__(self):
+        return ('<OutputWriter(written={} files ({} bytes), skipped={} '
+            'files ({} bytes))>').format(self.files_written, self.bytes_written,
+            self.files_skipped, self.bytes_skipped)
+
+    def copy(self, source, destination):
+        """Copy the file at ``source`` to the ``destination`` filepath."""
+        with open(source, 'rb') as f:
+            content = f.read()
+        return self.write(destination, content)
+
+    def write(self, filepath, content, encoding='utf-8'):
+        """Write ``content`` (either text or bytes) to a file.
+
+        Returns ``True`` if the file was written, or ``False`` if the file
+        already had the same content and was skipped.
+        """
+        if not isinstance(content, bytes):
+            content = content.encode(encoding)
+
+        if self.is_unchanged(filepath, content):
+            self._count(False, len(content))
+            return False
+
+        dirname = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(dirname, exist_ok=True)
+
+        handle, temp_filepath = tempfile.mkstemp(dir=dirname, prefix='.hon-')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                f.write(content)
+            os.chmod(temp_filepath, FILE_MODE)
+            os.replace(temp_filepath, filepath)
+        except BaseException:
+            os.remove(temp_filepath)
+            raise
+
+        self._count(True, len(content))
+        return True
+
+    def write_chunks(self, filepath, chunks, encoding='utf-8'):
+        """Write an iterable of chunks (either text or bytes) to a file.
+
+        Unlike :meth:`write`, the content is never held in memory all at once;
+        the chunks are written to a temporary file as they're produced, and
+        the temporary file only replaces the output file if its content has
+        changed.
+
+        Returns ``True`` if the file was written, or ``False`` if the file
+        already had the same content and was skipped.
+        """
+        dirname = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(dirname, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        handle, temp_filepath = tempfile.mkstemp(dir=dirname, prefix='.hon-')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                for chunk in chunks:
+                    if not isinstance(chunk, bytes):
+                        chunk = chunk.encode(encoding)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            if self.is_unchanged_digest(filepath, size, digest.hexdigest()):
+                os.remove(temp_filepath)
+                self._count(False, size)
+                return False
+
+            os.chmod(temp_filepath, FILE_MODE)
+            os.replace(temp_filepath, filepath)
+        except BaseException:
+            if os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+            raise
+
+        self._count(True, size)
+        return True
+
+    def move(self, source, destination, chunk_size=65536):
+        """Move a file that was written elsewhere, e.g. a temporary file next
+        to the output file, to the ``destination`` filepath.
+
+        If the output file already has the same content the file is removed
+        instead, and the output file is left alone. The file is read in
+        chunks, so it's never held in memory all at once.
+
+        Returns ``True`` if the file was moved, or ``False`` if the output
+        file already had the same content and was skipped.
+        """
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with open(source, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(chunk)
+                    size += len(chunk)
+
+            if self.is_unchanged_digest(destination, size, digest.hexdigest()):
+                os.remove(source)
+                self._count(False, size)
+                return False
+
+            os.chmod(source, FILE_MODE)
+            os.replace(source, destination)
+        except BaseException:
+            if os.path.exists(source):
+                os.remove(source)
+            raise
+
+        self._count(True, size)
+        return True
+
+    @staticmethod
+    def is_unchanged_digest(filepath, size, hexdigest, chunk_size=65536):
+        """Return ``True`` if the file at ``filepath`` has the given size and
+        sha256 digest.
+
+        The file is read in chunks, and only if it is the same size.
+        """
+        try:
+            if os.path.getsize(filepath) != size:
+                return False
+            digest = hashlib.sha256()
+            with open(filepath, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(chunk)
+            return digest.hexdigest() == hexdigest
+        except (IOError, OSError):
+            return False
+
+    @staticmethod
+    def is_unchanged(filepath, content):
+        """Return ``True`` if the file at ``filepath`` already has ``content``.
+
+        The file is only read if it is the same size as the content.
+        """
+        try:
+            if os.path.getsize(filepath) != len(content):
+                return False
+            with open(filepath, 'rb') as f:
+                return f.read() == content
+        except (IOError, OSError):
+            return False
+
+
+def get_package_dir(name):
+    """Return the directory of a package, e.g. a theme's, importing it if it
+    hasn't been imported yet.
+
+    The package is looked up with ``importlib.import_module`` rather than as
+    an attribute of its parent, which may not be set yet while another thread
+    (e.g. another task of a scheduled build) is importing it.
+    """
+    return os.path.dirname(importlib.import_module(name).__file__)
+
+
+def read_text(filepath, encoding='utf-8'):
+    """Read and return the text of a file.
+
+    Newlines are translated as they are when a file is opened in text mode.
+    """
+    with open(filepath, 'r', encoding=encoding) as f:
+        return f.read()
+
 
 def filename_matches_pattern(filepath, pattern):
     """
@@ -27,7 +235,7 @@ def is_current_directory(path):
 
 
 #: TODO: Add file globbing support to check to see if include/exclude patterns are met
-def copy_from(source, destination, make_dirs=True, include='*', exclude=None):
+def copy_from(source, destination, make_dirs=True, include='*', exclude=None, writer=None):
     """
 
     An include pattern can be specified. The includsion pattern can be a simple
@@ -45,7 +253,11 @@ def copy_from(source, destination, make_dirs=True, include='*', exclude=None):
     is evaluated first. The exclusion pattern is then applied to the already
     filtered list of
 
+    Files are copied with an :class:`OutputWriter`, so unchanged files are not
+    copied again. If no ``writer`` is given, a new one is used.
     """
+    if writer is None:
+        writer = OutputWriter()
 
     #: If the source is actually a file, rather than a directory, short-circuit
     #: the directory walk and just copy the file over to the destination. [SWQ]
@@ -54,7 +266,7 @@ def copy_from(source, destination, make_dirs=True, include='*', exclude=None):
             os.makedirs(destination, exist_ok=True)
         filename = os.path.basename(source)
         output_file = os.path.join(destination, filename)
-        shutil.copyfile(source, output_file)
+        writer.copy(source, output_file)
         return
 
     if exclude is None:
@@ -75,4 +287,4 @@ def copy_from(source, destination, make_dirs=True, include='*', exclude=None):
                     os.makedirs(output_dir, exist_ok=True)
 
                 output_file = os.path.join(output_dir, filename)
-                shutil.copyfile(copy_file, output_file)
+                writer.copy(copy_file, output_file)
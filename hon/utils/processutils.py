@@ -0,0 +1,78 @@
+"""
+    hon.utils.processutils
+    ~~~~~
+
+    Utilities for running work in forked worker processes.
+
+    Work is run in processes which are forked from the current process, rather
+    than spawned, so that the work being done (e.g. a renderer, and the book it
+    is rendering) is inherited by the worker instead of being pickled.
+"""
+import multiprocessing
+import threading
+import traceback
+from multiprocessing.connection import wait
+
+
+def can_fork():
+    """Return ``True`` if worker processes can be forked.
+
+    Processes can only be forked on platforms which support it, and only while
+    the current process isn't running any other threads; a forked process only
+    has a copy of the thread that forked it, so any lock held by another thread
+    (e.g. a logging handler's) would never be released in the worker.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return False
+    return threading.active_count() == 1
+
+
+def _run_forked(conn, func, item):
+    try:
+        result = func(item)
+        conn.send((True, result))
+    except BaseException:
+        conn.send((False, traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def fork_map(func, items, max_workers=None):
+    """Call ``func`` for every item, each in its own forked process.
+
+    At most ``max_workers`` processes are run at the same time; if it is not
+    given every item is run at once. Unlike a :class:`multiprocessing.Pool`
+    the worker processes are not daemonic, so they may start worker processes
+    of their own.
+
+    Returns a list, in the same order as ``items``, of ``(ok, value)`` tuples.
+    If ``func`` succeeded ``value`` is whatever it returned (which must be
+    picklable), otherwise ``value`` is the formatted traceback of the error.
+    """
+    context = multiprocessing.get_context('fork')
+    pending = list(enumerate(items))
+    results = [None] * len(pending)
+    max_workers = max(1, max_workers or len(pending))
+
+    running = {}
+    while pending or running:
+        while pending and len(running) < max_workers:
+            index, item = pending.pop(0)
+            reader, writer = context.Pipe(duplex=False)
+            process = context.Process(target=_run_forked, args=(writer, func, item))
+            process.start()
+            writer.close()
+            running[reader] = (index, process)
+
+        for reader in wait(list(running)):
+            index, process = running.pop(reader)
+            try:
+                results[index] = reader.recv()
+            except EOFError:
+                results[index] = None
+            reader.close()
+            process.join()
+            if results[index] is None:
+                results[index] = (False, 'Worker process exited unexpectedly '
+                    'with exit code: {}'.format(process.exitcode))
+    return results
@@ -1,4 +1,14 @@
 import logging
+import re
+from html.parser import HTMLParser
+from xml.etree.ElementTree import TreeBuilder
+
+#: The HTML elements which never have any content, or an end tag.
+VOID_ELEMENTS = frozenset(['area', 'base', 'br', 'col', 'embed', 'hr', 'img',
+    'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'])
+
+#: Matches an HTML tag.
+TAG_RE = re.compile(r'<[^>]+>')
 
 logger = logging.getLogger('hon.utils')
 
@@ -51,3 +61,51 @@ def find_elements_by_tag(element, tag_names=None, max_depth=0, current_depth=0):
                 elif all_tags or e.tag in tag_names:
                     found.append(e)
     return found
+
+
+class _ElementTreeBuilder(HTMLParser):
+    """Builds an element tree from a fragment of HTML, which (unlike XHTML)
+    need not be well formed."""
+
+    def __init__(self, root_tag):
+        super(_ElementTreeBuilder, self).__init__(convert_charrefs=True)
+        self.builder = TreeBuilder()
+        self.builder.start(root_tag, {})
+        self.open_tags = [root_tag]
+
+    def handle_starttag(self, tag, attrs):
+        self.builder.start(tag, dict((name, value or '') for name, value in attrs))
+        if tag in VOID_ELEMENTS:
+            self.builder.end(tag)
+        else:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.builder.start(tag, dict((name, value or '') for name, value in attrs))
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag):
+        #: An end tag without a start tag is ignored, and any elements left
+        #: open inside of the element being ended are closed.
+        if tag not in self.open_tags[1:]:
+            return
+        while self.open_tags[-1] != tag:
+            self.builder.end(self.open_tags.pop())
+        self.builder.end(self.open_tags.pop())
+
+    def handle_data(self, data):
+        self.builder.data(data)
+
+    def close(self):
+        super(_ElementTreeBuilder, self).close()
+        while self.open_tags:
+            self.builder.end(self.open_tags.pop())
+        return self.builder.close()
+
+
+def build_element_tree(html, root_tag='div'):
+    """Build an element tree from a fragment of HTML, returning a root element
+    (with the tag ``root_tag``) which contains the fragment's elements."""
+    parser = _ElementTreeBuilder(root_tag)
+    parser.feed(html)
+    return parser.close()
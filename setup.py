@@ -45,6 +45,9 @@ setup(
     ],
     extras_require={
         'dotenv': [],
+        'highlight': [
+            'pygments>=2.7',
+        ],
         'dev': [
             'pytest>=6.2.2',
             'pytest-mock>=3.5.1',
@@ -0,0 +1,24 @@
+#: The commands are imported by the command line interface, which is imported
+#: first to avoid a circular import.
+import hon.cli  # noqa: F401
+from hon.commands.serve import create_flask_app
+
+
+def test_serve_multi_book_project(tmp_path):
+    """Assert that each book of a multi-book project is served from its own
+    directory of the output, and that the root lists the books.
+    """
+    for name in ('en', 'fr'):
+        html_dir = tmp_path / name / 'html'
+        html_dir.mkdir(parents=True)
+        (html_dir / 'index.html').write_text('<p>{}</p>'.format(name))
+        (html_dir / 'chapter.html').write_text('<p>{} chapter</p>'.format(name))
+
+    client = create_flask_app(serve_from=str(tmp_path), book_dirs=['en', 'fr']).test_client()
+
+    index = client.get('/').get_data(as_text=True)
+    assert 'href="en/"' in index and 'href="fr/"' in index
+    assert client.get('/en/').get_data(as_text=True) == '<p>en</p>'
+    assert client.get('/fr/chapter.html').get_data(as_text=True) == '<p>fr chapter</p>'
+    assert client.get('/jp/').status_code == 404
+    assert client.get('/en/missing.html').status_code == 404
@@ -274,3 +274,114 @@ def test_parse_suffix_section(app):
         ]),
     ]
     assert actual == expected
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("Table of Contents\n=================\n\n- [1A](./1A.md)", "Table of Contents"),
+    ("# Summary #\n\n# Another Title", "Summary"),
+    ("- [1A](./1A.md)", ""),
+])
+def test_parse_title_variants(app, source, expected):
+    parser = SummaryParser(app, source)
+    assert parser.parse_title() == expected
+
+
+def test_parse_nested_parts(app):
+    source = """
+- [1A](./1A.md)
+    - [1A-1](./1A-1.md)
+        - [1A-1-a](./1A-1-a.md)
+    - [1A-2](./1A-2.md)
+- Draft
+    - [Skipped](./skipped.md)
+1. [1B](./1B.md)
+"""
+    parser = SummaryParser(app, source)
+    actual = parser.parse_sections()
+
+    expected = [
+        Section(parts=[
+            Part('1A', source='./1A.md', level=0, children=[
+                Part('1A-1', source='./1A-1.md', level=1, children=[
+                    Part('1A-1-a', source='./1A-1-a.md', level=2),
+                ]),
+                Part('1A-2', source='./1A-2.md', level=1),
+            ]),
+            Part('1B', source='./1B.md', level=0),
+        ])
+    ]
+    assert actual == expected
+
+
+def test_parse_sections_ignores_code_and_comments(app):
+    source = """
+## Section 1 with `code`
+
+<!--
+- [Commented](./commented.md)
+-->
+
+```
+- [Fenced](./fenced.md)
+```
+
+- [*1A*](./1A.md)
+"""
+    parser = SummaryParser(app, source)
+    actual = parser.parse_sections()
+
+    expected = [
+        Section(title='Section 1 with code', parts=[
+            Part('1A', source='./1A.md', level=0),
+        ])
+    ]
+    assert actual == expected
+
+
+def test_parse_sections_does_not_parse_markdown(app, mocker):
+    parse = mocker.patch.object(MarkdownParser, 'parse')
+    parser = SummaryParser(app, '# Summary\n\n- [1A](./1A.md)')
+
+    assert len(parser.parse_sections()[0].parts) == 1
+    assert not parse.called
+
+
+@pytest.mark.parametrize("source, expected", [
+    #: An item indented by less than four spaces is a sibling.
+    ("- [A](./a.md)\n  - [B](./b.md)\n- [C](./c.md)\n",
+        [('A', 0, []), ('B', 0, []), ('C', 0, [])]),
+    ("- [A](./a.md)\n    - [B](./b.md)\n  - [C](./c.md)\n",
+        [('A', 0, [('B', 1, [])]), ('C', 0, [])]),
+    ("- [A](./a.md)\n      - [B](./b.md)\n        - [C](./c.md)\n",
+        [('A', 0, [('B', 1, [('C', 2, [])])])]),
+    #: An item indented more than one level deeper is a part of the item's
+    #: text, rather than an item of its own.
+    ("- [A](./a.md)\n        - [B](./b.md)\n",
+        [('A', 0, [])]),
+])
+def test_parse_nested_parts_by_indentation(app, source, expected):
+    def flatten(parts):
+        return [(part.name, part.level, flatten(part.children)) for part in parts]
+
+    parser = SummaryParser(app, source)
+    assert flatten(parser.parse_sections()[0].parts) == expected
+
+
+@pytest.mark.parametrize("source", [
+    "- [A](<a b.md>)\n",
+    "- [A](<./a b.md> \"Title\")\n",
+    "- [A](./a.md \"Title\")\n",
+    "[A](<a b.md>) [B](b.md)\n",
+])
+def test_parse_link_destinations_as_python_markdown_does(app, source):
+    """Assert that the parts' sources are the destinations of the links, as
+    Python-Markdown parses them, including destinations in angle brackets
+    which contain spaces.
+    """
+    markdown_parser = MarkdownParser()
+    markdown_parser.parse(source)
+    expected = [element.get('href') for element in markdown_parser.parse_tree.iter('a')]
+
+    parser = SummaryParser(app, source)
+    actual = [part.source for part in parser.parse_sections()[0].parts]
+    assert actual == expected
@@ -1,4 +1,5 @@
 import pytest
+from hon.parsing.parser import ConverterPool
 from hon.parsing.markdown.markdown_python import (
     _Markdown,
     MarkdownParser
@@ -51,3 +52,35 @@ def test_markdown_reverse_elements(document):
 
     assert len(md.elements) == len(expected_tags)
     assert actual_tags == expected_tags
+
+
+def test_parser_reuses_pooled_converters(document):
+    pool = ConverterPool(_Markdown)
+
+    with pool.converter() as md:
+        md.convert(document)
+    with pool.converter() as other:
+        assert other is md
+        assert other.elements is None
+
+        with pool.converter() as nested:
+            assert nested is not md
+    assert len(pool) == 2
+
+
+def test_parser_output_is_unchanged_by_pooling(document):
+    md = _Markdown()
+    expected = md.convert(document)
+    expected_tags = [e.tag for e in md.elements]
+
+    parser = MarkdownParser()
+    for _ in range(2):
+        assert parser.parse(document) == expected
+        assert [e.tag for e in parser.parse_tree] == expected_tags
+
+
+def test_parser_forgets_references_between_documents():
+    references = 'A [link][ref].\n\n[ref]: ./first.md'
+
+    assert MarkdownParser().parse(references) == '<p>A <a href="./first.md">link</a>.</p>'
+    assert MarkdownParser().parse('A [link][ref].') == '<p>A [link][ref].</p>'
@@ -0,0 +1,75 @@
+import glob
+import os
+
+import pytest
+from hon.parsing import get_markdown_parser, MarkdownParser, MistuneParser
+
+EXAMPLES_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'examples'))
+
+
+def read_examples(pattern):
+    pages = []
+    for filepath in sorted(glob.glob(os.path.join(EXAMPLES_PATH, pattern), recursive=True)):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+@pytest.mark.parametrize('source', [
+    '# A Title\n\nSome *emphasis* and **strong** text with `code`.',
+    '- List Item A\n- List Item B',
+    '1. First\n2. Second',
+    '> A quote, with [a link](./first.md).',
+    'A [link][ref].\n\n[ref]: ./first.md "Title"',
+    '---\n\n    indented code',
+])
+def test_mistune_parser_matches_markdown_parser(source):
+    markdown, mistune = MarkdownParser(), MistuneParser()
+
+    assert mistune.parse(source) == markdown.parse(source)
+    assert [e.tag for e in mistune.parse_tree] == [e.tag for e in markdown.parse_tree]
+
+
+def test_mistune_parser_passes_raw_html_through():
+    source = 'Some text.\n\n<div class="raw">Raw <em>HTML</em></div>'
+
+    assert MistuneParser().parse(source) == MarkdownParser().parse(source)
+
+
+def test_mistune_parser_parse_tree():
+    parser = MistuneParser()
+    parser.parse('# Title\n\n- [First](./first.md)\n    - [Nested](./nested.md)')
+
+    assert parser.parse_tree.tag == 'div'
+    assert parser.parse_tree.find('h1').text == 'Title'
+    assert [a.get('href') for a in parser.parse_tree.iter('a')] == ['./first.md', './nested.md']
+
+
+def test_mistune_parser_forgets_references_between_documents():
+    assert MistuneParser().parse('A [link][ref].\n\n[ref]: ./first.md') == \
+        '<p>A <a href="./first.md">link</a>.</p>'
+    assert MistuneParser().parse('A [link][ref].') == '<p>A [link][ref].</p>'
+
+
+def test_mistune_parser_empty_document():
+    parser = MistuneParser()
+
+    assert parser.parse('  \n') == ''
+    assert parser.parse_tree is None
+
+
+@pytest.mark.parametrize('source', [source for source in read_examples('**/SUMMARY.md') if source.strip()])
+def test_summary_parse_tree_parity(source):
+    markdown, mistune = MarkdownParser(), MistuneParser()
+    markdown.parse(source)
+    mistune.parse(source)
+
+    assert [(e.tag, e.get('href')) for e in mistune.parse_tree.iter()] == \
+        [(e.tag, e.get('href')) for e in markdown.parse_tree.iter()]
+
+
+def test_get_markdown_parser():
+    assert get_markdown_parser() is MarkdownParser
+    assert get_markdown_parser('mistune') is MistuneParser
+    with pytest.raises(ValueError):
+        get_markdown_parser('commonmark')
@@ -0,0 +1,87 @@
+import pytest
+
+from hon.parsing import MarkdownParser, MistuneParser
+from hon.parsing.chunked import ChunkedParser
+
+
+@pytest.fixture
+def document():
+    sections = []
+    for index in range(20):
+        sections.append("""## Section {0}
+
+Some *text* with a [reference][ref] and a [link](./page-{0}.md).
+
+- one
+
+- two
+
+```
+code, with a blank line
+
+inside the fence
+```
+""".format(index % 3))
+    return '# Appendix\n\n' + '\n'.join(sections) + '\n[ref]: http://example.com\n'
+
+
+class _Stream(object):
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+@pytest.mark.parametrize('parser_class', [MarkdownParser, MistuneParser])
+def test_chunked_parse_matches_whole_parse(document, parser_class):
+    parser = parser_class()
+    expected = parser.parse(document)
+
+    chunked_parser = ChunkedParser(parser_class, chunk_size=128)
+    assert chunked_parser.parse(document) == expected
+    assert chunked_parser.outline == parser.outline
+    assert chunked_parser.parse_tree is None
+    assert chunked_parser.chunk_count > 10
+
+
+@pytest.mark.parametrize('parser_class', [MarkdownParser, MistuneParser])
+@pytest.mark.parametrize('text', [
+    '- a\n\n[r]: http://x\n\n- b\n\nsee [x][r]\n',
+    '    a\n\n[r]: http://x\n\n    b\n\nsee [x][r]\n',
+    '> quote\n\n[r]: http://x\n\n> quote [x][r]\n',
+    'see [x][r]\n\n```\ncode\n\n[r]: http://x\n\nmore [x][r]\n',
+])
+def test_chunked_parse_matches_whole_parse_around_definitions(text, parser_class):
+    chunked_parser = ChunkedParser(parser_class, chunk_size=1)
+    assert chunked_parser.parse(text) == parser_class().parse(text)
+
+
+def test_chunked_parse_writes_chunk_by_chunk(document):
+    stream = _Stream()
+    chunked_parser = ChunkedParser(MarkdownParser, chunk_size=256)
+    chunked_parser.parse_to(document, stream)
+
+    assert len(stream.writes) > 10
+    assert ''.join(stream.writes) == MarkdownParser().parse(document)
+
+
+def test_chunked_parse_with_one_chunk(document):
+    chunked_parser = ChunkedParser(MarkdownParser, chunk_size=len(document))
+
+    assert chunked_parser.parse(document) == MarkdownParser().parse(document)
+    assert chunked_parser.chunk_count == 1
+
+
+def test_get_chapter_parser_for_large_chapters(app, mocker):
+    book = mocker.Mock(path='/path/to/book')
+    chapter = mocker.Mock(path='appendix.md')
+    app.config['build'] = dict(app.config['build'], **{'parse-chunk-size': 100})
+
+    parser = app.get_chapter_parser(book, chapter, MistuneParser, 'x' * 101)
+    assert isinstance(parser, ChunkedParser) and parser.chunk_size == 100
+    assert isinstance(app.get_chapter_parser(book, chapter, MistuneParser, 'x' * 100), MistuneParser)
+
+    app.config['build']['parse-chunk-size'] = 0
+    assert isinstance(app.get_chapter_parser(book, chapter, MistuneParser, 'x' * 101), MistuneParser)
@@ -0,0 +1,111 @@
+import pytest
+
+pygments = pytest.importorskip('pygments')
+
+from hon.cache import BuildCache  # noqa: E402
+from hon.parsing import (  # noqa: E402
+    FencedMarkdownParser, get_markdown_parser, MarkdownParser, MistuneParser
+)
+from hon.parsing.highlight import CodeHighlighter  # noqa: E402
+
+
+@pytest.fixture
+def document():
+    return """# Code
+
+```python
+if a < b:
+    print("smaller")
+```
+
+```not-a-language
+left alone
+```
+
+    indented, without a language
+"""
+
+
+@pytest.mark.parametrize('parser_class', [FencedMarkdownParser, MistuneParser])
+def test_highlight_code_blocks(document, parser_class):
+    markup = CodeHighlighter().highlight(parser_class().parse(document))
+
+    assert markup.count('<div class="highlight">') == 1
+    assert '<span class="k">if</span>' in markup
+    assert '&lt;' in markup
+    assert 'left alone' in markup and 'indented, without a language' in markup
+
+
+def test_highlight_uses_cached_code_blocks(document, tmp_path, mocker):
+    cache = BuildCache(str(tmp_path))
+    markup = MistuneParser().parse(document)
+    expected = CodeHighlighter().highlight(markup, cache=cache)
+
+    spy = mocker.spy(pygments, 'highlight')
+    assert CodeHighlighter().highlight(markup, cache=cache) == expected
+    assert spy.call_count == 0
+    assert cache.hits == 1
+
+    #: The style is part of the key.
+    CodeHighlighter('monokai').highlight(markup, cache=cache)
+    assert spy.call_count == 1
+
+
+def test_highlight_keeps_code_blocks_in_memory(document, mocker):
+    highlighter = CodeHighlighter()
+    markup = MistuneParser().parse(document)
+    expected = highlighter.highlight(markup)
+
+    spy = mocker.spy(pygments, 'highlight')
+    assert highlighter.highlight(markup) == expected
+    assert spy.call_count == 0
+
+
+def test_highlighter_css():
+    assert '.highlight .k' in CodeHighlighter().get_css()
+
+
+def test_highlighter_with_unknown_style():
+    with pytest.raises(ValueError):
+        CodeHighlighter('not-a-style')
+
+
+def test_app_highlighter(app):
+    #: Highlighting is opt-in.
+    assert app.highlighter is None
+
+    app.config['build'] = dict(app.config['build'], highlight=True)
+    highlighter = app.highlighter
+    assert isinstance(highlighter, CodeHighlighter)
+    assert app.highlighter is highlighter
+
+    app.config['build']['highlight-style'] = 'monokai'
+    assert app.highlighter.style == 'monokai'
+
+    app.config['build']['highlight'] = False
+    assert app.highlighter is None
+
+
+def test_highlight_marks_code_blocks_in_memory_as_used(document, tmp_path, mocker):
+    cache = BuildCache(str(tmp_path))
+    highlighter = CodeHighlighter()
+    markup = MistuneParser().parse(document)
+    highlighter.highlight(markup, cache=cache)
+
+    touch = mocker.spy(cache, 'touch')
+    highlighter.highlight(markup, cache=cache)
+    assert touch.call_count == 1 and cache.hits == 0
+
+
+def test_fenced_code_is_only_parsed_when_highlighting():
+    """Assert that the Python-Markdown parser only parses fenced code blocks
+    when code blocks are highlighted, so that the markup of books which don't
+    highlight their code is unchanged.
+    """
+    assert get_markdown_parser('markdown') is MarkdownParser
+    assert get_markdown_parser('markdown', highlighting=True) is FencedMarkdownParser
+    assert get_markdown_parser('mistune', highlighting=True) is MistuneParser
+
+    document = '```python\na = 1\n```\n'
+    assert '<code class="language-python">' in FencedMarkdownParser().parse(document)
+    assert '<code class="language-python">' not in MarkdownParser().parse(document)
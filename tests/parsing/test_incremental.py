@@ -0,0 +1,191 @@
+import pytest
+from xml.etree.ElementTree import tostring
+
+from hon.parsing import MarkdownParser, MistuneParser
+from hon.parsing.incremental import (
+    INCREMENTAL_PARSE_MIN_SIZE, IncrementalParser, split_blocks
+)
+from hon.parsing.outline import PLACEHOLDER_RE
+
+
+@pytest.fixture
+def document():
+    return """Title
+=====
+
+# Intro
+
+Some [link][ref] and [another][other].
+
+## Intro
+
+- one
+
+- two
+    continued
+
+  lazy
+
+> a quote
+
+> more of the quote
+
+<div>
+raw
+
+still raw
+</div>
+
+<!-- a comment
+
+still the comment -->
+
+    code
+
+    more code
+
+```python
+a = 1
+
+b = 2
+```
+
+# Intro 1
+
+# Intro
+
+The end.
+
+[ref]: http://example.com "Title"
+[other]: http://example.org
+"""
+
+
+def _serialize(parse_tree):
+    #: Python-Markdown's placeholders for raw HTML and fenced code are
+    #: numbered within each block, rather than within the document.
+    if parse_tree is None:
+        return None
+    return PLACEHOLDER_RE.sub('', tostring(parse_tree, encoding='unicode'))
+
+
+@pytest.mark.parametrize('parser_class', [MarkdownParser, MistuneParser])
+def test_incremental_parse_matches_whole_parse(document, parser_class):
+    parser = parser_class()
+    expected = parser.parse(document)
+
+    incremental_parser = IncrementalParser(parser_class)
+    assert incremental_parser.parse(document) == expected
+    assert incremental_parser.outline == parser.outline
+    assert _serialize(incremental_parser.parse_tree) == _serialize(parser.parse_tree)
+    assert [heading.id for heading in incremental_parser.outline.headings] == [
+        'title', 'intro', 'intro-1', 'intro-1-1', 'intro-2']
+
+
+@pytest.mark.parametrize('parser_class', [MarkdownParser, MistuneParser])
+def test_incremental_parse_converts_changed_blocks(document, parser_class):
+    incremental_parser = IncrementalParser(parser_class)
+    incremental_parser.parse(document)
+
+    #: The two "# Intro" blocks are the same, and are only converted once.
+    assert incremental_parser.converted_count == incremental_parser.block_count - 1
+
+    edited = document.replace('- two', '- *two*')
+    markup = incremental_parser.parse(edited)
+
+    assert incremental_parser.converted_count == 1
+    assert markup == parser_class().parse(edited)
+
+
+def test_incremental_parse_converts_blocks_using_changed_references(document):
+    incremental_parser = IncrementalParser(MarkdownParser)
+    incremental_parser.parse(document)
+
+    edited = document.replace('http://example.org', 'http://example.net')
+    markup = incremental_parser.parse(edited)
+
+    #: Only the one block with links, and the block of definitions, change.
+    assert incremental_parser.converted_count == 2
+    assert 'href="http://example.net"' in markup
+
+
+def test_incremental_parse_parses_footnotes_whole():
+    document = 'A note.[^1]\n\nMore text.\n\n[^1]: The note.\n'
+    incremental_parser = IncrementalParser(MistuneParser)
+
+    assert incremental_parser.parse(document) == MistuneParser().parse(document)
+    assert incremental_parser.block_count == 1
+
+
+#: Documents whose blocks continue across the link reference definitions
+#: between them, or which end in an unclosed fence.
+DEFINITION_DOCUMENTS = [
+    '- a\n\n[r]: http://x\n\n- b\n\nsee [x][r]\n',
+    '    a\n\n[r]: http://x\n\n    b\n\nsee [x][r]\n',
+    '> quote\n\n[r]: http://x\n\n> quote [x][r]\n',
+    '- a\n\n[r]: http://x\n[s]: http://y\n\n    more [y][s]\n\n- b\n',
+    '[r]: http://x\n\n- a [x][r]\n\n- b\n',
+    'see [x][r]\n\n```\ncode\n\n[r]: http://x\n',
+]
+
+
+@pytest.mark.parametrize('parser_class', [MarkdownParser, MistuneParser])
+@pytest.mark.parametrize('text', DEFINITION_DOCUMENTS)
+def test_incremental_parse_matches_whole_parse_around_definitions(text, parser_class):
+    incremental_parser = IncrementalParser(parser_class)
+    assert incremental_parser.parse(text) == parser_class().parse(text)
+
+
+@pytest.mark.parametrize('parser_class', [MarkdownParser, MistuneParser])
+@pytest.mark.parametrize('text, edited', [
+    ('- a\n\n- b\n\nsee [x][r]\n', '- a\n\n[r]: http://x\n\n- b\n\nsee [x][r]\n'),
+    ('> a\n\n> b [x][r]\n', '> a\n\n[r]: http://x\n\n> b [x][r]\n'),
+    ('    a\n\n    b\n', '    a\n\n[r]: http://x\n\n    b\n'),
+])
+def test_incremental_parse_after_adding_or_removing_definitions(text, edited, parser_class):
+    incremental_parser = IncrementalParser(parser_class)
+    for document in (text, edited, text):
+        assert incremental_parser.parse(document) == parser_class().parse(document)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('One\n\nTwo\n', ['One', 'Two\n']),
+    ('- one\n\n- two\n\nAfter\n', ['- one\n\n- two', 'After\n']),
+    ('Para\n\n    code\n\n\n    code\n', ['Para\n\n    code\n\n\n    code\n']),
+    ('```\na\n\nb\n```\n\nAfter', ['```\na\n\nb\n```', 'After']),
+    ('<div>\na\n\nb\n</div>\n\nAfter\n\nLast', ['<div>\na\n\nb\n</div>\n\nAfter', 'Last']),
+    ('> a\n\n> b\n\nc', ['> a\n\n> b', 'c']),
+])
+def test_split_blocks(text, expected):
+    blocks, definitions, unclosed = split_blocks(text)
+    assert blocks == expected
+    assert definitions == ''
+    assert not unclosed
+
+
+def test_split_blocks_across_definitions():
+    blocks, definitions, unclosed = split_blocks('- a\n\n[r]: http://x\n\n- b\n\nc\n\n[s]: http://y\n')
+    assert blocks == ['- a\n\n[r]: http://x\n\n- b', 'c\n\n[s]: http://y\n']
+    assert definitions == '[r]: http://x\n[s]: http://y'
+    assert not unclosed
+
+
+def test_split_blocks_with_unclosed_fence():
+    blocks, definitions, unclosed = split_blocks('Para\n\n```\n[a]: b\n\nc\n')
+    assert blocks == ['Para\n\n```\n[a]: b\n\nc\n']
+    assert definitions == ''
+    assert unclosed
+
+
+def test_get_chapter_parser(app, mocker):
+    book = mocker.Mock(path='/path/to/book')
+    chapter = mocker.Mock(path='chapter.md')
+    text = 'x' * INCREMENTAL_PARSE_MIN_SIZE
+
+    assert isinstance(app.get_chapter_parser(book, chapter, MarkdownParser, text), MarkdownParser)
+
+    app._incremental_parse = True
+    parser = app.get_chapter_parser(book, chapter, MarkdownParser, text)
+    assert isinstance(parser, IncrementalParser)
+    assert app.get_chapter_parser(book, chapter, MarkdownParser, text) is parser
+    assert isinstance(app.get_chapter_parser(book, chapter, MarkdownParser, 'small'), MarkdownParser)
@@ -0,0 +1,66 @@
+import pytest
+from hon.parsing import MarkdownParser, MistuneParser
+from hon.parsing.outline import (
+    AnchorIds, extract_outline, Heading, Image, Link, Outline
+)
+from hon.utils.xmlutils import build_element_tree
+
+
+@pytest.fixture
+def document():
+    return """
+# Chapter 1
+
+See [the next chapter](./chapter2.md "Next") for more.
+
+## A *Styled* Section
+
+![A diagram](./diagram.png)
+
+## A Styled Section
+"""
+
+
+def test_anchor_ids_are_unique():
+    anchors = AnchorIds()
+    anchors.add('intro')
+
+    assert anchors.make('Intro') == 'intro-1'
+    assert anchors.make('Intro') == 'intro-2'
+    assert anchors.make('Q & A') == 'q-a'
+    assert anchors.make('') == 'section'
+
+
+def test_extract_outline_assigns_missing_ids():
+    root = build_element_tree('<h1>Title</h1><h2 id="title">Kept</h2><h2>Title</h2>')
+    outline = extract_outline(root)
+
+    assert outline.headings == [
+        Heading(1, 'Title', 'title-1'),
+        Heading(2, 'Kept', 'title'),
+        Heading(2, 'Title', 'title-2'),
+    ]
+    assert [e.get('id') for e in root] == ['title-1', 'title', 'title-2']
+
+
+@pytest.mark.parametrize('parser_class', [MarkdownParser, MistuneParser])
+def test_parser_outline(parser_class, document):
+    parser = parser_class()
+    markup = parser.parse(document)
+
+    assert parser.outline.headings == [
+        Heading(1, 'Chapter 1', 'chapter-1'),
+        Heading(2, 'A Styled Section', 'a-styled-section'),
+        Heading(2, 'A Styled Section', 'a-styled-section-1'),
+    ]
+    assert parser.outline.links == [Link('./chapter2.md', 'the next chapter', 'Next')]
+    assert parser.outline.images == [Image('./diagram.png', 'A diagram', None)]
+    assert '<h2 id="a-styled-section-1">A Styled Section</h2>' in markup
+
+
+def test_outline_json_round_trip(document):
+    parser = MarkdownParser()
+    parser.parse(document)
+
+    assert Outline.from_json(parser.outline.to_json()) == parser.outline
+    assert MarkdownParser().parse('') == '' and Outline() == Outline.from_json({})
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 
 import hon.preprocessors.jinja
@@ -32,3 +34,104 @@ def test_instantiate_chapter_loader_with_multiple_paths(paths):
     assert actual == paths
 
 
+def test_chapter_loader_records_dependencies(tmp_path):
+    from jinja2 import ChoiceLoader, DictLoader, Environment
+
+    (tmp_path / 'chapter').mkdir()
+    (tmp_path / 'chapter' / 'macros.md').write_text(
+        "{% import './nested.md' as n %}{% macro hello() %}{{ n.name() }}{% endmacro %}")
+    (tmp_path / 'chapter' / 'nested.md').write_text("{% macro name() %}World{% endmacro %}")
+    chapter_path = tmp_path / 'chapter.md'
+    chapter_path.write_text("{% import './chapter/macros.md' as m %}Hello, {{ m.hello() }}!")
+
+    loader = ChapterLoader(str(chapter_path))
+    env = Environment(loader=ChoiceLoader([
+        DictLoader({'__markdown__': chapter_path.read_text()}),
+        loader
+    ]))
+    actual = env.get_template('__markdown__').render()
+
+    assert actual == 'Hello, World!'
+    assert loader.dependencies == [
+        str(tmp_path / 'chapter' / 'macros.md'),
+        str(tmp_path / 'chapter' / 'nested.md'),
+    ]
+
+
+@pytest.fixture
+def jinja_book(app, tmp_path):
+    from hon.book import Book
+    from hon.cache import BuildCache
+
+    app._cache = BuildCache(str(tmp_path / '.hon-cache'))
+    (tmp_path / 'README.md').write_text('# Cover')
+    (tmp_path / 'macros.md').write_text('{% macro hello(name) %}Hello, {{ name }}!{% endmacro %}')
+    (tmp_path / 'chapter1.md').write_text(
+        "{% import './macros.md' as m %}{{ m.hello(book.name) }}")
+    (tmp_path / 'SUMMARY.md').write_text('# Summary\n\n- [Chapter 1](chapter1.md)\n')
+    book = Book(app=app, name='test', path=str(tmp_path))
+    book.load()
+    book.load_chapters()
+    return book
+
+
+def run_jinja_preprocessor(app, book, name='World', **data):
+    from types import SimpleNamespace
+    from hon.preprocessors.jinja import JinjaPreprocessor
+
+    for item in book.items:
+        item.release_source()
+    context = SimpleNamespace(data=dict(data, book={'name': name}))
+    JinjaPreprocessor(app).run(book, None, context)
+    return book.items[-1]
+
+
+def test_jinja_preprocessor_reuses_cached_output(app, jinja_book, mocker):
+    run_jinja_preprocessor(app, jinja_book)
+    assert app.cache.hits == 0
+
+    #: The first build only learns which templates the chapter depends on,
+    #: the next builds can be restored from the cache.
+    run_jinja_preprocessor(app, jinja_book)
+    render = mocker.spy(hon.preprocessors.jinja.JinjaPreprocessor, 'on_run_chapter')
+    chapter = run_jinja_preprocessor(app, jinja_book)
+
+    assert chapter.raw_text == 'Hello, World!'
+    assert render.call_count == 0
+    assert jinja_book.dependencies.get_dependencies(chapter.path) == (
+        os.path.join(jinja_book.path, 'macros.md'), )
+
+
+def test_jinja_preprocessor_cache_key_includes_variables_and_templates(app, jinja_book, tmp_path):
+    run_jinja_preprocessor(app, jinja_book)
+    run_jinja_preprocessor(app, jinja_book)
+
+    assert run_jinja_preprocessor(app, jinja_book, name='Hon').raw_text == 'Hello, Hon!'
+
+    (tmp_path / 'macros.md').write_text('{% macro hello(name) %}Goodbye, {{ name }}!{% endmacro %}')
+    assert run_jinja_preprocessor(app, jinja_book).raw_text == 'Goodbye, World!'
+
+
+def test_jinja_preprocessor_cache_key_includes_context_values(app, jinja_book, tmp_path, mocker):
+    """Assert that a chapter is rendered again when any value of the render
+    context that it reads changes, and that a chapter which reads a value
+    that can't be serialized isn't cached.
+    """
+    (tmp_path / 'chapter1.md').write_text('{{ date }} {{ _hon.version }}')
+    for item in jinja_book.items:
+        item.release_source()
+    jinja_book.load_chapters()
+
+    chapter = run_jinja_preprocessor(app, jinja_book, date='1', _hon={'version': '1.0'})
+    assert chapter.raw_text == '1 1.0'
+    chapter = run_jinja_preprocessor(app, jinja_book, date='2', _hon={'version': '1.0'})
+    assert chapter.raw_text == '2 1.0'
+    chapter = run_jinja_preprocessor(app, jinja_book, date='2', _hon={'version': '2.0'})
+    assert chapter.raw_text == '2 2.0'
+
+    render = mocker.spy(hon.preprocessors.jinja.JinjaPreprocessor, 'on_run_chapter')
+    date = object()
+    run_jinja_preprocessor(app, jinja_book, date=date, _hon={})
+    run_jinja_preprocessor(app, jinja_book, date=date, _hon={})
+    rendered = [args[2].path for args, _ in render.call_args_list]
+    assert rendered.count(chapter.path) == 2
@@ -124,3 +124,157 @@ def test_items_property_against_chapters_with_children(app, sample_chapter_with_
 
     chapter_names = [item.name for item in actual if type(item) == Chapter]
     assert chapter_names == ['Chapter 1', 'Hello, World!', 'Goodbye, Cruel World!', 'Chapter 2']
+
+
+def test_generate_pages_in_workers(app, sample_chapter_with_nested_items):
+    """When rendering pages with worker processes, assert that the rendered
+    text is collected in the order of the chapter graph, and that the page
+    signals are sent from the parent process.
+    """
+    import os
+    import hon
+
+    class PidRenderer(Renderer):
+        _name = 'pid'
+
+        def on_render_page(self, page, book, context):
+            page.text = '{}:{}'.format(page.name, os.getpid())
+
+    app._workers = 2
+    renderer = PidRenderer(app)
+    renderer.add_chapters([sample_chapter_with_nested_items, Chapter(name='Chapter 2')])
+    renderer.build_chapter_graph()
+
+    sent = []
+
+    def receiver(sender, page=None, **kwargs):
+        sent.append((page.name, os.getpid()))
+
+    with hon.before_render_page.connected_to(receiver), \
+            hon.after_render_page.connected_to(receiver):
+        renderer.generate_pages(None, None)
+
+    names = ['Chapter 1', 'Hello, World!', 'Goodbye, Cruel World!', 'Chapter 2']
+    assert [item.text.split(':')[0] for item in renderer.items] == names
+    assert all(pid == os.getpid() for _, pid in sent)
+    assert len(sent) == 2 * len(names)
+
+
+def test_generate_pages_streaming(app, sample_chapter_with_nested_items):
+    """When streaming, assert that each page is written as soon as it has been
+    rendered, and that its text is then dropped.
+    """
+    events = []
+
+    class StreamingRenderer(Renderer):
+        _name = 'streaming'
+        supports_streaming = True
+
+        def on_render_page(self, page, book, context):
+            events.append(('render', page.name))
+            page.text = page.name
+
+        def on_write_page(self, page, book, context):
+            events.append(('write', page.text))
+
+    app._streaming = True
+    renderer = StreamingRenderer(app)
+    renderer.add_chapters([sample_chapter_with_nested_items, Chapter(name='Chapter 2')])
+    renderer.build_chapter_graph()
+    renderer.generate_pages(None, None)
+
+    names = ['Chapter 1', 'Hello, World!', 'Goodbye, Cruel World!', 'Chapter 2']
+    assert events == [(event, name) for name in names for event in ('render', 'write')]
+    assert all(item.text == '' for item in renderer.items)
+
+
+def test_generate_pages_stops_once_cancelled(app, sample_chapter_with_nested_items):
+    """Assert that once the build is cancelled, no more pages are rendered."""
+    from hon.cancellation import CancellationToken
+    from hon.exc import BuildCancelled
+
+    cancel_token = CancellationToken()
+    rendered = []
+
+    class CancellingRenderer(Renderer):
+        _name = 'cancelling'
+
+        def on_render_page(self, page, book, context):
+            rendered.append(page.name)
+            if page.name == 'Hello, World!':
+                cancel_token.cancel()
+
+    renderer = CancellingRenderer(app)
+    renderer.add_chapters([sample_chapter_with_nested_items, Chapter(name='Chapter 2')])
+    renderer.build_chapter_graph()
+
+    with pytest.raises(BuildCancelled):
+        renderer.generate_pages(None, None, cancel_token=cancel_token)
+    assert rendered == ['Chapter 1', 'Hello, World!']
+
+
+def test_page_cache_keys(app, sample_chapter_with_nested_items, mocker, tmp_path):
+    """Assert that the book's summary is hashed once for all of the pages, and
+    that no keys are made when the build cache is disabled.
+    """
+    from hon.cache import BuildCache, BuildJournal
+
+    class KeyedRenderer(Renderer):
+        _name = 'keyed'
+
+    renderer = KeyedRenderer(app)
+    renderer.add_chapters([sample_chapter_with_nested_items, Chapter(name='Chapter 2')])
+    renderer.build_chapter_graph()
+    for index, item in enumerate(renderer.items):
+        item.source_key = str(index)
+
+    book = mocker.Mock(selected_paths=None, journal=BuildJournal())
+    book.summary.to_json.return_value = {}
+    context = mocker.Mock(template_digest='abc')
+
+    app._cache = BuildCache(str(tmp_path), enabled=False)
+    assert renderer.get_page_cache_keys(book, context) == [None] * 4
+    assert book.summary.to_json.call_count == 0
+
+    app._cache = BuildCache(str(tmp_path))
+    keys = renderer.get_page_cache_keys(book, context)
+    assert len(set(keys)) == 4 and None not in keys
+    assert book.summary.to_json.call_count == 1
+    assert keys[1] == renderer.get_page_cache_key(renderer.items[1], book, context)
+    assert renderer.get_render_key(book, context, keys) is not None
+
+
+@pytest.mark.parametrize('complete', [False, True])
+def test_render_and_schedule_run_the_same_stages(app, mocker, complete):
+    """Assert that rendering a book directly, and as a graph of tasks, runs the
+    same stages, and that neither renders a book its journal records as
+    complete.
+    """
+    from hon.scheduler import TaskGraph
+
+    class StagedRenderer(Renderer):
+        _name = 'staged'
+
+    book, context = mocker.Mock(), mocker.Mock()
+
+    def stages(renderer):
+        for name in ('init_pages', 'generate_assets', 'generate_pages', 'end_render'):
+            mocker.patch.object(renderer, name)
+        mocker.patch.object(renderer, 'start_render', return_value='start-time')
+        mocker.patch.object(renderer, 'init', return_value=context)
+        mocker.patch.object(renderer, 'get_render_keys', return_value=(['key'], 'render-key'))
+        mocker.patch.object(renderer, 'is_complete', return_value=complete)
+        return renderer
+
+    rendered = stages(StagedRenderer(app))
+    rendered.render(book)
+
+    scheduled = stages(StagedRenderer(app))
+    graph = TaskGraph()
+    scheduled.schedule(book, graph, None)
+    graph.run(max_workers=1)
+
+    for name in ('start_render', 'init_pages', 'init', 'get_render_keys', 'is_complete', 'end_render'):
+        assert getattr(rendered, name).call_args == getattr(scheduled, name).call_args
+    assert rendered.generate_pages.called is scheduled.generate_pages.called is not complete
+    assert rendered.end_render.called is not complete
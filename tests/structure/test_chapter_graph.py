@@ -72,3 +72,28 @@ def test_get_returns_none_for_unknown_chapter(chapters):
 
     actual = graph.get(Chapter(name='Foobarbaz'))
     assert actual is None
+
+
+def test_get_by_path():
+    chapters = [Chapter(name='foo', path='/book/foo.md'), Chapter(name='bar')]
+    graph = ChapterGraph(chapters)
+
+    assert graph.get_by_path('/book/foo.md').chapter is chapters[0]
+    assert graph.get_by_path('/book/bar.md') is None
+
+
+def test_iterators_are_independent(chapters):
+    graph = ChapterGraph(chapters)
+
+    first = iter(graph)
+    second = iter(graph)
+    next(first)
+    next(first)
+
+    assert next(second).chapter.name == 'Chapter 1'
+    assert next(first).chapter.name == 'Chapter 2-A'
+    assert [node.chapter.name for node in graph] == [
+        'Chapter 1', 'Chapter 2', 'Chapter 2-A', 'Chapter 2-B', 'Chapter 2-C',
+        'Chapter 3', 'Chapter 3-A', 'Chapter 3-A-I', 'Chapter 3-B'
+    ]
+    assert len(graph) == 9
@@ -23,3 +23,15 @@ def test_instance(part):
     assert part.id == 'first'
     assert part.name == 'First'
     assert part.source == './first.md'
+
+
+def test_derived_fields_follow_source(part):
+    assert part.link == './first.html'
+    assert part.link_name == './first'
+    assert part.is_readme is False
+
+    part.source = 'README.md'
+    assert part.id == 'readme'
+    assert part.link == 'index.html'
+    assert part.is_readme is True
+    assert not hasattr(part, '__dict__')
@@ -283,3 +283,192 @@ def test_register_renderer_without_configuration():
     app_config = app.config['output'][config_key]
     assert app_config is not None
     assert app_config == expected
+
+
+def test_build_books_concurrently_reports_failed_books(mocker):
+    """Books are built independently of one another, assert that a book that
+    fails doesn't stop the other books from building and that all of the
+    failed books are reported.
+    """
+    from datetime import timedelta
+    from hon.exc import BuildError
+
+    books = [mocker.Mock(path='/path/to/{}'.format(n)) for n in ('en', 'fr', 'jp')]
+    for book, name in zip(books, ('en', 'fr', 'jp')):
+        book.name = name
+
+    def build_book(book, build_only=None):
+        if book.name == 'fr':
+            raise FileNotFoundError('chapter.md')
+        return timedelta(seconds=1)
+
+    app = Hon()
+    app.build_book = build_book
+
+    with pytest.raises(BuildError) as exc_info:
+        app.build_books_concurrently(books, ('html', ), max_workers=2)
+    assert 'Failed to build 1 of 3 books: fr' in str(exc_info.value)
+
+
+def test_template_bytecode_cache(tmp_path):
+    from hon.cache import BuildCache
+    from hon.renderers.render_context import RenderContext
+
+    app = Hon()
+    app._cache = BuildCache(str(tmp_path))
+    bytecode_cache = app.template_bytecode_cache
+    assert bytecode_cache.cache is app.cache
+    assert app.template_bytecode_cache is bytecode_cache
+
+    #: Theme templates are compiled into the build cache.
+    context = RenderContext()
+    context.bytecode_cache = bytecode_cache
+    context.configure_environment('theme/light/website/templates')
+    context.environment.get_template('page.html.jinja')
+    assert list((tmp_path / 'jinja-bytecode').rglob('*'))
+
+    app._cache = BuildCache(str(tmp_path), enabled=False)
+    assert app.template_bytecode_cache is None
+
+
+def test_prepared_book_variables_reach_renderer_templates(app, tmp_path):
+    """Assert that the variables added to the render context the book was
+    prepared with are given to the render context of each renderer.
+    """
+    from hon.book import Book
+    from hon.cache import BuildCache
+    from hon.renderers import HtmlRenderer
+
+    app._cache = BuildCache(str(tmp_path / '.hon-cache'))
+    app._output_path = str(tmp_path / 'book')
+    app._load_preprocessors()
+    (tmp_path / 'README.md').write_text('# Cover')
+    (tmp_path / 'SUMMARY.md').write_text('# Summary\n')
+    book = Book(app=app, name='test', author='Hon', path=str(tmp_path))
+    book.load()
+    book.config['variables'] = {'edition': 'Second'}
+    app.prepare_book(book)
+
+    context = HtmlRenderer(app, {}).init(book)
+    template = context.environment.from_string('{{ book.edition }} edition')
+    assert template.render(context.data) == 'Second edition'
+
+
+def test_prepare_book_stops_once_cancelled(app, tmp_path):
+    """Assert that once the build is cancelled, no more chapters are
+    preprocessed or parsed.
+    """
+    from hon.book import Book
+    from hon.cache import BuildCache
+    from hon.cancellation import CancellationToken
+    from hon.exc import BuildCancelled
+
+    preprocessed = []
+
+    class CancellingPreprocessor(Preprocessor):
+        _name = 'cancelling'
+
+        def on_run(self, book, renderer, context):
+            for item in book.unparsed_items:
+                self.run_chapter(book, item, context)
+
+        def on_run_chapter(self, book, chapter, context):
+            preprocessed.append(chapter.name)
+            app.cancel_token.cancel()
+            return chapter.raw_text
+
+    app._cache = BuildCache(str(tmp_path / '.hon-cache'), enabled=False)
+    app._output_path = str(tmp_path / 'book')
+    app.preprocessors = [CancellingPreprocessor(app)]
+    app.cancel_token = CancellationToken()
+    (tmp_path / 'README.md').write_text('# Cover')
+    (tmp_path / 'chapter1.md').write_text('# Chapter 1')
+    (tmp_path / 'SUMMARY.md').write_text('# Summary\n\n- [Chapter 1](chapter1.md)\n')
+    book = Book(app=app, name='test', author='Hon', path=str(tmp_path))
+    book.load()
+
+    with pytest.raises(BuildCancelled):
+        app.prepare_book(book)
+    assert preprocessed == ['README']
+
+    with pytest.raises(BuildCancelled):
+        book.parse_chapters()
+    assert all(item.markup is None for item in book.items)
+
+
+@pytest.mark.parametrize('build_config, overrides, build_only, pruned', [
+    ({}, {}, ('html', ), True),
+    ({'cache-prune': False}, {}, ('html', ), False),
+    ({}, {'_only': ('chapter1.md', )}, ('html', ), False),
+    ({}, {'_resume': True}, ('html', ), False),
+    ({}, {}, (), False),
+])
+def test_prune_cache(app, mocker, build_config, overrides, build_only, pruned):
+    """Assert that the build cache is only pruned by complete builds."""
+    import time
+    from hon.app import CACHE_PRUNE_MARGIN, DEFAULT_CACHE_PRUNE_AGE
+
+    app.config['build'] = dict(app.config['build'], **build_config)
+    app.renderers = [mocker.Mock()]
+    app.renderers[0].name = 'html'
+    for name, value in overrides.items():
+        setattr(app, name, value)
+    prune = mocker.patch.object(app.cache, 'prune', return_value=(0, 0))
+
+    start_timestamp = time.time()
+    app.prune_cache(start_timestamp, build_only)
+    assert prune.called is pruned
+    if pruned:
+        before, = prune.call_args[0]
+        assert before < start_timestamp - CACHE_PRUNE_MARGIN
+        assert before == pytest.approx(time.time() - DEFAULT_CACHE_PRUNE_AGE * 24 * 60 * 60, abs=5)
+
+    app.config['build']['cache-prune-age'] = 0
+    app.prune_cache(start_timestamp, build_only)
+    if pruned:
+        assert prune.call_args[0] == (start_timestamp - CACHE_PRUNE_MARGIN, )
+
+
+def test_scheduled_build_gives_book_variables_to_templates(app, tmp_path):
+    """Assert that the templates of a scheduled build are given the same book
+    variables as those of a serial build.
+    """
+    from functools import partial
+    from hon.book import Book
+    from hon.cache import BuildCache
+    from hon.scheduler import TaskGraph
+
+    app._cache = BuildCache(str(tmp_path / '.hon-cache'), enabled=False)
+    app._output_path = str(tmp_path / 'book')
+    app._load_preprocessors()
+    (tmp_path / 'README.md').write_text('# Cover')
+    (tmp_path / 'SUMMARY.md').write_text('# Summary\n')
+
+    class VariablesRenderer(Renderer):
+        _name = 'variables'
+
+        def on_render_page(self, page, book, context):
+            template = context.environment.from_string('{{ book.edition }} edition')
+            page.text = template.render(context.data)
+
+        def on_init(self, book, context):
+            context.configure_environment('theme/light/website/templates')
+
+    def load_book():
+        book = Book(app=app, name='test', author='Hon', path=str(tmp_path))
+        book.load()
+        book.config['variables'] = {'edition': 'Second'}
+        return book
+
+    serial = VariablesRenderer(app)
+    serial.render(load_book())
+
+    book = load_book()
+    scheduled = VariablesRenderer(app)
+    graph = TaskGraph()
+    prepared = graph.add_task('prepare', partial(app.prepare_book, book))
+    scheduled.schedule(book, graph, prepared)
+    graph.run(max_workers=2)
+
+    assert [item.text for item in serial.items] == ['Second edition']
+    assert [item.text for item in scheduled.items] == ['Second edition']
@@ -1,6 +1,7 @@
 import pytest
 
 from hon.book import Book
+from hon.parsing.outline import Heading
 
 
 @pytest.fixture
@@ -12,3 +13,98 @@ def philosophy_book():
         ]
     )
     return book
+
+
+@pytest.fixture
+def book_with_chapters(app, tmp_path):
+    (tmp_path / 'README.md').write_text('# Cover')
+    (tmp_path / 'chapter1.md').write_text('# Chapter 1\n\nSome *text*.')
+    (tmp_path / 'chapter2.md').write_text('# Chapter 2')
+    (tmp_path / 'SUMMARY.md').write_text('# Summary\n\n- [Chapter 1](chapter1.md)\n'
+        '    - [Chapter 2](chapter2.md)\n')
+    book = Book(app=app, name='test', path=str(tmp_path))
+    book.load()
+    return book
+
+
+def test_load_chapters(book_with_chapters):
+    chapters = book_with_chapters.load_chapters()
+
+    assert [c.name for c in chapters] == ['README', 'Chapter 1']
+    assert [c.name for c in chapters[1].children] == ['Chapter 2']
+
+
+def test_items_property(book_with_chapters):
+    book_with_chapters.load_chapters()
+
+    actual = [c.name for c in book_with_chapters.items]
+    assert actual == ['README', 'Chapter 1', 'Chapter 2']
+
+
+def test_parse_chapters(book_with_chapters):
+    book_with_chapters.load_chapters()
+    book_with_chapters.parse_chapters()
+
+    chapter = book_with_chapters.items[1]
+    assert chapter.markup == '<h1 id="chapter-1">Chapter 1</h1>\n<p>Some <em>text</em>.</p>'
+    assert chapter.headings == [Heading(1, 'Chapter 1', 'chapter-1')]
+    assert chapter.links == [] and chapter.images == []
+
+
+def test_load_chapter_lazily(book_with_chapters, tmp_path):
+    chapter = book_with_chapters.load_chapter(book_with_chapters.summary.all_parts[1])
+    assert chapter._raw_text is None
+
+    (tmp_path / 'chapter1.md').write_text('# Chapter One')
+    assert chapter.raw_text == '# Chapter One'
+
+    chapter.raw_text = '# Preprocessed'
+    assert chapter.source_text == '# Chapter One'
+
+    chapter.release_source()
+    assert chapter._raw_text is None
+    assert chapter.raw_text == '# Chapter One'
+
+
+def test_chapter_derived_fields(book_with_chapters):
+    readme, chapter = book_with_chapters.load_chapters()
+
+    assert (readme.filename, readme.is_readme) == ('README', True)
+    assert (chapter.filename, chapter.is_readme) == ('chapter1', False)
+
+    chapter.path = 'readme.md'
+    assert (chapter.filename, chapter.is_readme) == ('readme', True)
+
+
+def test_chapter_copy(book_with_chapters):
+    chapter = book_with_chapters.load_chapters()[1]
+    chapter.text = '<h1>Chapter 1</h1>'
+
+    copied = chapter.copy()
+    copied.text = '<h1>Copied</h1>'
+    copied.children[0].text = '<h1>Copied</h1>'
+
+    assert copied.raw_text == chapter.raw_text
+    assert chapter.text == '<h1>Chapter 1</h1>'
+    assert chapter.children[0].text == ''
+
+
+def test_load_chapters_checks_files_concurrently(book_with_chapters):
+    chapters = book_with_chapters.load_chapters(max_workers=4)
+
+    #: The chapters' text isn't read until it's needed.
+    assert chapters[1]._source_text is None
+    assert chapters[1].children[0].raw_text == '# Chapter 2'
+
+
+def test_load_chapters_reports_every_missing_file(book_with_chapters, tmp_path):
+    (tmp_path / 'chapter1.md').unlink()
+    (tmp_path / 'chapter2.md').unlink()
+
+    with pytest.raises(FileNotFoundError) as exc_info:
+        book_with_chapters.load_chapters()
+
+    message = str(exc_info.value)
+    assert message.startswith('2 chapter file(s) not found')
+    assert str(tmp_path / 'chapter1.md') in message
+    assert str(tmp_path / 'chapter2.md') in message
@@ -0,0 +1,210 @@
+import pytest
+from hon.cache import BuildCache, BuildJournal, make_key, TemplateBytecodeCache
+
+
+def test_make_key_is_stable():
+    assert make_key('text', {'a': 1, 'b': 2}) == make_key('text', {'b': 2, 'a': 1})
+
+
+def test_make_key_changes_with_inputs():
+    assert make_key('text', {'a': 1}) != make_key('text', {'a': 2})
+    assert make_key('text') != make_key('other text')
+
+
+def test_get_and_set(tmp_path):
+    cache = BuildCache(str(tmp_path / '.hon-cache'))
+    key = make_key('chapter')
+
+    assert cache.get('markup', key) is None
+    cache.set('markup', key, '<p>chapter</p>')
+    assert cache.get('markup', key) == '<p>chapter</p>'
+    assert cache.get('html', key) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_entries_persist_between_caches(tmp_path):
+    key = make_key('chapter')
+    BuildCache(str(tmp_path)).set('markup', key, '')
+
+    assert BuildCache(str(tmp_path)).get('markup', key) == ''
+
+
+def test_disabled_cache(tmp_path):
+    cache = BuildCache(str(tmp_path), enabled=False)
+    key = make_key('chapter')
+
+    cache.set('markup', key, '<p>chapter</p>')
+    assert cache.get('markup', key) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_none_key_is_never_cached(tmp_path):
+    cache = BuildCache(str(tmp_path))
+
+    cache.set('markup', None, '<p>chapter</p>')
+    assert cache.get('markup', None) is None
+
+
+def test_get_and_set_bytes(tmp_path):
+    cache = BuildCache(str(tmp_path))
+    key = make_key('template')
+
+    assert cache.get_bytes('jinja-bytecode', key) is None
+    cache.set_bytes('jinja-bytecode', key, b'\x00bytecode')
+    assert BuildCache(str(tmp_path)).get_bytes('jinja-bytecode', key) == b'\x00bytecode'
+
+
+def test_template_bytecode_cache(tmp_path, mocker):
+    from jinja2 import DictLoader, Environment, FileSystemLoader
+
+    (tmp_path / 'templates').mkdir()
+    (tmp_path / 'templates' / 'page.html').write_text('Hello, {{ name }}!')
+
+    def render(source=None):
+        cache = BuildCache(str(tmp_path / '.hon-cache'))
+        env = Environment(loader=FileSystemLoader(str(tmp_path / 'templates')),
+            bytecode_cache=TemplateBytecodeCache(cache))
+        if source is not None:
+            (tmp_path / 'templates' / 'page.html').write_text(source)
+        return env.get_template('page.html').render(name='World'), cache
+
+    compile_spy = mocker.spy(Environment, 'compile')
+    assert render()[0] == 'Hello, World!'
+    assert compile_spy.call_count == 1
+
+    #: Later environments load the compiled template from the build cache.
+    actual, cache = render()
+    assert actual == 'Hello, World!'
+    assert compile_spy.call_count == 1
+    assert cache.hits == 1
+
+    #: A change to the template's source is a different key.
+    assert render('Goodbye, {{ name }}!')[0] == 'Goodbye, World!'
+    assert compile_spy.call_count == 2
+
+    #: Templates without a filename aren't cached.
+    entries = sorted((tmp_path / '.hon-cache' / 'jinja-bytecode').rglob('*'))
+    env = Environment(loader=DictLoader({'text': '{{ name }}'}),
+        bytecode_cache=TemplateBytecodeCache(cache))
+    env.get_template('text')
+    assert sorted((tmp_path / '.hon-cache' / 'jinja-bytecode').rglob('*')) == entries
+
+
+def test_prune_removes_unused_entries(tmp_path):
+    import os
+    import time
+
+    cache = BuildCache(str(tmp_path))
+    used, read, checked, unused = (make_key(name) for name in ('used', 'read', 'checked', 'unused'))
+    for key in (used, read, checked, unused):
+        cache.set('markup', key, key)
+    cache.set_latest_key('html', '/book/chapter.md', unused)
+
+    #: Every entry, and the index of the latest entries, was last used a
+    #: while ago.
+    long_ago = time.time() - 3600
+    for dirpath, _, filenames in os.walk(str(tmp_path)):
+        for filename in filenames:
+            os.utime(os.path.join(dirpath, filename), (long_ago, long_ago))
+
+    before = time.time() - 60
+    cache.set('markup', used, used)
+    cache.get('markup', read)
+    cache.contains('markup', checked)
+
+    assert cache.prune(before) == (1, len(unused))
+    assert [cache.get('markup', key) for key in (used, read, checked, unused)] == \
+        [used, read, checked, None]
+    assert (tmp_path / 'latest').exists()
+
+
+def test_latest_key(tmp_path):
+    cache = BuildCache(str(tmp_path))
+    first, second = make_key('first'), make_key('second')
+
+    assert cache.get_latest_key('html', '/book/chapter.md') is None
+    cache.set('html', first, '<p>first</p>')
+    cache.set_latest_key('html', '/book/chapter.md', first)
+    assert cache.get_latest_key('html', '/book/chapter.md') == first
+
+    cache.set('html', second, '<p>second</p>')
+    cache.set_latest_key('html', '/book/chapter.md', second)
+    assert BuildCache(str(tmp_path)).get_latest_key('html', '/book/chapter.md') == second
+    assert cache.get_latest_key('pdf', '/book/chapter.md') is None
+
+
+def test_latest_key_without_an_entry(tmp_path):
+    cache = BuildCache(str(tmp_path))
+
+    cache.set_latest_key('html', '/book/chapter.md', make_key('missing'))
+    assert cache.get_latest_key('html', '/book/chapter.md') is None
+
+
+def test_dependency_graph_get_dependants(tmp_path):
+    from hon.cache import DependencyGraph
+
+    graph = DependencyGraph()
+    graph.set_dependencies('/book/chapter1.md', ['/book/macros.md', '/book/other.md'])
+    graph.set_dependencies('/book/chapter2.md', ['/book/macros.md'])
+    graph.set_dependencies('/book/chapter3.md', [])
+
+    assert graph.get_dependants('/book/macros.md') == ['/book/chapter1.md', '/book/chapter2.md']
+    assert graph.get_dependants('/book/other.md') == ['/book/chapter1.md']
+    assert graph.get_dependencies('/book/chapter3.md') == ()
+    assert graph.get_dependencies('/book/chapter4.md') is None
+
+
+def test_dependency_graph_digests_change_with_templates(tmp_path):
+    from hon.cache import DependencyGraph
+
+    macros = tmp_path / 'macros.md'
+    macros.write_text('{% macro hello() %}Hello{% endmacro %}')
+
+    graph = DependencyGraph()
+    graph.set_dependencies(str(tmp_path / 'chapter.md'), [str(macros)])
+    before = graph.get_digests(str(tmp_path / 'chapter.md'))
+
+    macros.write_text('{% macro hello() %}Howdy{% endmacro %}')
+    after = graph.get_digests(str(tmp_path / 'chapter.md'))
+    assert before != after
+
+    macros.unlink()
+    assert graph.get_digests(str(tmp_path / 'chapter.md')) == [(str(macros), None)]
+
+
+def test_dependency_graph_persists(tmp_path):
+    from hon.cache import DependencyGraph
+
+    filepath = str(tmp_path / 'dependencies' / 'book.json')
+    graph = DependencyGraph()
+    graph.set_dependencies('/book/chapter1.md', ['/book/macros.md'])
+    graph.save(filepath)
+
+    actual = DependencyGraph.load(filepath)
+    assert actual.get_dependencies('/book/chapter1.md') == ('/book/macros.md', )
+    assert len(DependencyGraph.load(str(tmp_path / 'missing.json'))) == 0
+
+
+def test_build_journal_records_completed_units(tmp_path):
+    filepath = str(tmp_path / 'journal' / 'book.jsonl')
+    journal = BuildJournal(filepath)
+    journal.record('page', 'pdf', 'abc')
+    journal.record('page', 'pdf', None)
+    journal.record('renderer', 'html', 'def')
+
+    #: A build that died while writing an entry leaves a partial line.
+    with open(filepath, 'a') as f:
+        f.write('["page", "pd')
+
+    loaded = BuildJournal.load(filepath)
+    assert len(loaded) == 2
+    assert loaded.is_complete('page', 'pdf', 'abc')
+    assert loaded.is_complete('renderer', 'html', 'def')
+    assert not loaded.is_complete('renderer', 'html', 'xyz')
+    assert loaded.count('page', 'pdf') == 1
+
+    loaded.record('page', 'pdf', 'ghi')
+    assert BuildJournal.load(filepath).is_complete('page', 'pdf', 'ghi')
+
+    loaded.reset()
+    assert len(BuildJournal.load(filepath)) == 0
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from hon.exc import BuildError
+from hon.scheduler import Task, TaskGraph
+
+
+def test_run_tasks_after_their_dependencies():
+    graph = TaskGraph()
+    finished = []
+
+    first = graph.add_task('first', lambda: finished.append('first'))
+    second = graph.add_task('second', lambda: finished.append('second'), depends_on=[first])
+    graph.add_task('third', lambda: finished.append('third'), depends_on=[first, second])
+    graph.run(max_workers=4)
+
+    assert finished == ['first', 'second', 'third']
+
+
+def test_run_independent_tasks_concurrently():
+    graph = TaskGraph()
+    barrier = threading.Barrier(2, timeout=5)
+
+    graph.add_task('assets', barrier.wait)
+    graph.add_task('pages', barrier.wait)
+    graph.run(max_workers=2)
+
+    assert all(task.state == Task.DONE for task in graph.tasks)
+
+
+def test_failed_tasks_skip_their_dependants():
+    graph = TaskGraph()
+
+    def fail():
+        raise ValueError('Out of memory')
+
+    failed = graph.add_task('pdf:pages', fail)
+    skipped = graph.add_task('pdf:finish', lambda: None, depends_on=[failed])
+    done = graph.add_task('epub:finish', lambda: None)
+
+    with pytest.raises(BuildError, match='Failed to run 1 of 3 tasks: pdf:pages'):
+        graph.run()
+
+    assert (failed.state, skipped.state, done.state) == (Task.FAILED, Task.SKIPPED, Task.DONE)
+    assert 'Out of memory' in failed.result
+
+
+def test_tasks_depend_on_tasks_in_the_graph():
+    other = TaskGraph().add_task('other', lambda: None)
+
+    with pytest.raises(ValueError):
+        TaskGraph().add_task('task', lambda: None, depends_on=[other])
+
+
+def test_cancelled_graph_starts_no_more_tasks():
+    from hon.cancellation import CancellationToken
+    from hon.exc import BuildCancelled
+
+    cancel_token = CancellationToken()
+    graph = TaskGraph()
+    first = graph.add_task('first', cancel_token.cancel)
+    second = graph.add_task('second', lambda: None, depends_on=[first])
+
+    with pytest.raises(BuildCancelled):
+        graph.run(cancel_token=cancel_token)
+    assert (first.state, second.state) == (Task.DONE, Task.SKIPPED)
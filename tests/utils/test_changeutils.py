@@ -0,0 +1,51 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+from hon.utils import changeutils
+
+
+def test_parse_timestamp():
+    assert changeutils.parse_timestamp('1500000000') == 1500000000.0
+    assert changeutils.parse_timestamp('1500000000.5') == 1500000000.5
+    assert changeutils.parse_timestamp('2020-01-02T03:04:05+00:00') == 1577934245.0
+    assert changeutils.parse_timestamp('HEAD~1') is None
+    assert changeutils.parse_timestamp(None) is None
+
+
+def test_get_changed_files_since_a_timestamp(tmp_path):
+    old, new = str(tmp_path / 'old.md'), str(tmp_path / 'new.md')
+    for path in (old, new):
+        with open(path, 'w') as f:
+            f.write('# Chapter')
+    os.utime(old, (1000, 1000))
+    os.utime(new, (3000, 3000))
+
+    missing = str(tmp_path / 'missing.md')
+    assert changeutils.get_changed_files(str(tmp_path), '2000', [old, new, missing]) == {new, missing}
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+def test_get_changed_files_since_a_revision(tmp_path):
+    def git(*args):
+        subprocess.check_call(('git', '-C', str(tmp_path), '-c', 'user.name=hon',
+            '-c', 'user.email=hon@example.com') + args, stdout=subprocess.DEVNULL)
+
+    paths = [str(tmp_path / name) for name in ('one.md', 'two.md', 'three.md')]
+    for path in paths[:2]:
+        with open(path, 'w') as f:
+            f.write('# Chapter')
+    git('init', '-q')
+    git('add', '.')
+    git('commit', '-q', '-m', 'Add chapters')
+
+    with open(paths[1], 'a') as f:
+        f.write('\nChanged')
+    with open(paths[2], 'w') as f:
+        f.write('# New chapter')
+
+    assert changeutils.get_changed_files(str(tmp_path), 'HEAD', paths) == set(paths[1:])
+
+    with pytest.raises(ValueError):
+        changeutils.get_changed_files(str(tmp_path), 'no-such-revision', paths)
@@ -1,8 +1,13 @@
+import os
 import pytest
 from hon.utils.fileutils import (
+    FILE_MODE,
+    OutputWriter,
     filename_matches_pattern,
     is_current_directory,
-    copy_from
+    copy_from,
+    get_package_dir,
+    read_text
 )
 
 
@@ -28,3 +33,82 @@ def test__match(subject, pattern, expected):
 def test_is_current_directory(path, expected):
     actual = is_current_directory(path)
     assert actual == expected
+
+
+def test_output_writer_writes_and_skips_unchanged_files(tmp_path):
+    filepath = str(tmp_path / 'html' / 'index.html')
+    writer = OutputWriter()
+
+    assert writer.write(filepath, '<p>Hello</p>') is True
+    mtime = os.path.getmtime(filepath)
+    assert writer.write(filepath, '<p>Hello</p>') is False
+    assert os.path.getmtime(filepath) == mtime
+    assert writer.write(filepath, b'<p>Howdy</p>') is True
+
+    with open(filepath) as f:
+        assert f.read() == '<p>Howdy</p>'
+    assert (writer.files_written, writer.bytes_written) == (2, 24)
+    assert (writer.files_skipped, writer.bytes_skipped) == (1, 12)
+    assert os.listdir(str(tmp_path / 'html')) == ['index.html']
+
+
+def test_output_writer_uses_default_file_permissions(tmp_path):
+    filepath = str(tmp_path / 'index.html')
+    OutputWriter().write(filepath, '<p>Hello</p>')
+    assert os.stat(filepath).st_mode & 0o777 == FILE_MODE
+
+
+def test_copy_from_skips_unchanged_files(tmp_path):
+    source = tmp_path / 'source'
+    source.mkdir()
+    (source / 'theme.css').write_text('body {}')
+    (source / 'theme.js').write_text('')
+
+    writer = OutputWriter()
+    copy_from(str(source), str(tmp_path / 'output'), include='*.css', writer=writer)
+    copy_from(str(source), str(tmp_path / 'output'), include='*.css', writer=writer)
+
+    assert os.listdir(str(tmp_path / 'output')) == ['theme.css']
+    assert (writer.files_written, writer.files_skipped) == (1, 1)
+
+
+def test_output_writer_writes_chunks_and_skips_unchanged_files(tmp_path):
+    filepath = str(tmp_path / 'book.html')
+    writer = OutputWriter()
+
+    assert writer.write_chunks(filepath, iter(['<p>', 'Hello', '</p>'])) is True
+    assert writer.write_chunks(filepath, iter([b'<p>Hello', '</p>'])) is False
+    assert writer.write_chunks(filepath, iter(['<p>Howdy</p>'])) is True
+
+    with open(filepath) as f:
+        assert f.read() == '<p>Howdy</p>'
+    assert (writer.files_written, writer.files_skipped) == (2, 1)
+    assert os.listdir(str(tmp_path)) == ['book.html']
+
+
+def test_output_writer_moves_files_and_skips_unchanged_files(tmp_path):
+    filepath = str(tmp_path / 'book.epub')
+    writer = OutputWriter()
+
+    for content in (b'book', b'book', b'second edition'):
+        (tmp_path / '.hon-book.epub').write_bytes(content)
+        writer.move(str(tmp_path / '.hon-book.epub'), filepath)
+
+    with open(filepath, 'rb') as f:
+        assert f.read() == b'second edition'
+    assert (writer.files_written, writer.files_skipped) == (2, 1)
+    assert os.listdir(str(tmp_path)) == ['book.epub']
+
+
+def test_read_text(tmp_path):
+    filepath = tmp_path / 'chapter.md'
+    filepath.write_bytes('# Café\r\n\r\ntext\rmore\n'.encode('utf-8'))
+
+    actual = read_text(str(filepath))
+    assert actual == '# Café\n\ntext\nmore\n'
+
+
+def test_get_package_dir():
+    import hon.theme.light.pdf
+
+    assert get_package_dir('hon.theme.light.pdf') == os.path.dirname(hon.theme.light.pdf.__file__)
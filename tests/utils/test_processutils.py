@@ -0,0 +1,33 @@
+import os
+import pytest
+from hon.utils import processutils
+
+pytestmark = pytest.mark.skipif(not processutils.can_fork(),
+    reason='Worker processes cannot be forked on this platform')
+
+
+def _square_or_fail(value):
+    if value < 0:
+        raise ValueError('negative value: {}'.format(value))
+    return value * value
+
+
+@pytest.mark.parametrize('max_workers', [None, 1, 2])
+def test_fork_map(max_workers):
+    actual = processutils.fork_map(_square_or_fail, [1, 2, 3, 4], max_workers=max_workers)
+    assert actual == [(True, 1), (True, 4), (True, 9), (True, 16)]
+
+
+def test_fork_map_runs_in_other_processes():
+    actual = processutils.fork_map(lambda _: os.getpid(), [1, 2])
+    assert all(ok for ok, _ in actual)
+    assert os.getpid() not in [pid for _, pid in actual]
+
+
+def test_fork_map_reports_errors():
+    actual = processutils.fork_map(_square_or_fail, [2, -1])
+    assert actual[0] == (True, 4)
+
+    ok, value = actual[1]
+    assert ok is False
+    assert 'ValueError: negative value: -1' in value
@@ -152,3 +152,16 @@ def test_find_elements_by_tag_should_only_return_matching_elements_until_all_chi
     expected = [element[0], element[1], element[2], element[0][0][0], element[2][1][0]]
     assert len(actual) == len(expected)
     assert set(actual) == set(expected)
+
+
+def test_build_element_tree():
+    from hon.utils.xmlutils import build_element_tree
+
+    root = build_element_tree('<h1>Title</h1>\n<p>Some<br>text &amp; <em>more</p>\n<hr />\n</span>')
+
+    assert root.tag == 'div'
+    assert [e.tag for e in root] == ['h1', 'p', 'hr']
+    assert [e.tag for e in root[1]] == ['br', 'em']
+    assert root[1].text == 'Some'
+    assert root[1][0].tail == 'text & '
+    assert root[1][1].text == 'more'